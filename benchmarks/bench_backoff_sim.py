@@ -0,0 +1,44 @@
+"""Compare backoff parameter sets with the retry-storm simulator.
+
+Run from the repository root with zsuite installed: python benchmarks/bench_backoff_sim.py [clients]
+"""
+
+import sys
+import time
+
+from zsuite.backoff_sim import np, simulate_retry_storm
+
+SCENARIOS = {
+    "default (pct 10%)": {},
+    "no jitter": {"jitter_pct": 0},
+    "full jitter": {"jitter_strategy": "full"},
+    "equal jitter": {"jitter_strategy": "equal"},
+    "decorrelated jitter": {"jitter_strategy": "decorrelated"},
+    "slow start, factor 2": {"minimum_sleep": 1, "backoff_factor": 2, "jitter_strategy": "full"},
+}
+
+
+def main(clients=100_000, outage_duration=60):
+    print(f"{clients} clients, {outage_duration}s outage, numpy={'yes' if np is not None else 'no'}")
+    print(f"{'scenario':<24}{'peak rps':>12}{'avg rps':>12}{'wasted':>12}{'recovery s':>12}{'runtime s':>12}")
+    for name, kwargs in SCENARIOS.items():
+        start = time.perf_counter()
+        result = simulate_retry_storm(clients=clients, outage_duration=outage_duration, seed=0, max_sleep=30, **kwargs)
+        runtime = time.perf_counter() - start
+        print(
+            f"{name:<24}{result.peak_rate:>12.0f}{result.average_rate:>12.0f}{result.wasted_attempts:>12}"
+            f"{result.time_to_recovery:>12.2f}{runtime:>12.3f}"
+        )
+
+    if np is not None:
+        start = time.perf_counter()
+        simulate_retry_storm(clients=10_000, outage_duration=outage_duration, use_numpy=False, max_sleep=30)
+        pure = time.perf_counter() - start
+        start = time.perf_counter()
+        simulate_retry_storm(clients=10_000, outage_duration=outage_duration, use_numpy=True, max_sleep=30)
+        vectorized = time.perf_counter() - start
+        print(f"\n10k clients: pure python {pure:.3f}s, numpy {vectorized:.3f}s ({pure / vectorized:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
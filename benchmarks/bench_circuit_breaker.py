@@ -0,0 +1,52 @@
+"""Multi-threaded CircuitBreaker.increment throughput for each counter mode.
+
+Run from the repository root with zsuite installed: python benchmarks/bench_circuit_breaker.py [increments_per_thread]
+"""
+
+import sys
+import threading
+import time
+
+from zsuite import CircuitBreaker
+
+MODES = {
+    "timestamp deque": {},
+    "bucketed": {"bucket_resolution": 1},
+    "bucketed, 8 stripes": {"bucket_resolution": 1, "stripes": 8},
+    "bucketed, 32 stripes": {"bucket_resolution": 1, "stripes": 32},
+}
+
+
+def run(threads, per_thread, **kwargs):
+    cb = CircuitBreaker(max_events=10**9, time_window=60, **kwargs)
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(per_thread):
+            cb.increment()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    assert cb.count() == threads * per_thread
+    return threads * per_thread / elapsed
+
+
+def main(per_thread=20_000):
+    thread_counts = (1, 4, 16, 32)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"increments/sec, {per_thread} increments per thread, GIL {'enabled' if gil else 'disabled'}")
+    print(f"{'mode':<24}" + "".join(f"{f'{n} threads':>14}" for n in thread_counts))
+    for name, kwargs in MODES.items():
+        rates = [run(n, per_thread, **kwargs) for n in thread_counts]
+        print(f"{name:<24}" + "".join(f"{rate:>14,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,44 @@
+"""config_var lookups of a !secret value, with the decryption cache cold and warm.
+
+Run from the repository root with zsuite installed: python benchmarks/bench_config_var.py [lookups]
+"""
+
+import os
+import sys
+import time
+
+from cryptography.fernet import Fernet
+
+from zsuite.config import _decrypt_cfg_var, config_var
+
+
+def run(lookups, clear_cache):
+    start = time.perf_counter()
+    for _ in range(lookups):
+        if clear_cache:
+            _decrypt_cfg_var.cache_clear()
+        config_var("BENCH_SECRET")
+    return (time.perf_counter() - start) / lookups
+
+
+def main():
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    key = Fernet.generate_key().decode()
+    os.environ["VAULT_KEY"] = key
+    os.environ["BENCH_SECRET"] = f"!secret {Fernet(key).encrypt(b'correct horse battery staple').decode()}"
+    os.environ["BENCH_PLAIN"] = "plain value"
+
+    cold = run(lookups, clear_cache=True)
+    warm = run(lookups, clear_cache=False)
+    start = time.perf_counter()
+    for _ in range(lookups):
+        config_var("BENCH_PLAIN")
+    plain = (time.perf_counter() - start) / lookups
+
+    print(f"{'cold (decrypt every call)':<28} {cold * 1e6:8.2f} us/lookup")
+    print(f"{'warm (cached)':<28} {warm * 1e6:8.2f} us/lookup  ({cold / warm:.0f}x faster)")
+    print(f"{'plain value, for reference':<28} {plain * 1e6:8.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Throughput of encrypt_many/decrypt_many against a per-value encrypt_fernet_str loop.
+
+Run from the repository root with zsuite installed: python benchmarks/bench_crypto_batch.py [count ...] [--size N]
+Defaults to 10k and 100k values of 32 bytes; pass 1000000 for the 1M case.
+"""
+
+import argparse
+import os
+import time
+
+from cryptography.fernet import Fernet
+
+from zsuite.crypto import decrypt_many, encrypt_fernet_str, encrypt_many
+
+WORKERS = (1, 2, 4, os.cpu_count() or 1)
+
+
+def rate(count, func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return count / (time.perf_counter() - start)
+
+
+def encrypt_loop(key, values):
+    return [encrypt_fernet_str(key, value) for value in values]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("counts", nargs="*", type=int, default=[10_000, 100_000])
+    parser.add_argument("--size", type=int, default=32, help="bytes per value")
+    args = parser.parse_args()
+
+    key = Fernet.generate_key()
+    print(f"cpus: {os.cpu_count()}, value size: {args.size} bytes")
+    for count in args.counts:
+        values = [os.urandom(args.size // 2).hex() for _ in range(count)]
+        print(f"\n{count:,} values")
+        print(f"  {'encrypt_fernet_str loop':<28} {rate(count, encrypt_loop, key, values):>12,.0f}/s encrypt")
+        tokens = encrypt_many(key, values)
+        for workers in sorted(set(WORKERS)):
+            enc = rate(count, encrypt_many, key, values, workers=workers)
+            dec = rate(count, decrypt_many, key, tokens, workers=workers)
+            print(f"  {f'many, {workers} worker(s)':<28} {enc:>12,.0f}/s encrypt {dec:>12,.0f}/s decrypt")
+
+
+if __name__ == "__main__":
+    main()
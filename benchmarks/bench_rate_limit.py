@@ -0,0 +1,44 @@
+"""Per-call overhead of the rate limiters' fast path (tokens available, no waiting).
+
+Run from the repository root with zsuite installed: python benchmarks/bench_rate_limit.py [calls]
+"""
+
+import sys
+import threading
+import time
+
+from zsuite import GCRALimiter, TokenBucket
+
+LIMITERS = {
+    "TokenBucket.try_acquire": lambda: TokenBucket(rate=1e12).try_acquire,
+    "TokenBucket.acquire": lambda: TokenBucket(rate=1e12).acquire,
+    "GCRALimiter.try_acquire": lambda: GCRALimiter(rate=1e12, burst=1e6).try_acquire,
+    "GCRALimiter.acquire": lambda: GCRALimiter(rate=1e12, burst=1e6).acquire,
+}
+
+
+def run(method, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        method()
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lock = threading.Lock()
+
+    def locked():
+        with lock:
+            return time.monotonic()
+
+    # The limiters can't beat an uncontended lock plus a clock read, so show that floor for this machine
+    print(f"{'empty call':<26} {run(lambda: True, calls) * 1e9:8.0f} ns/call")
+    print(f"{'lock + monotonic() floor':<26} {run(locked, calls) * 1e9:8.0f} ns/call")
+    for label, factory in LIMITERS.items():
+        per_call = run(factory(), calls)
+        print(f"{label:<26} {per_call * 1e9:8.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
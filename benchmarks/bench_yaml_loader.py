@@ -0,0 +1,56 @@
+"""Parse time of large generated configs with the pure Python SafeLoader and libyaml's CSafeLoader.
+
+Run from the repository root with zsuite installed: python benchmarks/bench_yaml_loader.py [sections]
+"""
+
+import sys
+import time
+
+import yaml
+from cryptography.fernet import Fernet
+
+from zsuite.yaml import _parse_yaml
+
+
+def make_config(sections, key):
+    fernet = Fernet(key)
+    parts = []
+    for i in range(sections):
+        parts.append(
+            f"service_{i}:\n"
+            f"  host: host-{i}.internal\n"
+            f"  port: {8000 + i}\n"
+            f"  timeout: 2.5\n"
+            f"  enabled: true\n"
+            f"  tags: [alpha, beta, gamma]\n"
+            f"  password: !secret {fernet.encrypt(f'password-{i}'.encode()).decode()}\n"
+        )
+    return "".join(parts)
+
+
+def timed(content, key, loader, lazy_secrets=False):
+    start = time.perf_counter()
+    _parse_yaml(content, key, lazy_secrets=lazy_secrets, base_loader=loader)
+    return time.perf_counter() - start
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    key = Fernet.generate_key()
+    content = make_config(sections, key)
+    print(f"{sections} sections, {len(content) / 1024:.0f} KiB, {sections} secrets")
+
+    loaders = {"SafeLoader": yaml.SafeLoader}
+    if getattr(yaml, "CSafeLoader", None) is not None:
+        loaders["CSafeLoader"] = yaml.CSafeLoader
+    else:
+        print("PyYAML was built without libyaml, CSafeLoader is unavailable")
+
+    for name, loader in loaders.items():
+        eager = timed(content, key, loader)
+        lazy = timed(content, key, loader, lazy_secrets=True)
+        print(f"{name:<12} eager secrets {eager * 1000:8.1f} ms   lazy secrets {lazy * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,13 @@
+import asyncio
 from datetime import datetime, timedelta
 from time import time
 
 import pytest
 
-from zsuite import exponential_delay
+from zsuite import async_exponential_delay, exponential_delay
 from zsuite.backoff import (
     _apply_bounds,
+    _apply_jitter,
     _normalize_cutoff,
     _normalize_jitter_pct,
     _validate_arguments,
@@ -102,6 +104,113 @@ def test_backoff():
     assert delays == expected
 
 
+def _strategy_delays(strategy, **kwargs):
+    return list(
+        exponential_delay(
+            minimum_sleep=1,
+            max_sleep=10,
+            backoff_factor=2,
+            max_attempts=200,
+            enable_sleep=False,
+            jitter_strategy=strategy,
+            **kwargs,
+        )
+    )
+
+
+def test_jitter_pct_stays_within_band():
+    for _ in range(200):
+        assert 0.9 <= _apply_jitter(1, 0.1, 0.1, 10) <= 1.1
+
+
+def test_jitter_strategies_respect_bounds():
+    for strategy in ("pct", "full", "equal", "decorrelated"):
+        delays = _strategy_delays(strategy, jitter_pct=0.5)
+        assert delays[0] == 0
+        assert all(1 <= d <= 10 for d in delays[1:]), strategy
+
+
+def test_full_jitter_spreads_delays():
+    delays = _strategy_delays("full")[10:]  # current delay is capped at max_sleep by now
+    assert min(delays) < 5 < max(delays)
+
+
+def test_equal_jitter_keeps_half_delay():
+    delays = _strategy_delays("equal")[10:]
+    assert all(5 <= d <= 10 for d in delays)
+
+
+def test_callable_jitter_strategy():
+    calls = []
+
+    def strategy(current, previous):
+        calls.append((current, previous))
+        return current * 100
+
+    delays = _strategy_delays(strategy)
+    assert all(d == 10 for d in delays[5:])  # clamped to max_sleep
+    assert calls[0] == (1, 1)
+    assert calls[1] == (2, 10)  # previous sleep is the clamped value
+
+
+def test_unknown_jitter_strategy():
+    with pytest.raises(ValueError, match="Unknown jitter strategy"):
+        _strategy_delays("bogus")
+
+
+async def _collect_async_delays(**kwargs):
+    return [d async for d in async_exponential_delay(**kwargs)]
+
+
+def test_async_backoff():
+    kwargs = {"minimum_sleep": 0.1, "jitter_pct": 0.0, "backoff_factor": 2, "max_attempts": 6, "enable_sleep": False}
+    delays = asyncio.run(_collect_async_delays(**kwargs))
+    assert delays == list(exponential_delay(**kwargs))
+
+
+def test_async_invalid_arguments():
+    with pytest.raises(ValueError):
+        asyncio.run(_collect_async_delays(minimum_sleep=0))
+
+
+def test_async_cutoff():
+    delays = asyncio.run(_collect_async_delays(minimum_sleep=0.01, max_sleep=0.05, cutoff=timedelta(seconds=0.3)))
+    assert sum(delays) <= 0.3 + 0.05 * 1.1
+
+
+def test_async_does_not_block_loop():
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        tick_task = asyncio.create_task(ticker())
+        await _collect_async_delays(minimum_sleep=0.05, jitter_pct=0, max_attempts=3)
+        ticks_while_sleeping = len(ticks)
+        await tick_task
+        return ticks_while_sleeping
+
+    assert asyncio.run(main()) >= 3
+
+
+def test_async_cancellation():
+    async def main():
+        async def retry_forever():
+            async for _ in async_exponential_delay(minimum_sleep=10, max_sleep=10):
+                pass
+
+        task = asyncio.create_task(retry_forever())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+
 # Tests for _normalize_jitter_pct function
 def test_normalize_jitter_pct_with_int():
     assert _normalize_jitter_pct(10) == 0.1
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from zsuite import RetryBudget
+from zsuite.backoff_sim import np, simulate_retry_storm
+
+requires_numpy = pytest.mark.skipif(np is None, reason="numpy not installed")
+
+
+def test_single_client_schedule():
+    result = simulate_retry_storm(
+        clients=1,
+        outage_duration=1.0,
+        use_numpy=False,
+        minimum_sleep=0.1,
+        backoff_factor=2,
+        jitter_pct=0,
+    )
+    # Attempts at 0, 0.1, 0.3, 0.7 fail; the attempt at 1.5 succeeds
+    assert result.total_attempts == 5
+    assert result.wasted_attempts == 4
+    assert result.recovered_clients == 1
+    assert result.time_to_recovery == pytest.approx(0.5)
+    assert result.attempts_per_bucket == [4, 1]
+
+
+def test_max_attempts_abandons_clients():
+    result = simulate_retry_storm(clients=10, outage_duration=100, use_numpy=False, max_attempts=3, jitter_pct=0)
+    assert result.abandoned_clients == 10
+    assert result.total_attempts == result.wasted_attempts == 30
+    assert result.time_to_recovery is None
+
+
+def test_horizon_stops_simulation():
+    result = simulate_retry_storm(clients=5, outage_duration=100, horizon=10, use_numpy=False, minimum_sleep=1)
+    assert result.abandoned_clients == 5
+    assert len(result.attempts_per_bucket) <= 11
+
+
+def test_rates():
+    result = simulate_retry_storm(clients=100, outage_duration=0.5, bucket_size=0.5, use_numpy=False, jitter_pct=0)
+    # Every client fails at 0, 0.1, 0.225 and 0.38 before the 0.5s outage ends
+    assert result.attempts_per_bucket[0] == 400
+    assert result.peak_rate == 800
+    assert result.average_rate == pytest.approx(result.total_attempts / (len(result.rates) * 0.5))
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        simulate_retry_storm(cutoff=10)
+    with pytest.raises(ValueError):
+        simulate_retry_storm(clients=0)
+    with pytest.raises(ValueError, match="budget"):
+        simulate_retry_storm(budget=RetryBudget(), use_numpy=False)
+
+
+def test_seed_restores_global_random_state():
+    random.seed(123)
+    expected = random.random()
+    random.seed(123)
+    first = simulate_retry_storm(clients=20, outage_duration=2, seed=7, use_numpy=False)
+    assert random.random() == expected
+    assert simulate_retry_storm(clients=20, outage_duration=2, seed=7, use_numpy=False) == first
+
+
+def test_custom_strategy_uses_python_path():
+    result = simulate_retry_storm(clients=3, outage_duration=1, jitter_strategy=lambda current, previous: 0.5)
+    assert result.total_attempts == 9
+
+
+@requires_numpy
+def test_numpy_matches_python_without_jitter():
+    kwargs = {"clients": 50, "outage_duration": 20, "arrival_window": 0, "minimum_sleep": 0.2, "jitter_pct": 0}
+    vectorized = simulate_retry_storm(use_numpy=True, **kwargs)
+    pure = simulate_retry_storm(use_numpy=False, **kwargs)
+    assert vectorized.attempts_per_bucket == pure.attempts_per_bucket
+    assert vectorized.wasted_attempts == pure.wasted_attempts
+    assert vectorized.time_to_recovery == pytest.approx(pure.time_to_recovery)
+
+
+@requires_numpy
+@pytest.mark.parametrize("strategy", ["pct", "full", "equal", "decorrelated"])
+def test_numpy_strategies(strategy):
+    result = simulate_retry_storm(
+        clients=1000, outage_duration=10, use_numpy=True, seed=1, max_sleep=5, jitter_strategy=strategy
+    )
+    assert result.recovered_clients == 1000
+    assert 0 <= result.time_to_recovery <= 5
+    assert sum(result.attempts_per_bucket) == result.total_attempts
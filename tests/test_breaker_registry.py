@@ -0,0 +1,94 @@
+import json
+import time
+
+import pytest
+
+from zsuite import BreakerRegistry, CircuitBreaker, breaker_registry, get_breaker
+from zsuite.exceptions import CircuitBreakerOpen, CircuitBreakerTripped
+
+
+def test_get_or_create_returns_same_breaker():
+    registry = BreakerRegistry()
+    first = registry.get_or_create("payments", max_events=2, time_window=1)
+    assert registry.get_or_create("payments", max_events=99, time_window=99) is first
+    assert first.name == "payments"
+    assert first.max_events == 2
+    assert "payments" in registry
+    assert registry.names() == ["payments"]
+
+
+def test_register_and_unregister():
+    registry = BreakerRegistry()
+    breaker = CircuitBreaker(max_events=1, time_window=1, name="search")
+    assert registry.register(breaker) is breaker
+    assert registry.get("search") is breaker
+    with pytest.raises(ValueError):
+        registry.register(CircuitBreaker(max_events=1, time_window=1), name="search")
+    with pytest.raises(ValueError):
+        registry.register(CircuitBreaker(max_events=1, time_window=1))
+    assert registry.unregister("search") is breaker
+    assert registry.get("search") is None
+
+
+def test_stats_counters():
+    cb = CircuitBreaker(max_events=2, time_window=10, cooldown=0.05, name="upstream")
+    cb.increment()
+    cb.increment()
+    with pytest.raises(CircuitBreakerTripped):
+        cb.increment()
+    with pytest.raises(CircuitBreakerOpen):
+        cb.before_call()
+    stats = cb.stats()
+    assert stats["name"] == "upstream"
+    assert stats["state"] == "open"
+    assert stats["events_total"] == 3
+    assert stats["trips_total"] == 1
+    assert stats["rejections_total"] == 1
+    assert stats["open_seconds_total"] >= 0
+
+    time.sleep(0.06)
+    stats = cb.stats()
+    assert stats["state"] == "half_open"
+    assert stats["open_seconds_total"] >= 0.05
+
+
+def test_snapshot_and_log_snapshot(capsys):
+    registry = BreakerRegistry()
+    registry.get_or_create("b", max_events=5, time_window=1).increment()
+    registry.get_or_create("a", max_events=5, time_window=1)
+    snapshot = registry.snapshot()
+    assert list(snapshot) == ["a", "b"]
+    assert snapshot["b"]["events_total"] == 1
+
+    registry.log_snapshot()
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    record = json.loads(lines[1].split(" -- ", 1)[1])
+    assert record["event"] == "circuit_breaker"
+    assert record["name"] == "b"
+    assert record["count"] == 1
+
+
+def test_prometheus_text():
+    registry = BreakerRegistry()
+    registry.get_or_create('we"ird', max_events=1, time_window=10)
+    tripped = registry.get_or_create("tripped", max_events=1, time_window=10)
+    tripped.increment()
+    with pytest.raises(CircuitBreakerTripped):
+        tripped.increment()
+
+    text = registry.prometheus_text()
+    assert "# TYPE zsuite_circuit_breaker_trips_total counter" in text
+    assert 'zsuite_circuit_breaker_trips_total{name="tripped"} 1' in text
+    assert 'zsuite_circuit_breaker_events_total{name="we\\"ird"} 0' in text
+    assert 'zsuite_circuit_breaker_state{name="tripped",state="open"} 1' in text
+    assert 'zsuite_circuit_breaker_state{name="tripped",state="closed"} 0' in text
+    assert text.endswith("\n")
+
+
+def test_default_registry():
+    try:
+        breaker = get_breaker("test-default-registry", max_events=3, time_window=1)
+        assert breaker_registry.get("test-default-registry") is breaker
+    finally:
+        breaker_registry.unregister("test-default-registry")
@@ -1,9 +1,15 @@
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
 import time
+from unittest.mock import patch
 
 import pytest
 
-from zsuite import CircuitBreaker
-from zsuite.exceptions import CircuitBreakerTripped
+from zsuite import BreakerState, CircuitBreaker, SharedCircuitBreaker
+from zsuite.exceptions import CircuitBreakerOpen, CircuitBreakerTripped
 
 
 def test_increment():
@@ -31,6 +37,36 @@ def test_time_window():
     assert cb.count() == 0
 
 
+def test_increment_only_recovers_after_time_window():
+    cb = CircuitBreaker(max_events=3, time_window=0.2)
+    for _ in range(3):
+        cb.increment()
+    with pytest.raises(CircuitBreakerTripped):
+        cb.increment()
+    time.sleep(0.3)  # Sleep to exceed the time window and cooldown
+    assert cb.count() == 0
+    cb.increment()
+    assert cb.state is BreakerState.CLOSED
+    assert cb.count() == 1
+    time.sleep(0.3)
+    cb.increment()
+    cb.increment()
+    assert cb.count() == 2
+
+
+def test_increment_while_half_open_with_full_window_reopens():
+    cb = CircuitBreaker(max_events=2, time_window=10, cooldown=0.05)
+    cb.increment()
+    cb.increment()
+    with pytest.raises(CircuitBreakerTripped):
+        cb.increment()
+    time.sleep(0.1)
+    assert cb.state is BreakerState.HALF_OPEN
+    with pytest.raises(CircuitBreakerTripped):
+        cb.increment()
+    assert cb.state is BreakerState.OPEN
+
+
 def test_custom_exception():
     custom_exc = ValueError
     cb = CircuitBreaker(max_events=1, time_window=1, custom_exception=custom_exc)
@@ -44,3 +80,312 @@ def test_initialization_fails():
         CircuitBreaker(max_events=None, time_window=1)
     with pytest.raises(ValueError):
         CircuitBreaker(max_events=3, time_window=None)
+
+
+def test_bucketed_increment():
+    cb = CircuitBreaker(max_events=3, time_window=1, bucket_resolution=0.1)
+    for _ in range(3):
+        cb.increment()
+    assert cb.count() == 3
+    with pytest.raises(CircuitBreakerTripped):
+        cb.increment()
+    cb.reset()
+    assert cb.count() == 0
+
+
+def test_bucketed_time_window():
+    cb = CircuitBreaker(max_events=3, time_window=0.5, bucket_resolution=0.1)
+    cb.increment()
+    time.sleep(0.3)
+    cb.increment()
+    assert cb.count() == 2
+    time.sleep(0.35)
+    assert cb.count() == 1
+    time.sleep(0.3)
+    assert cb.count() == 0
+
+
+def test_bucketed_memory_is_bounded():
+    cb = CircuitBreaker(max_events=100_000, time_window=60, bucket_resolution=1)
+    for _ in range(50_000):
+        cb.increment()
+    assert cb.count() == 50_000
+    assert len(cb._window._window._counts) == 60
+
+
+def test_bucketed_invalid_resolution():
+    with pytest.raises(ValueError):
+        CircuitBreaker(max_events=3, time_window=1, bucket_resolution=0)
+
+
+def test_uses_monotonic_clock(monkeypatch):
+    cb = CircuitBreaker(max_events=3, time_window=10, bucket_resolution=1)
+    cb.increment()
+    monkeypatch.setattr(time, "time", lambda: 0)  # wall clock jumps back
+    assert cb.count() == 1
+
+
+def _hammer(cb, threads, per_thread):
+    tripped = []
+
+    def worker():
+        for _ in range(per_thread):
+            try:
+                cb.increment()
+            except CircuitBreakerTripped:
+                tripped.append(1)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return len(tripped)
+
+
+def test_concurrent_increments_are_exact():
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force frequent thread switches to expose races
+    try:
+        cb = CircuitBreaker(max_events=1000, time_window=60)
+        tripped = _hammer(cb, threads=8, per_thread=500)
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert cb.count() == 1000
+    assert tripped == 3000
+
+
+def test_striped_counter():
+    cb = CircuitBreaker(max_events=10_000, time_window=60, bucket_resolution=1, stripes=4)
+    assert _hammer(cb, threads=8, per_thread=1000) == 0
+    assert cb.count() == 8000
+    cb.reset()
+    assert cb.count() == 0
+
+
+def test_striped_counter_trips_near_limit():
+    stripes = 4
+    cb = CircuitBreaker(max_events=1000, time_window=60, bucket_resolution=1, stripes=stripes)
+    _hammer(cb, threads=8, per_thread=500)
+    assert cb.count() == 1000
+
+
+def test_invalid_stripes():
+    with pytest.raises(ValueError):
+        CircuitBreaker(max_events=3, time_window=1, stripes=0)
+
+
+def test_open_state_fails_fast():
+    cb = CircuitBreaker(max_events=2, time_window=10, cooldown=10)
+    calls = []
+
+    @cb
+    def downstream():
+        calls.append(1)
+        raise ConnectionError("down")
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            downstream()
+    assert cb.state is BreakerState.OPEN
+    with pytest.raises(CircuitBreakerOpen):
+        downstream()
+    assert len(calls) == 3  # no downstream call while open
+
+
+def test_half_open_probe_closes_breaker():
+    cb = CircuitBreaker(max_events=1, time_window=10, cooldown=0.1)
+    with pytest.raises(CircuitBreakerTripped):
+        cb.increment()
+        cb.increment()
+    assert cb.state is BreakerState.OPEN
+    time.sleep(0.15)
+    assert cb.state is BreakerState.HALF_OPEN
+    with cb:
+        pass
+    assert cb.state is BreakerState.CLOSED
+    assert cb.count() == 0
+
+
+def test_half_open_failure_reopens():
+    cb = CircuitBreaker(max_events=1, time_window=10, cooldown=0.1)
+    cb.record_failure()
+    cb.record_failure()
+    time.sleep(0.15)
+    with pytest.raises(ConnectionError), cb:
+        raise ConnectionError("still down")
+    assert cb.state is BreakerState.OPEN
+
+
+def test_record_failure_reports_open_breaker():
+    cb = CircuitBreaker(max_events=1, time_window=10)
+    assert not cb.record_failure()
+    assert cb.record_failure()  # trips
+    # A failure recorded after another caller tripped the breaker still reports it as open
+    assert cb.record_failure()
+    assert cb.state is BreakerState.OPEN
+    assert cb.stats()["events_total"] == 3
+
+
+def test_half_open_limits_probes():
+    cb = CircuitBreaker(max_events=1, time_window=10, cooldown=0.05, half_open_max_calls=2)
+    cb.record_failure()
+    cb.record_failure()
+    time.sleep(0.1)
+    cb.before_call()
+    cb.before_call()
+    with pytest.raises(CircuitBreakerOpen):
+        cb.before_call()
+
+
+def test_release_probe_frees_half_open_slot():
+    cb = CircuitBreaker(max_events=1, time_window=10, cooldown=0.05)
+    cb.record_failure()
+    cb.record_failure()
+    time.sleep(0.1)
+    cb.before_call()
+    with pytest.raises(CircuitBreakerOpen):
+        cb.before_call()
+    cb.release_probe()
+    assert cb.state is BreakerState.HALF_OPEN
+    cb.before_call()
+
+
+def test_open_breaker_raises_custom_exception():
+    cb = CircuitBreaker(max_events=1, time_window=10, custom_exception=ValueError)
+    cb.record_failure()
+    cb.record_failure()
+    with pytest.raises(ValueError, match="open"), cb:
+        pass
+
+
+def test_failure_ratio_trips():
+    cb = CircuitBreaker(max_events=100, time_window=10, failure_ratio=0.5, min_calls=4)
+    cb.record_success()
+    cb.record_success()
+    assert not cb.record_failure()
+    assert cb.record_failure()
+    assert cb.state is BreakerState.OPEN
+
+
+def test_failure_exceptions_filter():
+    cb = CircuitBreaker(max_events=1, time_window=10, failure_exceptions=ConnectionError)
+    for _ in range(3):
+        with pytest.raises(KeyError), cb:
+            raise KeyError("not a downstream failure")
+    assert cb.state is BreakerState.CLOSED
+    assert cb.count() == 0
+
+
+def test_async_breaker():
+    cb = CircuitBreaker(max_events=1, time_window=10)
+
+    @cb
+    async def downstream():
+        raise ConnectionError("down")
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await downstream()
+        with pytest.raises(CircuitBreakerOpen):
+            await downstream()
+
+    asyncio.run(main())
+
+
+def test_shared_breaker_shares_window(tmp_path):
+    path = tmp_path / "breaker"
+    a = SharedCircuitBreaker(path, max_events=3, time_window=10)
+    b = SharedCircuitBreaker(path, max_events=3, time_window=10)
+    a.increment()
+    b.increment()
+    a.increment()
+    assert b.count() == 3
+    with pytest.raises(CircuitBreakerTripped):
+        b.increment()
+    assert a.state is BreakerState.OPEN
+    with pytest.raises(CircuitBreakerOpen), a:
+        pass
+    b.reset()
+    assert a.state is BreakerState.CLOSED
+    assert a.count() == 0
+
+
+def test_shared_breaker_half_open(tmp_path):
+    a = SharedCircuitBreaker(tmp_path / "breaker", max_events=1, time_window=10, cooldown=0.1)
+    b = SharedCircuitBreaker(tmp_path / "breaker", max_events=1, time_window=10, cooldown=0.1)
+    a.record_failure()
+    a.record_failure()
+    time.sleep(0.15)
+    b.before_call()  # b takes the only probe slot
+    with pytest.raises(CircuitBreakerOpen):
+        a.before_call()
+    b.record_success()
+    assert a.state is BreakerState.CLOSED
+
+
+def _probe_and_die(cb):
+    cb.before_call()
+    os._exit(1)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork is POSIX only")
+def test_shared_breaker_reclaims_probe_from_killed_worker(tmp_path):
+    cb = SharedCircuitBreaker(tmp_path / "breaker", max_events=1, time_window=10, cooldown=0.1)
+    cb.record_failure()
+    cb.record_failure()
+    time.sleep(0.15)
+    child = multiprocessing.get_context("fork").Process(target=_probe_and_die, args=(cb,))
+    child.start()
+    child.join()
+    assert child.exitcode == 1
+    assert cb._half_open_calls == 1
+    with pytest.raises(CircuitBreakerOpen):
+        cb.before_call()
+    time.sleep(0.15)  # the dead worker's probe has now been out longer than the cooldown
+    cb.before_call()
+    cb.record_success()
+    assert cb.state is BreakerState.CLOSED
+
+
+def test_shared_breaker_discards_state_from_previous_boot(tmp_path):
+    path = tmp_path / "breaker"
+    cb = SharedCircuitBreaker(path, max_events=1, time_window=10, cooldown=5)
+    cb.record_failure()
+    cb.record_failure()
+    assert cb.state is BreakerState.OPEN
+    cb._opened_at = time.monotonic() + 3600  # as if saved before a reboot, with a larger uptime
+    cb.close()
+    assert SharedCircuitBreaker(path, max_events=1, time_window=10, cooldown=5).state is BreakerState.CLOSED
+
+    cb = SharedCircuitBreaker(path, max_events=1, time_window=10, cooldown=5)
+    cb.record_failure()
+    cb.record_failure()
+    with patch("zsuite.circuit_breaker._boot_id", return_value=12345):
+        reopened = SharedCircuitBreaker(path, max_events=1, time_window=10, cooldown=5)
+    assert reopened.state is BreakerState.CLOSED
+    assert reopened.count() == 0
+
+
+def test_shared_breaker_layout_mismatch(tmp_path):
+    SharedCircuitBreaker(tmp_path / "breaker", max_events=3, time_window=10)
+    with pytest.raises(ValueError, match="buckets"):
+        SharedCircuitBreaker(tmp_path / "breaker", max_events=3, time_window=20)
+
+
+def _shared_failures(cb, count):
+    for _ in range(count):
+        cb.record_failure()
+
+
+def test_shared_breaker_across_processes(tmp_path):
+    path = tmp_path / "breaker"
+    cb = SharedCircuitBreaker(path, max_events=1000, time_window=60)  # forked workers inherit this instance
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_shared_failures, args=(cb, 100)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+    assert cb.count() == 400
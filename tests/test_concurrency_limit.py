@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from zsuite import AdaptiveConcurrencyLimiter, BreakerState, CircuitBreaker, exponential_delay
+from zsuite.exceptions import CircuitBreakerOpen, ConcurrencyLimitExceeded
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"algorithm": "vegas"},
+        {"initial_limit": 0},
+        {"min_limit": 5, "initial_limit": 2},
+        {"initial_limit": 20, "max_limit": 10},
+        {"backoff_ratio": 1},
+        {"smoothing": 0},
+        {"tolerance": 0.5},
+    ],
+)
+def test_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(**kwargs)
+
+
+def test_aimd_increase_and_decrease():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+    for _ in range(5):
+        with limiter.slot():
+            pass
+    assert limiter.limit == 3
+
+    with pytest.raises(RuntimeError), limiter.slot():
+        raise RuntimeError("upstream failed")
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+def test_aimd_latency_threshold():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_threshold=0.01, backoff_ratio=0.5)
+    with limiter.slot():
+        time.sleep(0.02)
+    assert limiter.limit == 5
+
+
+def test_aimd_does_not_grow_when_idle():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10)
+    for _ in range(5):
+        with limiter.slot():
+            pass
+    assert limiter.limit == 10
+
+
+def test_unrelated_exceptions_do_not_change_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, failure_exceptions=ConnectionError)
+    with pytest.raises(KeyError), limiter.slot():
+        raise KeyError("not an upstream failure")
+    assert limiter.limit == 4
+    assert limiter.in_flight == 0
+
+
+def test_gradient_shrinks_when_latency_rises():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=20, algorithm="gradient", smoothing=1, long_window=1000)
+    limiter._on_sample(0.01, dropped=False)
+    assert limiter.limit > 20
+    grown = limiter.limit
+    for _ in range(5):
+        limiter._on_sample(1.0, dropped=False)
+    assert limiter.limit < grown
+    assert limiter.stats()["algorithm"] == "gradient"
+
+
+def test_slot_timeout():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1)
+    with limiter.slot(), pytest.raises(ConcurrencyLimitExceeded), limiter.slot(timeout=0.01):
+        pass
+    assert limiter.in_flight == 0
+
+
+def test_limits_concurrent_threads():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=3, max_limit=3)
+    peak = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal peak
+        with limiter.slot():
+            with lock:
+                peak = max(peak, limiter.in_flight)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak <= 3
+    assert limiter.in_flight == 0
+
+
+def test_limits_concurrent_tasks():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    peak = 0
+
+    async def worker():
+        nonlocal peak
+        async with limiter.slot_async():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(worker() for _ in range(10)))
+        async with limiter.slot_async():
+            with pytest.raises(ConcurrencyLimitExceeded):
+                async with limiter.slot_async(timeout=0), limiter.slot_async(timeout=0.01):
+                    pass
+
+    asyncio.run(run())
+    assert peak == 2
+    assert limiter.in_flight == 0
+
+
+def test_circuit_breaker_integration():
+    breaker = CircuitBreaker(max_events=1, time_window=10)
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, circuit_breaker=breaker)
+    for _ in range(2):
+        with pytest.raises(ConnectionError), limiter.slot():
+            raise ConnectionError
+    assert breaker.state is BreakerState.OPEN
+    with pytest.raises(CircuitBreakerOpen), limiter.slot():
+        pass
+    assert limiter.in_flight == 0
+
+
+def test_slot_timeout_is_not_a_breaker_failure():
+    breaker = CircuitBreaker(max_events=1, time_window=10)
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, circuit_breaker=breaker)
+    with limiter.slot():
+        for _ in range(3):
+            with pytest.raises(ConcurrencyLimitExceeded), limiter.slot(timeout=0):
+                pass
+    assert breaker.count() == 0
+
+
+def test_with_exponential_delay():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    attempts = 0
+    for _ in exponential_delay(minimum_sleep=0.001, max_sleep=0.01, max_attempts=5):
+        attempts += 1
+        try:
+            with limiter.slot(timeout=0):
+                if attempts < 3:
+                    raise ConnectionError
+            break
+        except ConnectionError:
+            continue
+    assert attempts == 3
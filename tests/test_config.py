@@ -1,12 +1,14 @@
 import os
+import pickle
 from pathlib import Path
 from unittest.mock import mock_open, patch
 
 import pytest
 from cryptography.fernet import Fernet
 
-from zsuite.config import load_config, load_env
-from zsuite.exceptions import MissingVaultKey
+from zsuite.config import ConfigDict, EnvSource, _decrypt_cfg_var, config_var, deep_merge, load_config, load_env
+from zsuite.crypto import decrypt_fernet_str
+from zsuite.exceptions import EncryptedValueError, MissingVaultKey
 
 
 def test_load_config():
@@ -67,3 +69,87 @@ def test_load_env():
 
     # Test case: File does not exist and required=False (should print warning)
     load_env(".does_not_exist", required=False)
+
+
+def test_config_var_caches_decrypted_secrets():
+    key = Fernet.generate_key().decode()
+    other_key = Fernet.generate_key().decode()
+    secret = f"!secret {Fernet(key).encrypt(b'first').decode()}"
+    _decrypt_cfg_var.cache_clear()
+    with (
+        patch.dict(os.environ, {"VAULT_KEY": key, "DB_PASSWORD": secret}),
+        patch("zsuite.config.decrypt_fernet_str", wraps=decrypt_fernet_str) as decrypt,
+    ):
+        assert config_var("DB_PASSWORD") == "first"
+        assert config_var("DB_PASSWORD") == "first"
+        assert decrypt.call_count == 1
+
+        # A new ciphertext or a new key is a cache miss, never a stale hit
+        os.environ["DB_PASSWORD"] = f"!secret {Fernet(key).encrypt(b'second').decode()}"
+        assert config_var("DB_PASSWORD") == "second"
+        os.environ["VAULT_KEY"] = other_key
+        os.environ["DB_PASSWORD"] = f"!secret {Fernet(other_key).encrypt(b'third').decode()}"
+        assert config_var("DB_PASSWORD") == "third"
+        assert decrypt.call_count == 3
+
+        os.environ["VAULT_KEY"] = key
+        with pytest.raises(EncryptedValueError):
+            config_var("DB_PASSWORD")
+
+
+def test_load_config_layered_sources(tmp_path):
+    key = Fernet.generate_key()
+    base = tmp_path / "base.yaml"
+    base.write_text("db:\n  primary:\n    host: base-host\n    port: 5432\n  replicas: [r1, r2]\nname: svc\n")
+    prod = tmp_path / "prod.yaml"
+    prod.write_text(
+        f"db:\n  primary:\n    host: prod-host\n  password: !secret {Fernet(key).encrypt(b'pw').decode()}\n"
+    )
+    token = Fernet(key).encrypt(b"env-token").decode()
+    environ = {
+        "APP_DB__PRIMARY__PORT": "6432",
+        "APP_DEBUG": "true",
+        "APP_API__TOKEN": f"!secret {token}",
+        "OTHER": "ignored",
+    }
+
+    # The explicit key decrypts env sources too, without VAULT_KEY in the environment
+    with patch.dict(os.environ, clear=True):
+        config = load_config(
+            decryption_key=key,
+            sources=[base, str(prod), EnvSource("APP_", environ=environ), {"name": "override"}],
+        )
+    assert isinstance(config, ConfigDict)
+    assert config["db"]["primary"] == {"host": "prod-host", "port": "6432"}
+    assert config["db"]["replicas"] == ["r1", "r2"]
+    assert config["db"]["password"] == "pw"
+    assert config["debug"] is True
+    assert config["api"]["token"] == "env-token"
+    assert config["name"] == "override"
+    assert "other" not in config
+    assert config.flat["db.primary.host"] == "prod-host"
+    assert config.flat["db.primary"] == {"host": "prod-host", "port": "6432"}
+    assert config.get_path("db.missing", "fallback") == "fallback"
+
+
+def test_deep_merge_does_not_mutate_inputs():
+    base = {"a": {"b": 1, "c": 2}, "d": [1]}
+    override = {"a": {"b": 3}, "d": [2]}
+    assert deep_merge(base, override) == {"a": {"b": 3, "c": 2}, "d": [2]}
+    assert base == {"a": {"b": 1, "c": 2}, "d": [1]}
+
+
+def test_config_dict_reindex_and_pickle():
+    config = ConfigDict({"a": {"b": 1}})
+    config["c"] = 2
+    assert "c" not in config.flat
+    config.reindex()
+    assert config.flat["c"] == 2
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored == config
+    assert restored.flat["a.b"] == 1
+
+
+def test_env_source_requires_prefix():
+    with pytest.raises(ValueError):
+        EnvSource("")
@@ -0,0 +1,61 @@
+import multiprocessing
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from zsuite import ConfigDict, ConfigHandoff, attach_config, config_var, worker_config
+from zsuite.service import SVCObj
+
+
+def read_worker_config(path):
+    return worker_config().get_path(path), config_var(path)
+
+
+@pytest.fixture
+def config():
+    return ConfigDict({"db": {"host": "db1", "password": "s3cret"}, "workers": 4})
+
+
+@pytest.mark.parametrize("use_shared_memory", [True, False])
+@pytest.mark.parametrize("start_method", ["spawn", "fork"])
+def test_pool_workers_attach(config, use_shared_memory, start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{start_method} is not available")
+    context = multiprocessing.get_context(start_method)
+    with (
+        ConfigHandoff(config, shared_memory=use_shared_memory) as handoff,
+        ProcessPoolExecutor(2, mp_context=context, initializer=handoff.initializer, initargs=handoff.initargs) as pool,
+    ):
+        results = list(pool.map(read_worker_config, ["db.host", "db.password", "workers"]))
+    assert results == [("db1", "db1"), ("s3cret", "s3cret"), (4, 4)]
+
+
+def test_attach_in_process(config, monkeypatch):
+    monkeypatch.setattr(SVCObj, "svc", None)
+    with ConfigHandoff(config) as handoff:
+        (ref,) = handoff.initargs
+        assert attach_config(ref) == config
+    assert worker_config() == config
+    assert SVCObj.svc.config == config
+
+
+def test_shared_memory_released_on_close(config):
+    handoff = ConfigHandoff(config)
+    (ref,) = handoff.initargs
+    handoff.close()
+    handoff.close()
+    with pytest.raises(FileNotFoundError):
+        attach_config(ref)
+
+
+def test_unrelated_process_does_not_unlink_block(config):
+    # A process that isn't a multiprocessing child has its own resource tracker, which must not remove the block
+    with ConfigHandoff(config, install=False) as handoff:
+        (ref,) = handoff.initargs
+        code = f"from zsuite.config_handoff import attach_config; print(attach_config({ref!r})['workers'])"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "4"
+        assert "leaked" not in output.stderr
+        assert attach_config(ref) == config
@@ -0,0 +1,161 @@
+import os
+import pickle
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from cryptography.fernet import Fernet
+
+from zsuite import ConfigSchema, Setting, parse_duration
+
+
+class AppConfig(ConfigSchema):
+    port = Setting(int, default=8080)
+    ratio = Setting(float, default=0.5)
+    debug = Setting(bool, default=False)
+    name = Setting(str)
+    timeout = Setting(timedelta, default="30s")
+    hosts = Setting(list, key="upstream.hosts", default=[])
+    ports = Setting(list, item_type=int, default="80, 443")
+    launch = Setting(datetime, default=None)
+    password = Setting(str, default="hunter2", secret=True)
+
+
+@pytest.mark.parametrize(
+    ("raw", "seconds"),
+    [("30s", 30), ("1h30m", 5400), ("250ms", 0.25), ("2.5", 2.5), (10, 10), ("1d 2h", 93600), ("3 min", 180)],
+)
+def test_parse_duration(raw, seconds):
+    assert parse_duration(raw) == timedelta(seconds=seconds)
+
+
+@pytest.mark.parametrize("raw", ["", "ten seconds", "5 parsecs", "5s junk", True])
+def test_parse_duration_invalid(raw):
+    with pytest.raises(ValueError):
+        parse_duration(raw)
+
+
+def test_load_defaults_and_precedence():
+    environ = {"NAME": "svc", "PORT": "9000", "DEBUG": "yes", "HOSTS": "a, b,,c"}
+    config = {"port": 1234, "ratio": 0.75, "upstream": {"hosts": ["ignored"]}, "launch": "2024-03-15 14:30:00"}
+    cfg = AppConfig.load(config=config, environ=environ)
+    assert cfg.port == 9000
+    assert cfg.ratio == 0.75
+    assert cfg.debug is True
+    assert cfg.name == "svc"
+    assert cfg.timeout == timedelta(seconds=30)
+    assert cfg.hosts == ["a", "b", "c"]
+    assert cfg.ports == [80, 443]
+    assert cfg.launch == datetime(2024, 3, 15, 14, 30, tzinfo=timezone.utc)
+
+
+def test_dotted_config_key():
+    cfg = AppConfig.load(config={"name": "svc", "upstream": {"hosts": ["x", "y"]}}, environ={})
+    assert cfg.hosts == ["x", "y"]
+
+
+def test_all_errors_reported_together():
+    with pytest.raises(ValueError) as exc_info:
+        AppConfig.load(config={}, environ={"PORT": "eighty", "DEBUG": "maybe", "TIMEOUT": "soon"})
+    message = str(exc_info.value)
+    for name in ("port", "debug", "timeout", "name"):
+        assert f"{name}:" in message
+
+
+def test_secret_errors_reported_with_the_rest():
+    token = Fernet(Fernet.generate_key()).encrypt(b"s3cret").decode()
+    config = {"name": "svc", "port": "abc", "password": f"!secret {token}"}
+    with patch.dict(os.environ, clear=True), pytest.raises(ValueError) as exc_info:
+        AppConfig.load(config=config, environ={})
+    assert "port:" in str(exc_info.value)
+    assert "password: cannot decrypt secret" in str(exc_info.value)
+    with patch.dict(os.environ, {"VAULT_KEY": Fernet.generate_key().decode()}), pytest.raises(ValueError) as exc_info:
+        AppConfig.load(config=config, environ={})
+    assert "password: cannot decrypt secret" in str(exc_info.value)
+    assert "s3cret" not in str(exc_info.value)
+
+
+def test_secret_values_left_out_of_errors():
+    class Secrets(ConfigSchema):
+        pin = Setting(int, secret=True)
+        count = Setting(int)
+
+    with pytest.raises(ValueError) as exc_info:
+        Secrets.load(config={"pin": "hunter2", "count": "seven"}, environ={})
+    message = str(exc_info.value)
+    assert "hunter2" not in message
+    assert "pin: cannot convert secret value to int" in message
+    assert "'seven'" in message
+
+    key = Fernet.generate_key().decode()
+    token = Fernet(key).encrypt(b"hunter2").decode()
+    with patch.dict(os.environ, {"VAULT_KEY": key}), pytest.raises(ValueError) as exc_info:
+        Secrets.load(config={"pin": 1, "count": f"!secret {token}"}, environ={})
+    assert "hunter2" not in str(exc_info.value)
+    assert exc_info.value.__cause__ is None
+
+
+def test_decrypted_values_masked_in_repr():
+    key = Fernet.generate_key().decode()
+    token = Fernet(key).encrypt(b"s3cret").decode()
+    with patch.dict(os.environ, {"VAULT_KEY": key}):
+        cfg = AppConfig.load(config={"name": f"!secret {token}"}, environ={})
+    assert cfg.name == "s3cret"
+    assert "s3cret" not in repr(cfg)
+    assert "s3cret" not in repr(pickle.loads(pickle.dumps(cfg)))
+
+
+@pytest.mark.parametrize("key", ["port", "ratio"])
+def test_bools_rejected_for_numbers(key):
+    with pytest.raises(ValueError, match=f"{key}:"):
+        AppConfig.load(config={"name": "svc", key: True}, environ={})
+
+
+def test_frozen_slots_instance():
+    cfg = AppConfig.load(config={"name": "svc"}, environ={})
+    assert not hasattr(cfg, "__dict__")
+    with pytest.raises(AttributeError):
+        cfg.port = 1
+    with pytest.raises(AttributeError):
+        del cfg.port
+    with pytest.raises(AttributeError):
+        cfg.prot  # noqa: B018
+
+
+def test_repr_masks_secrets_and_pickle_roundtrip():
+    cfg = AppConfig.load(config={"name": "svc"}, environ={})
+    assert "hunter2" not in repr(cfg)
+    assert "port=8080" in repr(cfg)
+    assert pickle.loads(pickle.dumps(cfg)) == cfg
+
+
+def test_secret_values_are_decrypted():
+    key = Fernet.generate_key().decode()
+    token = Fernet(key).encrypt(b"s3cret").decode()
+    with patch.dict(os.environ, {"VAULT_KEY": key}):
+        cfg = AppConfig.load(config={"name": "svc"}, environ={"PASSWORD": f"!secret {token}"})
+    assert cfg.password == "s3cret"
+
+
+def test_injected_environ_supplies_config_file_and_vault_key(tmp_path):
+    key = Fernet.generate_key().decode()
+    token = Fernet(key).encrypt(b"s3cret").decode()
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(f"name: svc\nport: 9000\nratio: !secret {Fernet(key).encrypt(b'0.25').decode()}\n")
+    environ = {"CONFIG_FILE": str(config_file), "VAULT_KEY": key, "PASSWORD": f"!secret {token}"}
+    with patch.dict(os.environ, clear=True):
+        cfg = AppConfig.load(environ=environ)
+    assert cfg.name == "svc"
+    assert cfg.port == 9000
+    assert cfg.ratio == 0.25
+    assert cfg.password == "s3cret"
+
+
+def test_inheritance_and_env_opt_out():
+    class Child(AppConfig):
+        region = Setting(str, default="us-east-1", env=False)
+
+    cfg = Child.load(config={"name": "svc"}, environ={"REGION": "ignored"})
+    assert cfg.region == "us-east-1"
+    assert cfg.port == 8080
+    assert set(Child.__settings__) == set(AppConfig.__settings__) | {"region"}
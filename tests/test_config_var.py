@@ -3,8 +3,9 @@ import os
 import pytest
 from cryptography.fernet import Fernet
 
-from zsuite.config import config_var
+from zsuite.config import ConfigDict, config_var
 from zsuite.exceptions import EncryptedValueError, MissingVaultKey
+from zsuite.service import SVC, SVCObj
 
 
 # Test case for retrieving a config variable from os.environ
@@ -64,3 +65,24 @@ def test_config_var_secret(monkeypatch):
     monkeypatch.setenv("VAULT_KEY", key.decode())
     result = config_var("SECRET_CFG_VAR")
     assert result == test_pw
+
+
+def test_config_var_falls_back_to_svc_config(monkeypatch):
+    monkeypatch.setattr(SVCObj, "svc", SVC())
+    SVCObj.svc.config = ConfigDict({"db": {"primary": {"host": "db1"}}, "feature_flag": "true", "timeout": 5})
+    monkeypatch.delenv("TIMEOUT", raising=False)
+    assert config_var("db.primary.host") == "db1"
+    assert config_var("FEATURE_FLAG") is True
+    assert config_var("TIMEOUT") == 5
+    monkeypatch.setenv("TIMEOUT", "10")
+    assert config_var("TIMEOUT") == "10"
+    assert config_var("MISSING", default="x") == "x"
+    with pytest.raises(ValueError):
+        config_var("MISSING")
+
+
+def test_config_var_falls_back_to_plain_dict(monkeypatch):
+    monkeypatch.setattr(SVCObj, "svc", SVC())
+    SVCObj.svc.config = {"db": {"host": "db2"}, "name": "svc"}
+    assert config_var("db.host") == "db2"
+    assert config_var("NAME") == "svc"
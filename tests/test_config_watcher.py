@@ -0,0 +1,104 @@
+import os
+import threading
+
+import pytest
+
+from zsuite import ConfigWatcher, diff_config
+from zsuite.config_watcher import _libc
+
+
+def write(path, text):
+    # Write to a temp file and rename over the original, the way editors and deploy tools do
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
+
+
+def test_diff_config():
+    old = {"db": {"host": "a", "port": 1}, "debug": False, "gone": 1}
+    new = {"db": {"host": "b", "port": 1}, "debug": False, "new": {"key": 2}}
+    diff = diff_config(old, new)
+    assert diff.changed == {"db.host"}
+    assert diff.added == {"new.key"}
+    assert diff.removed == {"gone"}
+    assert diff.keys == {"db.host", "new.key", "gone"}
+    assert not diff_config(old, dict(old))
+
+
+def test_check_reloads_on_change(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("db:\n  host: a\n")
+    watcher = ConfigWatcher(config_file, use_inotify=False)
+    seen = []
+    watcher.subscribe(lambda config, diff: seen.append((config, diff)))
+
+    assert watcher.config == {"db": {"host": "a"}}
+    assert watcher.check() is None
+    write(config_file, "db:\n  host: b\n")
+    diff = watcher.check()
+    assert diff.changed == {"db.host"}
+    assert watcher.config == {"db": {"host": "b"}}
+    assert seen == [({"db": {"host": "b"}}, diff)]
+
+
+def test_bad_file_keeps_previous_config(tmp_path, capsys):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("a: 1\n")
+    watcher = ConfigWatcher(config_file, use_inotify=False)
+    write(config_file, "a: [unclosed\n")
+    assert watcher.check() is None
+    assert watcher.config == {"a": 1}
+    assert "keeping the previous config" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("text", ["", "- a\n- b\n", "just a string\n"])
+def test_empty_or_partial_file_keeps_previous_config(tmp_path, capsys, text):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("upstream:\n  timeout: 5\n")
+    watcher = ConfigWatcher(config_file, use_inotify=False)
+    config_file.write_text(text)  # truncated in place, as the first step of a non-atomic save
+    assert watcher.check() is None
+    assert watcher.config == {"upstream": {"timeout": 5}}
+    assert "does not hold a mapping" in capsys.readouterr().out
+    config_file.write_text("upstream:\n  timeout: 6\n")
+    assert watcher.check().changed == {"upstream.timeout"}
+
+
+def test_subscriber_errors_do_not_stop_others(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("a: 1\n")
+    watcher = ConfigWatcher(config_file, use_inotify=False)
+    seen = []
+
+    @watcher.subscribe
+    def broken(config, diff):
+        raise RuntimeError("boom")
+
+    watcher.subscribe(lambda config, diff: seen.append(config))
+    write(config_file, "a: 2\n")
+    watcher.check()
+    assert seen == [{"a": 2}]
+    watcher.unsubscribe(broken)
+    assert len(watcher._subscribers) == 1
+
+
+def test_missing_config_file_env(monkeypatch):
+    monkeypatch.delenv("CONFIG_FILE", raising=False)
+    with pytest.raises(Exception, match="CONFIG_FILE not set"):
+        ConfigWatcher()
+
+
+@pytest.mark.parametrize(
+    "use_inotify",
+    [False, pytest.param(True, marks=pytest.mark.skipif(_libc() is None, reason="inotify not available"))],
+)
+def test_background_watch(tmp_path, use_inotify):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text("a: 1\n")
+    changed = threading.Event()
+    with ConfigWatcher(config_file, poll_interval=0.01, use_inotify=use_inotify) as watcher:
+        watcher.subscribe(lambda config, diff: changed.set())
+        write(config_file, "a: 2\nb: 3\n")
+        assert changed.wait(5)
+    assert watcher.config == {"a": 2, "b": 3}
+    assert watcher._thread is None
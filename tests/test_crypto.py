@@ -1,7 +1,23 @@
-from cryptography.fernet import Fernet
+import io
+from unittest.mock import patch
+
+import pytest
+from cryptography.fernet import Fernet, InvalidToken
 
 from zsuite import want_bytes
-from zsuite.crypto import decrypt_fernet_str, encrypt_fernet_str
+from zsuite.crypto import (
+    _CHUNK_PREFIX,
+    RotatingFernet,
+    _token_length,
+    decrypt_fernet_str,
+    decrypt_file,
+    decrypt_many,
+    encrypt_fernet_str,
+    encrypt_file,
+    encrypt_many,
+    get_cipher,
+)
+from zsuite.exceptions import EncryptedFileError
 
 
 def test_round_trip_str():
@@ -33,3 +49,212 @@ def test_mixed_types():
     encrypted_value_bytes = encrypt_fernet_str(key_bytes, value_bytes)
     decrypted_value_bytes = decrypt_fernet_str(key_bytes, encrypted_value_bytes)
     assert decrypted_value_bytes == value_bytes.decode()
+
+
+def test_cipher_cache():
+    key = Fernet.generate_key()
+    assert get_cipher(key) is get_cipher(key.decode())
+    assert isinstance(get_cipher(key), Fernet)
+    get_cipher.cache_clear()
+    assert get_cipher(key) is not None
+    with pytest.raises(ValueError):
+        get_cipher("not-a-key")
+    with pytest.raises(ValueError):
+        get_cipher([])
+
+
+def test_key_rotation():
+    old_key, new_key = Fernet.generate_key().decode(), Fernet.generate_key().decode()
+    old_token = encrypt_fernet_str(old_key, "old")
+    rotating = f"{new_key},{old_key}"
+
+    assert isinstance(get_cipher(rotating), RotatingFernet)
+    assert get_cipher(rotating) is get_cipher([new_key, old_key])
+    assert decrypt_fernet_str(rotating, old_token) == "old"
+    # New values are encrypted with the newest key only
+    new_token = encrypt_fernet_str(rotating, "new")
+    assert decrypt_fernet_str(new_key, new_token) == "new"
+    with pytest.raises(InvalidToken):
+        decrypt_fernet_str(old_key, new_token)
+    with pytest.raises(InvalidToken):
+        decrypt_fernet_str(rotating, encrypt_fernet_str(Fernet.generate_key(), "other"))
+
+
+def test_rotating_fernet_tries_last_successful_key_first():
+    keys = [Fernet(Fernet.generate_key()) for _ in range(3)]
+    cipher = RotatingFernet(keys)
+    token = keys[2].encrypt(b"value")
+    assert cipher.decrypt(token) == b"value"
+    with patch.object(keys[0], "decrypt", side_effect=AssertionError("newest key tried first")):
+        assert cipher.decrypt(token) == b"value"
+    assert cipher.rotate(token) != token
+    assert keys[0].decrypt(cipher.rotate(token)) == b"value"
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_encrypt_decrypt_many_round_trip(workers):
+    key = Fernet.generate_key()
+    values = [f"value-{i}" for i in range(50)]
+    tokens = encrypt_many(key, (v for v in values), workers=workers, chunk_size=7)
+    assert len(tokens) == len(values)
+    assert [decrypt_fernet_str(key, t) for t in tokens] == values
+    assert decrypt_many(key, tokens, workers=workers, chunk_size=7) == values
+
+
+def test_many_accepts_bytes_and_empty_input():
+    key = Fernet.generate_key()
+    assert encrypt_many(key, []) == []
+    assert encrypt_many(key, [], workers=2) == []
+    tokens = encrypt_many(key, [b"a", "b"])
+    assert decrypt_many(key, tokens) == ["a", "b"]
+
+
+def test_many_builds_one_cipher():
+    key = Fernet.generate_key()
+    get_cipher.cache_clear()
+    with patch("zsuite.crypto.Fernet", wraps=Fernet) as fernet:
+        encrypt_many(key, ["a"] * 20, workers=2, chunk_size=3)
+    assert fernet.call_count == 1
+
+
+def test_decrypt_many_invalid_token():
+    tokens = encrypt_many(Fernet.generate_key(), ["a", "b"])
+    with pytest.raises(InvalidToken):
+        decrypt_many(Fernet.generate_key(), tokens, workers=2, chunk_size=1)
+
+
+def test_many_rejects_bad_arguments():
+    key = Fernet.generate_key()
+    with pytest.raises(ValueError):
+        encrypt_many(key, ["a"], workers=0)
+    with pytest.raises(ValueError):
+        decrypt_many(key, ["a"], workers=2, chunk_size=0)
+
+
+def _encrypted(key, data, **kwargs):
+    out = io.BytesIO()
+    count = encrypt_file(key, io.BytesIO(data), out, **kwargs)
+    return out.getvalue(), count
+
+
+def _decrypted(key, blob, **kwargs):
+    out = io.BytesIO()
+    written = decrypt_file(key, io.BytesIO(blob), out, **kwargs)
+    assert written == len(out.getvalue())
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("size", [0, 1, 99, 100, 101, 1000])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_file_round_trip(size, workers):
+    key = Fernet.generate_key()
+    data = (bytes(range(256)) * 4)[:size]
+    blob, count = _encrypted(key, data, chunk_size=100, workers=workers)
+    assert count == max(1, -(-size // 100))
+    assert _decrypted(key, blob, workers=workers) == data
+
+
+def test_file_paths(tmp_path):
+    key = Fernet.generate_key()
+    (tmp_path / "plain").write_bytes(b"x" * 5000)
+    encrypt_file(key, tmp_path / "plain", str(tmp_path / "enc"), chunk_size=1024)
+    decrypt_file(key, str(tmp_path / "enc"), tmp_path / "out")
+    assert (tmp_path / "out").read_bytes() == b"x" * 5000
+
+
+def test_file_token_length_is_predictable():
+    cipher = Fernet(Fernet.generate_key())
+    for length in (0, 15, 16, 17, 1000, 65536):
+        assert len(cipher.encrypt(b"a" * length)) == _token_length(length)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_file_random_access(workers):
+    key = Fernet.generate_key()
+    data = bytes(i % 251 for i in range(1050))
+    blob, count = _encrypted(key, data, chunk_size=100)
+    assert count == 11
+    assert _decrypted(key, blob, start_chunk=3, end_chunk=5, workers=workers) == data[300:500]
+    assert _decrypted(key, blob, start_chunk=9) == data[900:]
+    assert _decrypted(key, blob, start_chunk=10, end_chunk=20) == data[1000:]
+    assert _decrypted(key, blob, start_chunk=4, end_chunk=4) == b""
+    assert _decrypted(key, blob, start_chunk=11, end_chunk=20, workers=workers) == b""
+    assert _decrypted(key, blob, start_chunk=15, end_chunk=16) == b""
+    assert _decrypted(key, blob, start_chunk=12) == b""
+
+
+def test_file_range_past_end_still_detects_truncation():
+    key = Fernet.generate_key()
+    blob, _ = _encrypted(key, b"a" * 250, chunk_size=100)
+    frame = 4 + _token_length(_CHUNK_PREFIX.size + 100)
+    without_final = blob[: len(blob) - (4 + _token_length(_CHUNK_PREFIX.size + 50))]
+    assert len(without_final) == 25 + 2 * frame
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, without_final, start_chunk=3, end_chunk=10)
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, without_final, start_chunk=2, end_chunk=3)
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, blob[:-10], start_chunk=5, end_chunk=6)
+    assert _decrypted(key, blob, start_chunk=3, end_chunk=10) == b""
+    assert _decrypted(key, blob, start_chunk=5, end_chunk=6) == b""
+
+
+def test_file_detects_truncation():
+    key = Fernet.generate_key()
+    blob, _ = _encrypted(key, b"a" * 250, chunk_size=100)
+    frame = 4 + _token_length(_CHUNK_PREFIX.size + 100)
+    header = len(blob) - 2 * frame - (4 + _token_length(_CHUNK_PREFIX.size + 50))
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, blob[: header + 2 * frame])  # whole final chunk dropped
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, blob[:-10])
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, blob[: header + 2])
+
+
+def test_file_detects_reordered_and_foreign_chunks():
+    key = Fernet.generate_key()
+    blob, _ = _encrypted(key, b"a" * 100 + b"b" * 100 + b"c" * 50, chunk_size=100)
+    other, _ = _encrypted(key, b"z" * 250, chunk_size=100)
+    frame = 4 + _token_length(_CHUNK_PREFIX.size + 100)
+    header = 25
+    first, second = blob[header : header + frame], blob[header + frame : header + 2 * frame]
+    swapped = blob[:header] + second + first + blob[header + 2 * frame :]
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, swapped)
+    spliced = blob[: header + frame] + other[header + frame : header + 2 * frame] + blob[header + 2 * frame :]
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, spliced)
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, blob + blob[header : header + frame])
+
+
+def test_file_detects_tampering_and_bad_headers():
+    key = Fernet.generate_key()
+    blob, _ = _encrypted(key, b"secret" * 100, chunk_size=100)
+    tampered = bytearray(blob)
+    tampered[60] ^= 1
+    with pytest.raises(InvalidToken):
+        _decrypted(key, bytes(tampered))
+    with pytest.raises(InvalidToken):
+        _decrypted(Fernet.generate_key(), blob)
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, b"not an encrypted file at all")
+    with pytest.raises(EncryptedFileError):
+        _decrypted(key, blob[:4] + b"\x09" + blob[5:])
+
+
+def test_file_with_rotated_keys():
+    old, new = Fernet.generate_key(), Fernet.generate_key()
+    blob, _ = _encrypted(old, b"data" * 100, chunk_size=64)
+    assert _decrypted([new, old], blob, start_chunk=2) == (b"data" * 100)[128:]
+
+
+def test_file_rejects_bad_arguments():
+    key = Fernet.generate_key()
+    with pytest.raises(ValueError):
+        encrypt_file(key, io.BytesIO(b""), io.BytesIO(), chunk_size=0)
+    with pytest.raises(ValueError):
+        encrypt_file(key, io.BytesIO(b""), io.BytesIO(), workers=0)
+    with pytest.raises(ValueError):
+        decrypt_file(key, io.BytesIO(b""), io.BytesIO(), start_chunk=3, end_chunk=2)
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from zsuite.hedging import Hedger, LatencyHistogram
+
+
+def _slow_then_fast(first_delay, second_delay=0.0):
+    calls = []
+    lock = threading.Lock()
+
+    def func():
+        with lock:
+            calls.append(time.perf_counter())
+            attempt = len(calls)
+        time.sleep(first_delay if attempt == 1 else second_delay)
+        return attempt
+
+    return func, calls
+
+
+def test_histogram_percentile():
+    histogram = LatencyHistogram(min_latency=0.001, growth=1.05)
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+    assert histogram.percentile(50) == pytest.approx(0.050, rel=0.05)
+    assert histogram.percentile(95) == pytest.approx(0.095, rel=0.05)
+    assert len(histogram) == 100
+
+
+def test_histogram_decay_and_reset():
+    histogram = LatencyHistogram(max_samples=100)
+    for _ in range(150):
+        histogram.record(0.01)
+    assert len(histogram) < 100
+    histogram.reset()
+    assert histogram.percentile(50) is None
+
+
+def test_fast_call_is_not_hedged():
+    hedger = Hedger(hedge_delay=0.5)
+    assert hedger.call(lambda x: x * 2, 21) == 42
+    assert hedger.hedges_launched == 0
+    hedger.shutdown()
+
+
+def test_slow_call_is_hedged():
+    func, calls = _slow_then_fast(1.0)
+    hedger = Hedger(hedge_delay=0.05)
+    start = time.perf_counter()
+    assert hedger.call(func) == 2
+    assert time.perf_counter() - start < 0.5
+    assert len(calls) == 2
+    assert hedger.hedges_launched == 1
+    hedger.shutdown(wait_for_calls=False)
+
+
+def test_cutoff_raises_timeout():
+    hedger = Hedger(hedge_delay=0.05)
+    with pytest.raises(TimeoutError):
+        hedger.call(time.sleep, 1, cutoff=timedelta(seconds=0.2))
+    hedger.shutdown(wait_for_calls=False)
+
+
+def test_failure_waits_for_other_attempt():
+    calls = []
+
+    def func():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            raise ConnectionError("primary failed")
+        time.sleep(0.2)
+        return "hedge"
+
+    hedger = Hedger(hedge_delay=0.01)
+    assert hedger.call(func) == "hedge"
+    hedger.shutdown()
+
+
+def test_all_attempts_fail():
+    def func():
+        raise ConnectionError("down")
+
+    hedger = Hedger(hedge_delay=0.01)
+    with pytest.raises(ConnectionError):
+        hedger.call(func)
+    hedger.shutdown()
+
+
+def test_hedge_delay_from_histogram():
+    hedger = Hedger(initial_delay=0.2, min_samples=5)
+    assert hedger.current_hedge_delay == 0.2
+    for _ in range(5):
+        hedger.call(lambda: None)
+    assert hedger.current_hedge_delay < 0.01
+    hedger.shutdown()
+
+
+def test_async_hedging():
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(1.0 if len(calls) == 1 else 0)
+        return len(calls)
+
+    async def main():
+        hedger = Hedger(hedge_delay=0.05)
+        result = await hedger.call_async(func)
+        await asyncio.sleep(0)
+        return result, hedger
+
+    result, hedger = asyncio.run(main())
+    assert result == 2
+    assert hedger.hedges_launched == 1
+
+
+def test_async_cutoff():
+    async def main():
+        hedger = Hedger(hedge_delay=0.01)
+        await hedger.call_async(asyncio.sleep, 1, cutoff=timedelta(seconds=0.1))
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(main())
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from zsuite import GCRALimiter, TokenBucket
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 0}, {"rate": 1, "capacity": 0}])
+def test_token_bucket_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        TokenBucket(**kwargs)
+
+
+def test_token_bucket_burst_then_throttle():
+    bucket = TokenBucket(rate=10, capacity=3)
+    assert all(bucket.try_acquire() for _ in range(3))
+    assert not bucket.try_acquire()
+    assert 0 < bucket.wait_time() <= 0.1
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(rate=100, capacity=1)
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    time.sleep(0.02)
+    assert bucket.try_acquire()
+
+
+def test_token_bucket_weighted_cost():
+    bucket = TokenBucket(rate=10, capacity=10)
+    assert bucket.try_acquire(cost=7)
+    assert not bucket.try_acquire(cost=4)
+    assert bucket.try_acquire(cost=3)
+    with pytest.raises(ValueError):
+        bucket.try_acquire(cost=11)
+    with pytest.raises(ValueError):
+        bucket.acquire(cost=0)
+
+
+def test_token_bucket_initial_tokens():
+    bucket = TokenBucket(rate=10, capacity=5, initial_tokens=0)
+    assert not bucket.try_acquire()
+    assert bucket.tokens < 1
+
+
+def test_acquire_blocks_until_available():
+    bucket = TokenBucket(rate=50, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    assert bucket.acquire()
+    assert time.monotonic() - start >= 0.015
+
+
+def test_acquire_timeout():
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.acquire()
+    start = time.monotonic()
+    assert not bucket.acquire(timeout=0.05)
+    assert time.monotonic() - start < 0.05
+
+
+def test_acquire_async():
+    limiter = GCRALimiter(rate=50)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(3):
+            async with limiter:
+                pass
+        assert not await limiter.acquire_async(timeout=0)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.035
+
+
+def test_gcra_burst_and_spacing():
+    limiter = GCRALimiter(rate=10, burst=3)
+    assert all(limiter.try_acquire() for _ in range(3))
+    assert not limiter.try_acquire()
+    assert limiter.wait_time() == pytest.approx(0.1, abs=0.01)
+    with pytest.raises(ValueError):
+        limiter.try_acquire(cost=4)
+
+
+def test_gcra_sustained_rate():
+    limiter = GCRALimiter(rate=200, burst=1)
+    start = time.monotonic()
+    for _ in range(21):
+        limiter.acquire()
+    # The first call is free, the next 20 are spaced 5ms apart
+    assert time.monotonic() - start >= 0.095
+
+
+@pytest.mark.parametrize("limiter", [TokenBucket(rate=1, capacity=1000), GCRALimiter(rate=1, burst=1000)])
+def test_thread_safety(limiter):
+    acquired = []
+
+    def worker():
+        acquired.append(sum(limiter.try_acquire() for _ in range(500)))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert 1000 <= sum(acquired) <= 1002
@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+from zsuite import AsyncRetryBudget, RetryBudget, Retrying, exponential_delay, retry
+
+
+def _flaky(failures, exc_type=ConnectionError):
+    calls = {"count": 0}
+
+    def func():
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise exc_type(f"failure {calls['count']}")
+        return "ok"
+
+    return func, calls
+
+
+def test_retrying_succeeds_after_failures():
+    func, calls = _flaky(2)
+    retrying = Retrying(retry_on=ConnectionError, max_attempts=5, enable_sleep=False)
+    for attempt in retrying:
+        with attempt:
+            result = func()
+    assert result == "ok"
+    assert calls["count"] == 3
+    assert retrying.state.attempts == 3
+    assert isinstance(retrying.state.last_exception, ConnectionError)
+
+
+def test_retrying_reraises_when_exhausted():
+    func, calls = _flaky(10)
+    retrying = Retrying(max_attempts=3, enable_sleep=False)
+    with pytest.raises(ConnectionError, match="failure 3"):
+        for attempt in retrying:
+            with attempt:
+                func()
+    assert calls["count"] == 3
+    assert retrying.state.attempts == 3
+
+
+def test_retrying_total_sleep():
+    func, _ = _flaky(10)
+    retrying = Retrying(minimum_sleep=0.1, jitter_pct=0, backoff_factor=2, max_attempts=4, enable_sleep=False)
+    with pytest.raises(ConnectionError):
+        for attempt in retrying:
+            with attempt:
+                func()
+    assert retrying.state.total_sleep == pytest.approx(0.1 + 0.2 + 0.4)
+
+
+def test_give_up_on_takes_precedence():
+    func, calls = _flaky(10, exc_type=PermissionError)
+
+    @retry(retry_on=OSError, give_up_on=PermissionError, max_attempts=5, enable_sleep=False)
+    def wrapped():
+        return func()
+
+    with pytest.raises(PermissionError):
+        wrapped()
+    assert calls["count"] == 1
+
+
+def test_non_matching_exception_not_retried():
+    func, calls = _flaky(10, exc_type=ValueError)
+
+    @retry(retry_on=ConnectionError, max_attempts=5, enable_sleep=False)
+    def wrapped():
+        return func()
+
+    with pytest.raises(ValueError):
+        wrapped()
+    assert calls["count"] == 1
+
+
+def test_retry_decorator_on_retry_callback():
+    func, _ = _flaky(2)
+    seen = []
+
+    @retry(max_attempts=5, enable_sleep=False, on_retry=lambda state: seen.append(state.attempts))
+    def wrapped():
+        return func()
+
+    assert wrapped() == "ok"
+    assert seen == [2, 3]
+    assert wrapped.__name__ == "wrapped"
+
+
+def test_retry_decorator_async():
+    func, calls = _flaky(2)
+
+    @retry(retry_on=ConnectionError, minimum_sleep=0.001, max_attempts=5)
+    async def wrapped():
+        await asyncio.sleep(0)
+        return func()
+
+    assert asyncio.run(wrapped()) == "ok"
+    assert calls["count"] == 3
+
+
+def test_retrying_async_exhausted():
+    func, calls = _flaky(10)
+
+    async def main():
+        retrying = Retrying(max_attempts=2, enable_sleep=False)
+        async for attempt in retrying:
+            with attempt:
+                func()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
+    assert calls["count"] == 2
+
+
+def test_retry_budget_spend_and_earn():
+    budget = RetryBudget(ratio=0.5, max_tokens=2)
+    assert budget.try_spend()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.record_success()
+    assert budget.tokens == 0.5
+    for _ in range(10):
+        budget.record_success()
+    assert budget.tokens == 2
+
+
+def test_retry_budget_invalid_arguments():
+    with pytest.raises(ValueError):
+        RetryBudget(ratio=0)
+    with pytest.raises(ValueError):
+        RetryBudget(max_tokens=0)
+
+
+def test_exponential_delay_stops_when_budget_exhausted():
+    budget = RetryBudget(max_tokens=2)
+    assert len(list(exponential_delay(max_attempts=10, enable_sleep=False, budget=budget))) == 3
+    assert len(list(exponential_delay(max_attempts=10, enable_sleep=False, budget=budget))) == 1
+
+
+def test_retrying_with_budget():
+    budget = RetryBudget(ratio=1, max_tokens=1, initial_tokens=0)
+    func, calls = _flaky(1)
+
+    @retry(max_attempts=5, enable_sleep=False, budget=budget)
+    def wrapped():
+        return func()
+
+    with pytest.raises(ConnectionError):
+        wrapped()  # no tokens to retry with
+    assert calls["count"] == 1
+    assert wrapped() == "ok"
+    assert budget.tokens == 1  # earned by the success
+
+
+def test_async_retry_budget():
+    budget = AsyncRetryBudget(max_tokens=1)
+    func, calls = _flaky(5)
+
+    @retry(max_attempts=5, enable_sleep=False, budget=budget)
+    async def wrapped():
+        return func()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(wrapped())
+    assert calls["count"] == 2
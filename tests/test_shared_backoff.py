@@ -0,0 +1,75 @@
+import multiprocessing
+import struct
+
+import pytest
+
+from zsuite import SharedBackoff, shared_exponential_delay
+from zsuite.shared_state import SharedStateFile
+
+
+def test_shared_state_file(tmp_path):
+    fmt = struct.Struct("<dQ")
+    with (
+        SharedStateFile(tmp_path / "state", fmt.size) as writer,
+        SharedStateFile(tmp_path / "state", fmt.size) as reader,
+    ):
+        with writer.locked() as buf:
+            fmt.pack_into(buf, 0, 1.5, 7)
+        with reader.locked() as buf:
+            assert fmt.unpack_from(buf) == (1.5, 7)
+
+
+def test_escalates_once_per_window(tmp_path):
+    a = SharedBackoff(tmp_path / "state", minimum_sleep=5, jitter_pct=0)
+    b = SharedBackoff(tmp_path / "state", minimum_sleep=5, jitter_pct=0)
+    assert a.record_failure() == 5
+    # b fails inside a's window: it waits for the same window instead of escalating
+    assert 4.9 < b.record_failure() <= 5
+    assert a.failures == b.failures == 1
+
+
+def test_record_success_resets(tmp_path):
+    backoff = SharedBackoff(tmp_path / "state", minimum_sleep=5, jitter_pct=0)
+    backoff.record_failure()
+    assert backoff.wait_time() > 0
+    backoff.record_success()
+    assert backoff.wait_time() == 0
+    assert backoff.failures == 0
+
+
+def test_delay_schedule_escalates(tmp_path):
+    backoff = SharedBackoff(tmp_path / "state", minimum_sleep=0.01, backoff_factor=2, jitter_pct=0)
+    delays = list(backoff.delays(max_attempts=4))
+    assert delays[0] == 0
+    assert delays[1:] == pytest.approx([0.01, 0.02, 0.04], abs=0.002)
+
+
+def test_first_delay_waits_for_other_process(tmp_path):
+    SharedBackoff(tmp_path / "state", minimum_sleep=5, jitter_pct=0).record_failure()
+    first = next(shared_exponential_delay(tmp_path / "state", enable_sleep=False))
+    assert 4.9 < first <= 5
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        SharedBackoff(tmp_path / "state", minimum_sleep=0)
+
+
+def _fail_once(path, queue):
+    gen = shared_exponential_delay(path, minimum_sleep=10, jitter_pct=0, enable_sleep=False)
+    next(gen)
+    queue.put(next(gen))
+
+
+def test_processes_share_one_delay(tmp_path):
+    path = tmp_path / "state"
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_fail_once, args=(path, queue)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+    sleeps = [queue.get(timeout=1) for _ in workers]
+    assert all(s <= 10 for s in sleeps)
+    assert SharedBackoff(path).failures == 1
@@ -0,0 +1,193 @@
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+import yaml
+from cryptography.fernet import Fernet, InvalidToken
+
+from zsuite.crypto import get_cipher
+from zsuite.yaml import LazySecret, _parse_yaml, load_and_decrypt_yaml, resolve_secrets
+
+
+@pytest.fixture
+def secret_file(tmp_path):
+    key = Fernet.generate_key()
+    fernet = Fernet(key)
+    lines = ["host: localhost", "secrets:"]
+    lines += [f"  s{i}: !secret {fernet.encrypt(f'value-{i}'.encode()).decode()}" for i in range(50)]
+    path = tmp_path / "config.yaml"
+    path.write_text("\n".join(lines) + "\n")
+    return key, path
+
+
+def test_eager_load_decrypts(secret_file):
+    key, path = secret_file
+    config = load_and_decrypt_yaml(key, path)
+    assert config["secrets"]["s7"] == "value-7"
+    assert type(config["secrets"]["s7"]) is str
+
+
+def test_lazy_load_defers_decryption(secret_file):
+    key, path = secret_file
+    with patch("zsuite.yaml.get_cipher", wraps=get_cipher) as cipher:
+        config = load_and_decrypt_yaml(key, path, lazy_secrets=True)
+        assert cipher.call_count == 0
+        secret = config["secrets"]["s3"]
+        assert isinstance(secret, LazySecret)
+        assert not secret.decrypted
+        assert secret == "value-3"
+        assert secret.upper() == "VALUE-3"
+        assert f"{secret}" == "value-3"
+        assert len(secret) == 7
+        assert cipher.call_count == 1
+    assert secret.decrypted
+    assert config["host"] == "localhost"
+    assert sum(value.decrypted for value in config["secrets"].values()) == 1
+
+
+def test_lazy_secret_behaves_like_str(secret_file):
+    key, path = secret_file
+    config = load_and_decrypt_yaml(key, path, lazy_secrets=True)
+    secret = config["secrets"]["s1"]
+    assert "value" in secret
+    assert "pw=" + secret == "pw=value-1"
+    assert secret + "!" == "value-1!"
+    assert str(secret) == "value-1"
+    assert hash(secret) == hash("value-1")
+    assert "value-1" not in repr(secret)
+    assert pickle.loads(pickle.dumps(secret)) == "value-1"
+
+
+def test_lazy_secret_equality_without_decrypting():
+    key = Fernet.generate_key()
+    token = Fernet(key).encrypt(b"x").decode()
+    first, second = LazySecret(token, key), LazySecret(token, key)
+    assert first == second
+    assert not first.decrypted
+    assert not second.decrypted
+
+
+def test_lazy_wrong_key_fails_on_access(secret_file):
+    _, path = secret_file
+    config = load_and_decrypt_yaml(Fernet.generate_key(), path, lazy_secrets=True)
+    with pytest.raises(InvalidToken):
+        str(config["secrets"]["s0"])
+
+
+def test_resolve_secrets(secret_file):
+    key, path = secret_file
+    resolved = resolve_secrets(load_and_decrypt_yaml(key, path, lazy_secrets=True))
+    assert resolved == load_and_decrypt_yaml(key, path)
+    assert all(type(value) is str for value in resolved["secrets"].values())
+
+
+def test_snapshot_cache_skips_parser(secret_file, tmp_path):
+    key, path = secret_file
+    cache_dir = tmp_path / "cache"
+    first = load_and_decrypt_yaml(key, path, cache_dir=cache_dir)
+    snapshots = list(cache_dir.glob("*.pickle"))
+    assert len(snapshots) == 1
+    # Secrets stay encrypted at rest
+    assert b"value-7" not in snapshots[0].read_bytes()
+
+    with patch("zsuite.yaml.yaml.load") as parse:
+        assert load_and_decrypt_yaml(key, path, cache_dir=cache_dir) == first
+        lazy = load_and_decrypt_yaml(key, path, cache_dir=cache_dir, lazy_secrets=True)
+        assert parse.call_count == 0
+    assert isinstance(lazy["secrets"]["s7"], LazySecret)
+    assert lazy["secrets"]["s7"] == "value-7"
+
+
+def test_snapshot_invalidated_on_change(tmp_path):
+    path = tmp_path / "config.yaml"
+    cache_dir = tmp_path / "cache"
+    path.write_text("a: 1\n")
+    assert load_and_decrypt_yaml(None, path, cache_dir=cache_dir) == {"a": 1}
+    path.write_text("a: 2\n")
+    assert load_and_decrypt_yaml(None, path, cache_dir=cache_dir) == {"a": 2}
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "config.yaml"
+    cache_dir = tmp_path / "cache"
+    path.write_text("a: 1\n")
+    load_and_decrypt_yaml(None, path, cache_dir=cache_dir)
+    for snapshot in cache_dir.glob("*.pickle"):
+        snapshot.write_bytes(b"not a pickle")
+    assert load_and_decrypt_yaml(None, path, cache_dir=cache_dir) == {"a": 1}
+
+
+def _load_counting_parses(path, cache_dir):
+    with patch("zsuite.yaml.yaml.load", wraps=yaml.load) as parse:
+        assert load_and_decrypt_yaml(None, path, cache_dir=cache_dir) == {"a": 1}
+    return parse.call_count
+
+
+def test_untrusted_snapshots_are_ignored(tmp_path):
+    path = tmp_path / "config.yaml"
+    cache_dir = tmp_path / "cache"
+    path.write_text("a: 1\n")
+    load_and_decrypt_yaml(None, path, cache_dir=cache_dir)
+    assert _load_counting_parses(path, cache_dir) == 0
+    (snapshot,) = cache_dir.glob("*.pickle")
+
+    snapshot.chmod(0o666)
+    assert _load_counting_parses(path, cache_dir) == 1
+    snapshot.chmod(0o600)
+
+    cache_dir.chmod(0o777)
+    assert _load_counting_parses(path, cache_dir) == 1
+    cache_dir.chmod(0o700)
+
+    with patch("zsuite.yaml._getuid", return_value=os.getuid() + 1):
+        assert _load_counting_parses(path, cache_dir) == 1
+    assert _load_counting_parses(path, cache_dir) == 0
+
+
+def test_snapshot_cache_skipped_without_posix_user_ids(tmp_path):
+    path = tmp_path / "config.yaml"
+    cache_dir = tmp_path / "cache"
+    path.write_text("a: 1\n")
+    with patch("zsuite.yaml._getuid", None):
+        assert _load_counting_parses(path, cache_dir) == 1
+        assert _load_counting_parses(path, cache_dir) == 1
+    assert not cache_dir.exists()
+
+
+def test_private_loader_leaves_global_constructors_alone(secret_file):
+    key, path = secret_file
+    before = dict(yaml.constructor.SafeConstructor.yaml_constructors)
+    load_and_decrypt_yaml(key, path)
+    load_and_decrypt_yaml(key, path, lazy_secrets=True)
+    assert yaml.constructor.SafeConstructor.yaml_constructors == before
+    assert "!secret" not in yaml.SafeLoader.yaml_constructors
+    with pytest.raises(yaml.constructor.ConstructorError):
+        yaml.safe_load(path.read_text())
+
+
+def test_single_read(secret_file):
+    key, path = secret_file
+    with patch("builtins.open", wraps=open) as opened:
+        load_and_decrypt_yaml(key, path)
+    assert opened.call_count == 1
+
+
+def test_concurrent_loads_with_different_keys(tmp_path):
+    paths = []
+    for i in range(4):
+        key = Fernet.generate_key()
+        path = tmp_path / f"config{i}.yaml"
+        path.write_text(f"value: !secret {Fernet(key).encrypt(str(i).encode()).decode()}\n")
+        paths.append((key, path))
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda args: load_and_decrypt_yaml(*args), paths * 10))
+    assert [result["value"] for result in results] == [str(i) for i in range(4)] * 10
+
+
+@pytest.mark.parametrize("loader", [yaml.SafeLoader, getattr(yaml, "CSafeLoader", yaml.SafeLoader)])
+def test_parse_with_either_loader(secret_file, loader):
+    key, path = secret_file
+    assert _parse_yaml(path.read_text(), key, base_loader=loader)["secrets"]["s2"] == "value-2"
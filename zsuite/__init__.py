@@ -1,7 +1,12 @@
-from .backoff import exponential_delay
+from .backoff import AsyncRetryBudget, RetryBudget, Retrying, async_exponential_delay, exponential_delay, retry
+from .breaker_registry import BreakerRegistry, breaker_registry, get_breaker
 from .byte_strings import want_bytes
-from .circuit_breaker import CircuitBreaker
-from .config import config_var, load_config, load_env
+from .circuit_breaker import BreakerState, CircuitBreaker, SharedCircuitBreaker
+from .concurrency_limit import AdaptiveConcurrencyLimiter
+from .config import ConfigDict, EnvSource, config_var, deep_merge, load_config, load_env
+from .config_handoff import ConfigHandoff, attach_config, worker_config
+from .config_schema import ConfigSchema, Setting, parse_duration
+from .config_watcher import ConfigDiff, ConfigWatcher, diff_config
 from .csv_utils import csv_to_dict, import_csv_data, import_multiple_csv, output_csv, output_dicts_to_csv
 from .file_utils import (
     debug_file_path,
@@ -13,5 +18,7 @@ from .file_utils import (
 )
 from .fuzzybool import fuzzy_bool
 from .logs import log_or_print, setup_logging
+from .rate_limit import GCRALimiter, TokenBucket
 from .service import SVC, SVCObj
+from .shared_backoff import SharedBackoff, shared_exponential_delay
 from .timestamps import epoch_to_utc, now_utc, parse_timestamp
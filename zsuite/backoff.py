@@ -1,7 +1,15 @@
+import asyncio
+import contextlib
+import functools
+import inspect
+import threading
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from random import uniform
 from time import sleep, time
 
+JITTER_STRATEGIES = ("pct", "full", "equal", "decorrelated")
+
 
 def exponential_delay(
     minimum_sleep: int | float = 0.1,
@@ -11,6 +19,8 @@ def exponential_delay(
     cutoff: datetime | timedelta | int | None = None,
     max_attempts: int | None = None,
     enable_sleep: bool = True,
+    jitter_strategy: str | Callable[[float, float], float] = "pct",
+    budget: "RetryBudget | None" = None,
 ):
     """
     Generates sleep times based on exponential backoff algorithm.
@@ -29,6 +39,16 @@ def exponential_delay(
         - If timedelta, adds the delta to the current time to get the cutoff.
         - If int, adds the number of seconds to the current time to get the cutoff.
     - enable_sleep (bool): Whether to actually sleep for the generated sleep times. Useful for testing.
+    - jitter_strategy (str | callable): How jitter is applied to each sleep. All results are clamped to
+      minimum_sleep/max_sleep.
+        - "pct": pick uniformly within ±jitter_pct of the current delay (default).
+        - "full": pick uniformly between minimum_sleep and the current delay.
+        - "equal": keep half of the current delay and pick the other half uniformly.
+        - "decorrelated": pick uniformly between minimum_sleep and 3x the previous sleep.
+        - callable: called as ``jitter_strategy(current_delay, previous_sleep)`` and should return the sleep time.
+      jitter_pct is only used by the "pct" strategy.
+    - budget (RetryBudget | None): Optional retry budget. Every sleep after the first spends a token, and the
+      generator stops early once the budget is exhausted.
 
     Yields:
     - sleep_time (float): The next sleep time in seconds.
@@ -43,6 +63,265 @@ def exponential_delay(
 
 
     """
+    for this_sleep in _delay_schedule(
+        minimum_sleep, max_sleep, jitter_pct, backoff_factor, cutoff, max_attempts, jitter_strategy, budget
+    ):
+        # Sleep (assuming it isn't disabled) and yield the sleep time
+        if enable_sleep and this_sleep:
+            sleep(this_sleep)  # sleep before yielding the slept time
+        yield this_sleep
+
+
+async def async_exponential_delay(
+    minimum_sleep: int | float = 0.1,
+    max_sleep: int | float = 60,
+    jitter_pct: int | float = 0.1,
+    backoff_factor: float = 1.25,
+    cutoff: datetime | timedelta | int | None = None,
+    max_attempts: int | None = None,
+    enable_sleep: bool = True,
+    jitter_strategy: str | Callable[[float, float], float] = "pct",
+    budget: "RetryBudget | None" = None,
+):
+    """
+    Async counterpart to exponential_delay, awaiting asyncio.sleep instead of blocking the event loop.
+
+    Takes the same parameters and follows the same jitter, cutoff and max_attempts rules as exponential_delay.
+    Cancelling the task while it is sleeping raises asyncio.CancelledError out of the ``async for`` loop as usual.
+
+    Examples::
+
+    async for sleep_time in async_exponential_delay(minimum_sleep=0.1, max_sleep=10, max_attempts=5):
+        if await try_something():
+            break
+
+
+    """
+    for this_sleep in _delay_schedule(
+        minimum_sleep, max_sleep, jitter_pct, backoff_factor, cutoff, max_attempts, jitter_strategy, budget
+    ):
+        if enable_sleep and this_sleep:
+            await asyncio.sleep(this_sleep)
+        yield this_sleep
+
+
+class RetryBudget:
+    """
+    Token bucket capping retries at a fraction of successful traffic.
+
+    Every successful call earns ``ratio`` tokens (up to ``max_tokens``) and every retry spends one, so over time
+    retries can't exceed ``ratio`` of successful calls plus a small burst allowance. Pass it as ``budget`` to
+    exponential_delay, async_exponential_delay, Retrying or retry; they stop retrying once it is exhausted.
+    Thread-safe; use AsyncRetryBudget when it is only shared by tasks on one event loop.
+
+    Parameters:
+    - ratio (float): Tokens earned per successful call, i.e. the allowed retries-to-successes ratio.
+    - max_tokens (float): Maximum number of stored tokens, the largest burst of retries allowed.
+    - initial_tokens (float | None): Tokens available at startup. Defaults to max_tokens.
+
+    Examples::
+
+    budget = RetryBudget(ratio=0.1, max_tokens=20)
+
+
+    @retry(retry_on=ConnectionError, max_attempts=5, budget=budget)
+    def fetch_data(): ...
+
+
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10, initial_tokens: float | None = None):
+        if ratio <= 0:
+            raise ValueError("ratio must be greater than 0")
+        if max_tokens < 1:
+            raise ValueError("max_tokens must be at least 1")
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens if initial_tokens is None else min(initial_tokens, max_tokens))
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def record_success(self):
+        """Earn ``ratio`` tokens for a successful call."""
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self, cost: float = 1) -> bool:
+        """Spend tokens for a retry. Returns False (spending nothing) if the budget is exhausted."""
+        with self._lock:
+            if self._tokens < cost:
+                return False
+            self._tokens -= cost
+            return True
+
+
+class AsyncRetryBudget(RetryBudget):
+    """RetryBudget for tasks on a single event loop; skips the thread lock since the loop serializes access."""
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10, initial_tokens: float | None = None):
+        super().__init__(ratio, max_tokens, initial_tokens)
+        self._lock = contextlib.nullcontext()
+
+
+class RetryState:
+    """Attempt and sleep accounting for a Retrying loop or retry-decorated call."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.total_sleep = 0.0
+        self.last_exception = None
+
+    def __repr__(self):
+        return (
+            f"RetryState(attempts={self.attempts}, total_sleep={self.total_sleep:.3f}, "
+            f"last_exception={self.last_exception!r})"
+        )
+
+
+class Attempt:
+    """Context manager wrapping a single attempt inside a Retrying loop.
+
+    Retryable exceptions raised inside the block are recorded on the parent Retrying state and suppressed so the
+    loop can move on to the next attempt. Anything else propagates immediately.
+    """
+
+    def __init__(self, retrying):
+        self._retrying = retrying
+        self.succeeded = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is None:
+            self.succeeded = True
+            if self._retrying.budget is not None:
+                self._retrying.budget.record_success()
+            return False
+        if not self._retrying.should_retry(exc):
+            return False
+        self._retrying.state.last_exception = exc
+        return True
+
+
+class Retrying:
+    """
+    Retry a block of code using exponential_delay (or async_exponential_delay) for the sleeps between attempts.
+
+    Parameters:
+    - retry_on (type | tuple): Exception type(s) that should be retried. Defaults to Exception.
+    - give_up_on (type | tuple): Exception type(s) that are never retried, even if they match retry_on.
+    - on_retry (callable | None): Optional callback receiving the RetryState before each retry.
+    - budget (RetryBudget | None): Optional retry budget. Successful attempts earn tokens, retries spend them and
+      retrying stops early once it is exhausted.
+    - **delay_kwargs: Passed through to exponential_delay (minimum_sleep, max_sleep, max_attempts, cutoff, ...).
+
+    The ``state`` attribute exposes the attempt count, total time slept and the last exception. Once attempts are
+    exhausted the last retryable exception is re-raised.
+
+    Examples::
+
+    retrying = Retrying(retry_on=ConnectionError, max_attempts=5)
+    for attempt in retrying:
+        with attempt:
+            fetch_data()
+    print(retrying.state.attempts, retrying.state.total_sleep)
+
+    async for attempt in Retrying(retry_on=ConnectionError, max_attempts=5):
+        with attempt:
+            await fetch_data_async()
+
+
+    """
+
+    def __init__(self, retry_on=Exception, give_up_on=(), on_retry=None, **delay_kwargs):
+        self.retry_on = retry_on
+        self.give_up_on = give_up_on
+        self.on_retry = on_retry
+        self._delay_kwargs = delay_kwargs
+        self.budget = delay_kwargs.get("budget")
+        self.state = RetryState()
+
+    def should_retry(self, exc: BaseException) -> bool:
+        if not isinstance(exc, Exception) or isinstance(exc, self.give_up_on):
+            return False
+        return isinstance(exc, self.retry_on)
+
+    def __iter__(self):
+        self.state = RetryState()
+        for this_sleep in exponential_delay(**self._delay_kwargs):
+            attempt = self._next_attempt(this_sleep)
+            yield attempt
+            if attempt.succeeded:
+                return
+        self._give_up()
+
+    async def __aiter__(self):
+        self.state = RetryState()
+        async for this_sleep in async_exponential_delay(**self._delay_kwargs):
+            attempt = self._next_attempt(this_sleep)
+            yield attempt
+            if attempt.succeeded:
+                return
+        self._give_up()
+
+    def _next_attempt(self, this_sleep):
+        self.state.total_sleep += this_sleep
+        self.state.attempts += 1
+        if self.state.attempts > 1 and self.on_retry is not None:
+            self.on_retry(self.state)
+        return Attempt(self)
+
+    def _give_up(self):
+        if self.state.last_exception is not None:
+            raise self.state.last_exception
+
+
+def retry(retry_on=Exception, give_up_on=(), on_retry=None, **delay_kwargs):
+    """
+    Decorator retrying a function or coroutine function with exponential backoff.
+
+    Takes the same arguments as Retrying. Coroutine functions sleep with asyncio.sleep so the event loop is never
+    blocked. When attempts run out the last exception is re-raised; non-retryable exceptions propagate immediately.
+
+    Examples::
+
+    @retry(retry_on=(ConnectionError, TimeoutError), give_up_on=PermissionError, max_attempts=5)
+    def fetch_data():
+        ...
+
+
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async for attempt in Retrying(retry_on, give_up_on, on_retry, **delay_kwargs):
+                    with attempt:
+                        return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in Retrying(retry_on, give_up_on, on_retry, **delay_kwargs):
+                with attempt:
+                    return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _delay_schedule(
+    minimum_sleep, max_sleep, jitter_pct, backoff_factor, cutoff, max_attempts, jitter_strategy, budget=None
+):
+    """Yield the sleep times for exponential_delay/async_exponential_delay without sleeping."""
     current_delay = minimum_sleep
     count = 1
 
@@ -50,6 +329,8 @@ def exponential_delay(
     _validate_arguments(backoff_factor, max_attempts, max_sleep, minimum_sleep)
     cutoff = _normalize_cutoff(cutoff)
     jitter_pct = _normalize_jitter_pct(jitter_pct)
+    jitter = _resolve_jitter(jitter_strategy, jitter_pct, minimum_sleep, max_sleep)
+    previous_sleep = minimum_sleep
 
     # Main loop
 
@@ -60,18 +341,18 @@ def exponential_delay(
             return
         if cutoff and time() >= cutoff:
             return  # stop iteration if we've reached the cutoff time
+        if budget is not None and not budget.try_spend():
+            return  # retry budget exhausted, give up rather than adding load
 
         this_sleep = current_delay  # only apply jitter to the current sleep
-        if jitter_pct:
-            this_sleep = _apply_jitter(this_sleep, jitter_pct, minimum_sleep, max_sleep)
+        if jitter is not None:
+            this_sleep = jitter(this_sleep, previous_sleep)
         this_sleep = _apply_bounds(this_sleep, minimum_sleep, max_sleep)
+        previous_sleep = this_sleep
 
         if cutoff and time() + this_sleep > cutoff:
             this_sleep = cutoff - time()
 
-        # Sleep (assuming it isn't disabled) and yield the sleep time
-        if enable_sleep:
-            sleep(this_sleep)  # sleep before yielding the slept time
         yield this_sleep
 
         if current_delay < max_sleep:
@@ -128,8 +409,24 @@ def _apply_jitter(this_sleep, jitter_pct, minimum_sleep, max_sleep):
         lower = minimum_sleep
     if upper > max_sleep:
         upper = max_sleep
-    this_sleep += uniform(
-        lower,
-        upper,
+    return uniform(lower, upper)
+
+
+def _resolve_jitter(jitter_strategy, jitter_pct, minimum_sleep, max_sleep):
+    """Return a ``jitter(current_delay, previous_sleep)`` callable for the strategy, or None for no jitter."""
+    if callable(jitter_strategy):
+        return jitter_strategy
+    match jitter_strategy:
+        case "pct":
+            if not jitter_pct:
+                return None
+            return lambda current, previous: _apply_jitter(current, jitter_pct, minimum_sleep, max_sleep)
+        case "full":
+            return lambda current, previous: uniform(minimum_sleep, min(current, max_sleep))
+        case "equal":
+            return lambda current, previous: current / 2 + uniform(0, current / 2)
+        case "decorrelated":
+            return lambda current, previous: uniform(minimum_sleep, min(previous * 3, max_sleep))
+    raise ValueError(
+        f"Unknown jitter strategy: {jitter_strategy!r}. Valid strategies are: {', '.join(JITTER_STRATEGIES)}"
     )
-    return this_sleep
@@ -0,0 +1,236 @@
+"""Retry-storm simulation for tuning exponential_delay parameters on a virtual clock."""
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .backoff import _normalize_jitter_pct, _validate_arguments, exponential_delay
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy isn't installed
+    np = None
+
+__all__ = ["SimulationResult", "simulate_retry_storm"]
+
+VECTORIZED_JITTER_STRATEGIES = ("pct", "full", "equal", "decorrelated")
+
+
+@dataclass
+class SimulationResult:
+    """Backend load and recovery statistics produced by simulate_retry_storm.
+
+    :ivar bucket_size: Width of each time bucket in seconds.
+    :ivar attempts_per_bucket: Number of requests the backend received in each bucket, starting at t=0.
+    :ivar total_attempts: Total number of requests made by all clients.
+    :ivar wasted_attempts: Requests that hit the backend during the outage and failed.
+    :ivar recovered_clients: Clients that eventually got a successful response.
+    :ivar abandoned_clients: Clients that ran out of attempts (or hit the horizon) before the outage ended.
+    :ivar time_to_recovery: Seconds between the end of the outage and the last client succeeding, or None if no
+                            client recovered.
+    """
+
+    bucket_size: float
+    attempts_per_bucket: list[int] = field(repr=False)
+    total_attempts: int
+    wasted_attempts: int
+    recovered_clients: int
+    abandoned_clients: int
+    time_to_recovery: float | None
+
+    @property
+    def rates(self) -> list[float]:
+        """Requests per second received by the backend in each bucket."""
+        return [count / self.bucket_size for count in self.attempts_per_bucket]
+
+    @property
+    def peak_rate(self) -> float:
+        """Highest requests per second seen in any bucket."""
+        return max(self.attempts_per_bucket, default=0) / self.bucket_size
+
+    @property
+    def average_rate(self) -> float:
+        """Average requests per second between t=0 and the last bucket with traffic."""
+        if not self.attempts_per_bucket:
+            return 0.0
+        return self.total_attempts / (len(self.attempts_per_bucket) * self.bucket_size)
+
+
+def simulate_retry_storm(
+    clients: int = 1000,
+    outage_duration: float = 30.0,
+    arrival_window: float = 0.0,
+    bucket_size: float = 1.0,
+    horizon: float | None = None,
+    use_numpy: bool | None = None,
+    seed: int | None = None,
+    **delay_kwargs,
+) -> SimulationResult:
+    """Simulate ``clients`` retrying against a backend that fails every request until ``outage_duration``.
+
+    Every client makes its first request at a time drawn uniformly from ``[0, arrival_window]`` and then retries
+    following exponential_delay (with ``enable_sleep=False``) until a request lands after the outage has ended,
+    it runs out of attempts, or the virtual clock passes ``horizon``.
+
+    :param clients: Number of simulated clients.
+    :param outage_duration: Seconds (of virtual time) the backend is down for, starting at t=0.
+    :param arrival_window: Seconds over which the clients' first requests are spread. 0 means they all fail together.
+    :param bucket_size: Width in seconds of the buckets used to report backend request rates.
+    :param horizon: Optional virtual time after which clients that are still retrying are counted as abandoned.
+    :param use_numpy: Force (True) or disable (False) the vectorized NumPy path. Defaults to using NumPy when it
+                      is installed and the jitter strategy can be vectorized.
+    :param seed: Optional random seed, for reproducible runs. The pure Python path draws from the global
+                 ``random`` module, as exponential_delay does, so it changes the global RNG state. With a seed the
+                 global module is seeded for the run and its previous state is restored afterwards.
+    :param delay_kwargs: Passed through to exponential_delay (minimum_sleep, max_sleep, jitter_pct, backoff_factor,
+                         max_attempts, jitter_strategy). ``cutoff`` is wall-clock based and ``budget`` needs the
+                         clients' requests interleaved in time order, so neither is supported.
+    :returns: SimulationResult with per-bucket load, wasted attempts and time to recovery.
+    :raises ValueError: If the arguments are invalid, or NumPy is requested but unavailable.
+
+    **Example:**
+
+    .. code-block:: python
+
+        result = simulate_retry_storm(clients=100_000, outage_duration=60, minimum_sleep=0.5, jitter_strategy="full")
+        print(result.peak_rate, result.time_to_recovery, result.wasted_attempts)
+    """
+    if "cutoff" in delay_kwargs or "enable_sleep" in delay_kwargs:
+        raise ValueError("cutoff and enable_sleep are not supported in simulations, use max_attempts or horizon")
+    if "budget" in delay_kwargs:
+        raise ValueError("Retry budgets are not supported in simulations")
+    if clients <= 0:
+        raise ValueError("clients must be greater than 0")
+    if bucket_size <= 0:
+        raise ValueError("bucket_size must be greater than 0")
+
+    vectorizable = delay_kwargs.get("jitter_strategy", "pct") in VECTORIZED_JITTER_STRATEGIES
+    if use_numpy is None:
+        use_numpy = np is not None and vectorizable
+    elif use_numpy and np is None:
+        raise ValueError("numpy is not installed, install it or pass use_numpy=False")
+    elif use_numpy and not vectorizable:
+        raise ValueError("Custom jitter strategies can only be simulated with use_numpy=False")
+
+    if use_numpy:
+        return _simulate_numpy(clients, outage_duration, arrival_window, bucket_size, horizon, seed, delay_kwargs)
+    return _simulate_python(clients, outage_duration, arrival_window, bucket_size, horizon, seed, delay_kwargs)
+
+
+def _simulate_python(clients, outage_duration, arrival_window, bucket_size, horizon, seed, delay_kwargs):
+    if seed is None:
+        return _run_python(clients, outage_duration, arrival_window, bucket_size, horizon, delay_kwargs)
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return _run_python(clients, outage_duration, arrival_window, bucket_size, horizon, delay_kwargs)
+    finally:
+        random.setstate(state)
+
+
+def _run_python(clients, outage_duration, arrival_window, bucket_size, horizon, delay_kwargs):
+    buckets = Counter()
+    total_attempts = wasted_attempts = abandoned_clients = 0
+    last_success = None
+
+    for _ in range(clients):
+        clock = random.uniform(0, arrival_window)
+        succeeded = False
+        for this_sleep in exponential_delay(enable_sleep=False, **delay_kwargs):
+            clock += this_sleep
+            if horizon is not None and clock > horizon:
+                break
+            buckets[int(clock // bucket_size)] += 1
+            total_attempts += 1
+            if clock >= outage_duration:
+                succeeded = True
+                last_success = clock if last_success is None else max(last_success, clock)
+                break
+            wasted_attempts += 1
+        if not succeeded:
+            abandoned_clients += 1
+
+    attempts_per_bucket = [buckets.get(i, 0) for i in range(max(buckets, default=-1) + 1)]
+    return SimulationResult(
+        bucket_size=bucket_size,
+        attempts_per_bucket=attempts_per_bucket,
+        total_attempts=total_attempts,
+        wasted_attempts=wasted_attempts,
+        recovered_clients=clients - abandoned_clients,
+        abandoned_clients=abandoned_clients,
+        time_to_recovery=None if last_success is None else max(last_success - outage_duration, 0.0),
+    )
+
+
+def _simulate_numpy(clients, outage_duration, arrival_window, bucket_size, horizon, seed, delay_kwargs):
+    minimum_sleep = delay_kwargs.get("minimum_sleep", 0.1)
+    max_sleep = delay_kwargs.get("max_sleep", 60)
+    backoff_factor = delay_kwargs.get("backoff_factor", 1.25)
+    max_attempts = delay_kwargs.get("max_attempts")
+    jitter_strategy = delay_kwargs.get("jitter_strategy", "pct")
+    _validate_arguments(backoff_factor, max_attempts, max_sleep, minimum_sleep)
+    jitter_pct = _normalize_jitter_pct(delay_kwargs.get("jitter_pct", 0.1))
+
+    rng = np.random.default_rng(seed)
+    clock = rng.uniform(0, arrival_window, clients)
+    previous = np.full(clients, float(minimum_sleep))
+    active = np.ones(clients, dtype=bool)
+    recovered = np.zeros(clients, dtype=bool)
+    attempt_times = []
+    current_delay = minimum_sleep
+    attempt = 1
+
+    while True:
+        # Every still-active client hits the backend at its current clock time (the first sleep is always 0)
+        if horizon is not None:
+            active &= clock <= horizon
+        attempt_times.append(clock[active])
+        succeeded = active & (clock >= outage_duration)
+        recovered |= succeeded
+        active &= ~succeeded
+
+        attempt += 1
+        if not active.any() or (max_attempts is not None and attempt > max_attempts):
+            break
+
+        sleeps = _vectorized_jitter(rng, jitter_strategy, jitter_pct, current_delay, previous[active], delay_kwargs)
+        sleeps = np.clip(sleeps, minimum_sleep, max_sleep)
+        previous[active] = sleeps
+        clock[active] += sleeps
+
+        if current_delay < max_sleep:
+            current_delay *= backoff_factor
+        current_delay = min(current_delay, max_sleep)
+
+    times = np.concatenate(attempt_times)
+    attempts_per_bucket = np.bincount((times // bucket_size).astype(np.int64)) if times.size else np.array([])
+    recovered_clients = int(recovered.sum())
+    return SimulationResult(
+        bucket_size=bucket_size,
+        attempts_per_bucket=[int(count) for count in attempts_per_bucket],
+        total_attempts=int(times.size),
+        wasted_attempts=int(times.size) - recovered_clients,
+        recovered_clients=recovered_clients,
+        abandoned_clients=clients - recovered_clients,
+        time_to_recovery=(max(float(clock[recovered].max()) - outage_duration, 0.0) if recovered_clients else None),
+    )
+
+
+def _vectorized_jitter(rng, jitter_strategy, jitter_pct, current_delay, previous, delay_kwargs):
+    """NumPy equivalent of the exponential_delay jitter strategies, for every active client at once."""
+    minimum_sleep = delay_kwargs.get("minimum_sleep", 0.1)
+    max_sleep = delay_kwargs.get("max_sleep", 60)
+    size = previous.size
+    match jitter_strategy:
+        case "pct":
+            if not jitter_pct:
+                return np.full(size, float(current_delay))
+            lower = max(current_delay - current_delay * jitter_pct, minimum_sleep)
+            upper = min(current_delay + current_delay * jitter_pct, max_sleep)
+            return rng.uniform(lower, upper, size)
+        case "full":
+            return rng.uniform(minimum_sleep, min(current_delay, max_sleep), size)
+        case "equal":
+            return current_delay / 2 + rng.uniform(0, current_delay / 2, size)
+        case "decorrelated":
+            return rng.uniform(minimum_sleep, np.minimum(previous * 3, max_sleep))
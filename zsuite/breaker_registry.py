@@ -0,0 +1,140 @@
+"""Process-wide registry of named circuit breakers, with metrics export."""
+
+import json
+import threading
+
+from .circuit_breaker import CircuitBreaker
+from .logs import log_or_print
+
+__all__ = ["BreakerRegistry", "breaker_registry", "get_breaker"]
+
+# (stats key, metric suffix, metric type, help text)
+_METRICS = (
+    ("events_total", "events_total", "counter", "Failures recorded by the breaker."),
+    ("trips_total", "trips_total", "counter", "Times the breaker opened."),
+    ("rejections_total", "rejections_total", "counter", "Calls rejected while the breaker was open."),
+    ("open_seconds_total", "open_seconds_total", "counter", "Seconds the breaker has spent open."),
+    ("count", "window_events", "gauge", "Failures currently inside the breaker's time window."),
+    ("max_events", "max_events", "gauge", "Failures within the window that trip the breaker."),
+)
+
+
+class BreakerRegistry:
+    """A named collection of circuit breakers, so their state can be inspected and exported in one place.
+
+    Lookups and registration take a lock; the breakers themselves are not touched until a snapshot is taken, so
+    registering a breaker adds nothing to its ``increment()`` path.
+
+    **Example:**
+
+    .. code-block:: python
+
+        payments = breaker_registry.get_or_create("payments", max_events=5, time_window=30)
+
+        breaker_registry.log_snapshot()  # one JSON log line per breaker
+        text = breaker_registry.prometheus_text()  # for a /metrics endpoint
+    """
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._breakers
+
+    def __len__(self):
+        return len(self._breakers)
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._breakers)
+
+    def get(self, name: str) -> CircuitBreaker | None:
+        return self._breakers.get(name)
+
+    def register(self, breaker: CircuitBreaker, name: str | None = None) -> CircuitBreaker:
+        """Add an existing breaker under ``name`` (defaults to ``breaker.name``) and return it.
+
+        :raises ValueError: If the breaker has no name or the name is already taken by another breaker.
+        """
+        name = name or breaker.name
+        if not name:
+            raise ValueError("Circuit breakers must be named to be registered")
+        with self._lock:
+            existing = self._breakers.get(name)
+            if existing is not None and existing is not breaker:
+                raise ValueError(f"A circuit breaker named {name!r} is already registered")
+            breaker.name = name
+            self._breakers[name] = breaker
+        return breaker
+
+    def get_or_create(self, name: str, **kwargs) -> CircuitBreaker:
+        """Return the breaker registered as ``name``, creating a CircuitBreaker from ``kwargs`` if there isn't one.
+
+        ``kwargs`` are ignored when the breaker already exists.
+        """
+        breaker = self._breakers.get(name)
+        if breaker is not None:
+            return breaker
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name=name, **kwargs)
+        return breaker
+
+    def unregister(self, name: str) -> CircuitBreaker | None:
+        with self._lock:
+            return self._breakers.pop(name, None)
+
+    def clear(self):
+        with self._lock:
+            self._breakers.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return ``{name: breaker.stats()}`` for every registered breaker."""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {name: breaker.stats() for name, breaker in sorted(breakers)}
+
+    def log_snapshot(self, level: str = "INFO"):
+        """Emit one JSON line per breaker through ``log_or_print``."""
+        for stats in self.snapshot().values():
+            log_or_print(json.dumps({"event": "circuit_breaker", **stats}), level=level)
+
+    def prometheus_text(self, prefix: str = "zsuite_circuit_breaker") -> str:
+        """Render the snapshot in the Prometheus text exposition format, labelled by breaker name."""
+        snapshot = self.snapshot()
+        lines = []
+        for key, suffix, metric_type, help_text in _METRICS:
+            metric = f"{prefix}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for name, stats in snapshot.items():
+                lines.append(f'{metric}{{name="{_escape_label(name)}"}} {_format_value(stats[key])}')
+
+        metric = f"{prefix}_state"
+        lines.append(f"# HELP {metric} 1 for the breaker's current state, 0 otherwise.")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, stats in snapshot.items():
+            for state in ("closed", "open", "half_open"):
+                value = int(stats["state"] == state)
+                lines.append(f'{metric}{{name="{_escape_label(name)}",state="{state}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+breaker_registry = BreakerRegistry()
+
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Get or create a named breaker in the default process-wide registry."""
+    return breaker_registry.get_or_create(name, **kwargs)
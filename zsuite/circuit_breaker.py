@@ -1,22 +1,209 @@
+import functools
+import inspect
+import itertools
+import math
+import struct
+import threading
 import time
+import uuid
 from collections import deque
+from contextlib import ExitStack
+from enum import Enum
+from pathlib import Path
 
-from .exceptions import CircuitBreakerTripped
+from .exceptions import CircuitBreakerOpen, CircuitBreakerTripped
+from .shared_state import SharedStateFile
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
 
 
 class CircuitBreaker:
-    def __init__(self, max_events: int | None = None, time_window: int | None = None, custom_exception=None):
+    """Trip once more than ``max_events`` failures have been recorded within ``time_window`` seconds.
+
+    The breaker is a closed/open/half-open state machine. While closed every call goes through and failures are
+    counted. Once it trips it is open: calls fail fast with CircuitBreakerOpen (or ``custom_exception``) without
+    reaching the downstream at all. After ``cooldown`` seconds it becomes half-open and lets up to
+    ``half_open_max_calls`` concurrent probe calls through; a successful probe closes it again, a failed one
+    re-opens it for another cooldown. With ``failure_ratio`` set it also trips when at least ``min_calls`` calls
+    were made in the window and that fraction of them failed.
+
+    Use it as a decorator or a (sync or async) context manager, which record successes and failures for you, or
+    call ``increment()`` to record a failure by hand.
+
+    ``stats()`` reports cumulative counters (failures recorded, trips, rejected calls, seconds spent open). They
+    are plain attribute updates rather than locked counters, so they add no locking to the hot path and may miss
+    the odd update under heavy thread contention.
+
+    By default every event's timestamp is kept, which is exact but uses memory proportional to the event rate. Set
+    ``bucket_resolution`` to count events in fixed-size time buckets instead: increment and count are O(1) and memory
+    is bounded by ``time_window / bucket_resolution`` no matter how many events arrive, at the cost of events
+    expiring with bucket granularity.
+
+    The breaker is safe to share between threads: checking the count and recording the event happen atomically.
+    Setting ``stripes`` spreads events over that many independently locked windows so many threads can increment
+    without serializing on one lock. Far from the limit an increment only takes its own stripe's lock; close to it
+    every stripe is locked for an exact check, so ``max_events`` is still never exceeded.
+    Striping pays off on free-threaded Python builds; with the GIL held a single lock is usually faster.
+
+    :param max_events: Number of failures allowed within the time window.
+    :param time_window: Length of the sliding window in seconds.
+    :param custom_exception: Exception type raised when the breaker trips or is open. Defaults to
+                             CircuitBreakerTripped when tripping and CircuitBreakerOpen while open.
+    :param bucket_resolution: Optional bucket width in seconds, enabling the bucketed counter.
+    :param stripes: Number of independently locked counters to spread concurrent increments over.
+    :param cooldown: Seconds to stay open before allowing half-open probes. Defaults to time_window.
+    :param half_open_max_calls: Number of concurrent probe calls allowed while half-open.
+    :param failure_ratio: Optional fraction (0-1] of failed calls in the window that also trips the breaker.
+    :param min_calls: Minimum number of calls in the window before failure_ratio is considered.
+    :param failure_exceptions: Exception types the decorator and context managers count as failures.
+    :param name: Optional name, used by the breaker registry and in metrics.
+
+    **Example:**
+
+    .. code-block:: python
+
+        breaker = CircuitBreaker(max_events=5, time_window=30, cooldown=10)
+
+
+        @breaker
+        def fetch_data(): ...
+
+
+        async with breaker:
+            await fetch_data_async()
+    """
+
+    def __init__(
+        self,
+        max_events: int | None = None,
+        time_window: int | None = None,
+        custom_exception=None,
+        bucket_resolution: float | None = None,
+        stripes: int = 1,
+        cooldown: float | None = None,
+        half_open_max_calls: int = 1,
+        failure_ratio: float | None = None,
+        min_calls: int = 10,
+        failure_exceptions: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+        name: str | None = None,
+    ):
         if max_events is None:
             raise ValueError("max_events must be set")
         if time_window is None:
             raise ValueError("time_window must be set")
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        if half_open_max_calls < 1:
+            raise ValueError("half_open_max_calls must be at least 1")
+        if failure_ratio is not None and not 0 < failure_ratio <= 1:
+            raise ValueError("failure_ratio must be greater than 0 and at most 1")
         self.max_events = max_events
         self.time_window = time_window
+        self.cooldown = time_window if cooldown is None else cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_ratio = failure_ratio
+        self.min_calls = min_calls
+        self.failure_exceptions = failure_exceptions
+        self._custom_exception = custom_exception
         self._exception_type = custom_exception if custom_exception else CircuitBreakerTripped
-        self._event_timestamps = deque()
+        self.name = name
+        self._events_total = 0
+        self._trips_total = 0
+        self._rejections_total = 0
+        self._open_seconds_total = 0.0
+
+        self._init_storage(bucket_resolution, stripes)
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state is BreakerState.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            with self._state_lock:
+                if self._state is BreakerState.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                    self._open_seconds_total += time.monotonic() - self._opened_at
+                    self._state = BreakerState.HALF_OPEN
+                    self._half_open_calls = 0
+        return self._state
+
+    def before_call(self):
+        """Check the breaker before making a call, raising if it is open.
+
+        While half-open this admits up to half_open_max_calls probes; every admitted call must be followed by
+        record_success(), record_failure() or release_probe(). Probe slots that haven't been given back a cooldown
+        after the last probe started are presumed lost (say, the process making the probe was killed) and are
+        taken back.
+        """
+        if self._state is BreakerState.CLOSED:
+            return
+        state = self.state
+        if state is BreakerState.HALF_OPEN:
+            with self._state_lock:
+                if self._state is BreakerState.HALF_OPEN:
+                    now = time.monotonic()
+                    calls = self._half_open_calls
+                    if calls >= self.half_open_max_calls and now - self._probe_started_at >= self.cooldown:
+                        calls = 0
+                    if calls < self.half_open_max_calls:
+                        self._half_open_calls = calls + 1
+                        self._probe_started_at = now
+                        return
+        self._raise_open()
+
+    def record_success(self):
+        """Record a successful call, closing the breaker if it was half-open."""
+        if self._state is not BreakerState.CLOSED:
+            with self._state_lock:
+                if self._state is BreakerState.HALF_OPEN:
+                    self._close()
+            return
+        if self._calls is not None:
+            self._calls.try_add(time.monotonic(), math.inf)
+
+    def release_probe(self):
+        """Give back a call admitted by before_call() without recording an outcome.
+
+        Use it when the call ended in a way that says nothing about the downstream (it was never made, or failed
+        with an exception outside failure_exceptions), so a half-open probe slot isn't held forever.
+        """
+        if self._state is BreakerState.HALF_OPEN:
+            with self._state_lock:
+                self._half_open_calls = max(self._half_open_calls - 1, 0)
+
+    def record_failure(self, current_exception=None) -> bool:
+        """Record a failed call. Returns True if the breaker is open after this failure."""
+        self._events_total += 1
+        if self._state is not BreakerState.CLOSED:
+            with self._state_lock:
+                if self._state is BreakerState.HALF_OPEN:
+                    self._open()
+            return True
+        now = time.monotonic()
+        tripped = not self._window.try_add(now, self.max_events)
+        if self._calls is not None:
+            self._calls.try_add(now, math.inf)
+            tripped = tripped or self._ratio_exceeded(now)
+        if tripped:
+            with self._state_lock:
+                if self._state is BreakerState.CLOSED:
+                    self._open()
+        return tripped
 
     def increment(self, current_exception=None):
-        if self.count() >= self.max_events:
+        """Record a failure, raising if the breaker is open or this failure trips it.
+
+        Callers that only use increment() never report successes, so for them a half-open breaker closes again
+        once the failures that tripped it have aged out of the time window, as it did before the breaker had states.
+        """
+        if self._state is not BreakerState.CLOSED:
+            state = self.state
+            if state is BreakerState.OPEN:
+                self._raise_open(current_exception)
+            if state is BreakerState.HALF_OPEN:
+                self._close_if_window_clear()
+        if self.record_failure(current_exception):
             if current_exception:
                 raise CircuitBreakerTripped(
                     f"Circuit Breaker tripped at max events: {current_exception}"
@@ -24,17 +211,495 @@ class CircuitBreaker:
             else:
                 raise self._exception_type("Circuit Breaker tripped at max events") from None
 
-        else:
-            self._event_timestamps.append(time.time())
-
     def reset(self):
-        self._event_timestamps.clear()
+        with self._state_lock:
+            if self._state is BreakerState.OPEN:
+                self._open_seconds_total += time.monotonic() - self._opened_at
+            self._close()
 
     def count(self):
-        self._remove_old_events()
+        return self._window.count(time.monotonic())
+
+    def stats(self) -> dict:
+        """Snapshot of the breaker's current state and cumulative counters."""
+        state = self.state
+        open_seconds = self._open_seconds_total
+        if state is BreakerState.OPEN:
+            open_seconds += time.monotonic() - self._opened_at
+        return {
+            "name": self.name,
+            "state": state.value,
+            "count": self.count(),
+            "max_events": self.max_events,
+            "events_total": self._events_total,
+            "trips_total": self._trips_total,
+            "rejections_total": self._rejections_total,
+            "open_seconds_total": open_seconds,
+        }
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with self:
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self):
+        self.before_call()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is None:
+            self.record_success()
+        elif isinstance(exc, self.failure_exceptions):
+            self.record_failure(exc)
+        else:
+            self.release_probe()
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def _init_storage(self, bucket_resolution, stripes):
+        """Create the event windows and state, overridden by SharedCircuitBreaker to keep them in shared memory."""
+
+        def window_factory():
+            if bucket_resolution is None:
+                return _TimestampWindow(self.time_window)
+            return _BucketedWindow(self.time_window, bucket_resolution)
+
+        if stripes == 1:
+            self._window = _LockedWindow(window_factory())
+        else:
+            self._window = _StripedWindow(window_factory, stripes)
+        self._calls = _LockedWindow(window_factory()) if self.failure_ratio is not None else None
+
+        self._state_lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._probe_started_at = 0.0
+
+    def _ratio_exceeded(self, now):
+        calls = self._calls.count(now)
+        return calls >= self.min_calls and self._window.count(now) / calls >= self.failure_ratio
+
+    def _open(self):
+        self._trips_total += 1
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_calls = 0
+
+    def _close(self):
+        self._window.clear()
+        if self._calls is not None:
+            self._calls.clear()
+        self._state = BreakerState.CLOSED
+        self._half_open_calls = 0
+
+    def _close_if_window_clear(self):
+        """Close a half-open breaker whose window has room again, keeping the events that are still in it."""
+        with self._state_lock:
+            if self._state is BreakerState.HALF_OPEN and self._window.count(time.monotonic()) < self.max_events:
+                self._state = BreakerState.CLOSED
+                self._half_open_calls = 0
+
+    def _raise_open(self, current_exception=None):
+        self._rejections_total += 1
+        if self._custom_exception:
+            raise self._custom_exception("Circuit Breaker is open") from current_exception
+        raise CircuitBreakerOpen("Circuit Breaker is open") from current_exception
+
+
+class _TimestampWindow:
+    """Exact sliding window keeping one timestamp per event."""
+
+    def __init__(self, time_window):
+        self.time_window = time_window
+        self._event_timestamps = deque()
+
+    def add(self, now):
+        self._event_timestamps.append(now)
+
+    def try_add(self, now, limit):
+        self._remove_old_events(now)
+        if len(self._event_timestamps) >= limit:
+            return False
+        self._event_timestamps.append(now)
+        return True
+
+    def count(self, now):
+        self._remove_old_events(now)
+        return len(self._event_timestamps)
+
+    def approximate_count(self):
+        """Count without expiring old events, so it can only over-count."""
         return len(self._event_timestamps)
 
-    def _remove_old_events(self):
-        current_time = time.time()
-        while self._event_timestamps and current_time - self._event_timestamps[0] > self.time_window:
+    def clear(self):
+        self._event_timestamps.clear()
+
+    def _remove_old_events(self, now):
+        while self._event_timestamps and now - self._event_timestamps[0] > self.time_window:
             self._event_timestamps.popleft()
+
+
+class _BucketedWindow:
+    """Sliding window of per-bucket event counts in a fixed-size ring buffer.
+
+    Keeps a running total so counting is O(1); buckets that fall out of the window are zeroed lazily as time moves
+    forward, which is amortized O(1) and never more than one pass over the ring.
+    """
+
+    def __init__(self, time_window, resolution):
+        if resolution <= 0:
+            raise ValueError("bucket_resolution must be greater than 0")
+        self.resolution = resolution
+        self._size = max(math.ceil(time_window / resolution), 1)
+        self._counts = [0] * self._size
+        self._head = None  # absolute index of the newest bucket
+        self._total = 0
+
+    def add(self, now):
+        self._advance(now)
+        self._counts[self._head % self._size] += 1
+        self._total += 1
+
+    def try_add(self, now, limit):
+        self._advance(now)
+        if self._total >= limit:
+            return False
+        self._counts[self._head % self._size] += 1
+        self._total += 1
+        return True
+
+    def count(self, now):
+        self._advance(now)
+        return self._total
+
+    def approximate_count(self):
+        """Running total without expiring old buckets, so it can only over-count."""
+        return self._total
+
+    def clear(self):
+        self._counts = [0] * self._size
+        self._head = None
+        self._total = 0
+
+    def _advance(self, now):
+        bucket = int(now // self.resolution)
+        if bucket == self._head:
+            return
+        if self._head is None:
+            self._head = bucket
+            return
+        gap = bucket - self._head
+        if gap <= 0:
+            return
+        if gap >= self._size:
+            self._counts = [0] * self._size
+            self._total = 0
+        else:
+            for index in range(self._head + 1, bucket + 1):
+                slot = index % self._size
+                self._total -= self._counts[slot]
+                self._counts[slot] = 0
+        self._head = bucket
+
+
+class _LockedWindow:
+    """Wrap a window so the count check and the add happen atomically under one lock."""
+
+    def __init__(self, window):
+        self._window = window
+        self._lock = threading.Lock()
+
+    def try_add(self, now, limit):
+        with self._lock:
+            return self._window.try_add(now, limit)
+
+    def count(self, now):
+        with self._lock:
+            return self._window.count(now)
+
+    def clear(self):
+        with self._lock:
+            self._window.clear()
+
+
+class _StripedWindow:
+    """Spread events over several independently locked windows, one per thread (assigned round robin).
+
+    The fast path holds only the caller's stripe lock and sums every stripe's approximate count without locking the
+    others. Those counts can be stale-high (expired events not yet dropped) or miss at most one in-flight add per
+    other stripe, so events are only added this way while the sum plus one per stripe is within the limit. Closer
+    to the limit it locks every stripe (always in the same order) for an exact check-and-add.
+    """
+
+    def __init__(self, window_factory, stripes):
+        self._stripes = [_LockedWindow(window_factory()) for _ in range(stripes)]
+        self._windows = [stripe._window for stripe in self._stripes]
+        self._local = threading.local()
+        self._next_stripe = itertools.count()
+
+    def _own_stripe(self):
+        try:
+            return self._local.stripe
+        except AttributeError:
+            self._local.stripe = self._stripes[next(self._next_stripe) % len(self._stripes)]
+            return self._local.stripe
+
+    def try_add(self, now, limit):
+        stripe = self._own_stripe()
+        with stripe._lock:
+            if sum([window.approximate_count() for window in self._windows]) + len(self._windows) <= limit:
+                stripe._window.add(now)
+                return True
+        with ExitStack() as stack:
+            for s in self._stripes:
+                stack.enter_context(s._lock)
+            if sum(window.count(now) for window in self._windows) >= limit:
+                return False
+            stripe._window.add(now)
+            return True
+
+    def count(self, now):
+        return sum(stripe.count(now) for stripe in self._stripes)
+
+    def clear(self):
+        for stripe in self._stripes:
+            stripe.clear()
+
+
+class SharedCircuitBreaker(CircuitBreaker):
+    """A CircuitBreaker whose event window and trip state live in a shared state file.
+
+    Every process on the host constructing a SharedCircuitBreaker with the same ``state_file`` shares one event
+    window and one closed/open/half-open state, so a broken dependency trips all workers after ``max_events``
+    failures in total rather than per process. Updates happen under an exclusive ``flock``; the monotonic clock is
+    system-wide, so bucket timestamps agree between processes.
+
+    Events are always counted in time buckets (``bucket_resolution`` defaults to 1/100th of the time window) so
+    the state has a fixed size. All processes sharing a file must use the same time_window and bucket_resolution.
+    Takes the same parameters as CircuitBreaker apart from ``stripes``. ``stats()`` counters are per process.
+
+    A probe slot held by a worker that dies mid-probe is taken back once ``cooldown`` has passed since the last
+    probe started. State saved under an earlier boot (detected by boot id on Linux, or by timestamps ahead of the
+    monotonic clock) is discarded when the file is opened.
+
+    **Example:**
+
+    .. code-block:: python
+
+        breaker = SharedCircuitBreaker("/tmp/payments.breaker", max_events=50, time_window=30)
+    """
+
+    def __init__(
+        self,
+        state_file: str | Path,
+        max_events: int | None = None,
+        time_window: int | None = None,
+        custom_exception=None,
+        bucket_resolution: float | None = None,
+        cooldown: float | None = None,
+        half_open_max_calls: int = 1,
+        failure_ratio: float | None = None,
+        min_calls: int = 10,
+        failure_exceptions: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+        name: str | None = None,
+    ):
+        self._state_file = state_file
+        super().__init__(
+            max_events,
+            time_window,
+            custom_exception,
+            bucket_resolution=bucket_resolution if bucket_resolution is not None else time_window / 100,
+            cooldown=cooldown,
+            half_open_max_calls=half_open_max_calls,
+            failure_ratio=failure_ratio,
+            min_calls=min_calls,
+            failure_exceptions=failure_exceptions,
+            name=name,
+        )
+
+    def _init_storage(self, bucket_resolution, stripes):
+        if bucket_resolution <= 0:
+            raise ValueError("bucket_resolution must be greater than 0")
+        size = max(math.ceil(self.time_window / bucket_resolution), 1)
+        window_bytes = _SharedWindow.HEADER.size + size * 8
+        self._shared = SharedStateFile(self._state_file, _SHARED_HEADER.size + 2 * window_bytes)
+        self._state_lock = _SharedLock(self._shared)
+        self._window = _SharedWindow(self._shared, _SHARED_HEADER.size, size, bucket_resolution)
+        calls = _SharedWindow(self._shared, _SHARED_HEADER.size + window_bytes, size, bucket_resolution)
+        self._calls = calls if self.failure_ratio is not None else None
+
+        with self._shared.locked() as buf:
+            header = _SHARED_HEADER.unpack_from(buf)
+            layout = header[:2]
+            if layout != (0, 0.0) and layout != (size, bucket_resolution):
+                raise ValueError(
+                    f"{self._state_file} holds a breaker with {layout[0]} buckets of {layout[1]}s, "
+                    f"not {size} buckets of {bucket_resolution}s"
+                )
+            # Timestamps are monotonic clock readings, which only mean something within one boot. A file left over
+            # from an earlier boot (or written before this one's clock caught up) starts over.
+            now = time.monotonic()
+            boot_id = _boot_id()
+            if (
+                layout == (0, 0.0)
+                or header[6] != boot_id
+                or max(header[3], header[5]) > now
+                or self._window.head(buf) > now // bucket_resolution
+                or calls.head(buf) > now // bucket_resolution
+            ):
+                self._window.clear()
+                calls.clear()
+                _SHARED_HEADER.pack_into(buf, 0, size, bucket_resolution, 0, 0.0, 0, 0.0, boot_id)
+
+    def close(self):
+        self._shared.close()
+
+    def _read_header(self):
+        return _SHARED_HEADER.unpack_from(self._shared._mmap)
+
+    def _write_header_field(self, index, value):
+        with self._shared.locked() as buf:
+            fields = list(_SHARED_HEADER.unpack_from(buf))
+            fields[index] = value
+            _SHARED_HEADER.pack_into(buf, 0, *fields)
+
+    @property
+    def _state(self):
+        return _STATE_CODES[self._read_header()[2]]
+
+    @_state.setter
+    def _state(self, state):
+        self._write_header_field(2, _STATE_CODES.index(state))
+
+    @property
+    def _opened_at(self):
+        return self._read_header()[3]
+
+    @_opened_at.setter
+    def _opened_at(self, opened_at):
+        self._write_header_field(3, opened_at)
+
+    @property
+    def _half_open_calls(self):
+        return self._read_header()[4]
+
+    @_half_open_calls.setter
+    def _half_open_calls(self, calls):
+        self._write_header_field(4, calls)
+
+    @property
+    def _probe_started_at(self):
+        return self._read_header()[5]
+
+    @_probe_started_at.setter
+    def _probe_started_at(self, started_at):
+        self._write_header_field(5, started_at)
+
+
+class _SharedLock:
+    """Adapt SharedStateFile.acquire/release to the ``with self._state_lock:`` blocks in CircuitBreaker."""
+
+    def __init__(self, shared):
+        self._shared = shared
+
+    def __enter__(self):
+        self._shared.acquire()
+
+    def __exit__(self, exc_type, exc, tb):
+        self._shared.release()
+
+
+# bucket count, bucket resolution (layout check), state code, opened_at, half-open calls, last probe start, boot id
+_SHARED_HEADER = struct.Struct("<QdQdQdQ")
+
+
+def _boot_id():
+    """An id for the current boot where the OS provides one (Linux), else 0."""
+    try:
+        return uuid.UUID(Path("/proc/sys/kernel/random/boot_id").read_text().strip()).int & 0xFFFFFFFFFFFFFFFF
+    except (OSError, ValueError):
+        return 0
+
+
+_STATE_CODES = (BreakerState.CLOSED, BreakerState.OPEN, BreakerState.HALF_OPEN)
+
+
+class _SharedWindow:
+    """_BucketedWindow stored in a SharedStateFile at ``offset``: a (head, total) header followed by the ring.
+
+    A zero-filled ring is valid: head 0 is so far in the past that the first advance clears it.
+    """
+
+    HEADER = struct.Struct("<qQ")
+
+    def __init__(self, shared, offset, size, resolution):
+        self._shared = shared
+        self._offset = offset
+        self._counts_offset = offset + self.HEADER.size
+        self._size = size
+        self.resolution = resolution
+
+    def try_add(self, now, limit):
+        with self._shared.locked() as buf:
+            head, total = self._advance(buf, now)
+            if total >= limit:
+                return False
+            slot = self._counts_offset + (head % self._size) * 8
+            _COUNT.pack_into(buf, slot, _COUNT.unpack_from(buf, slot)[0] + 1)
+            self.HEADER.pack_into(buf, self._offset, head, total + 1)
+            return True
+
+    def count(self, now):
+        with self._shared.locked() as buf:
+            return self._advance(buf, now)[1]
+
+    def head(self, buf):
+        """Absolute index of the newest bucket."""
+        return self.HEADER.unpack_from(buf, self._offset)[0]
+
+    def approximate_count(self):
+        return self.HEADER.unpack_from(self._shared._mmap, self._offset)[1]
+
+    def clear(self):
+        with self._shared.locked() as buf:
+            buf[self._offset : self._counts_offset + self._size * 8] = bytes(
+                self._counts_offset - self._offset + self._size * 8
+            )
+
+    def _advance(self, buf, now):
+        head, total = self.HEADER.unpack_from(buf, self._offset)
+        bucket = int(now // self.resolution)
+        gap = bucket - head
+        if gap <= 0:
+            return head, total
+        if gap >= self._size:
+            buf[self._counts_offset : self._counts_offset + self._size * 8] = bytes(self._size * 8)
+            total = 0
+        else:
+            for index in range(head + 1, bucket + 1):
+                slot = self._counts_offset + (index % self._size) * 8
+                total -= _COUNT.unpack_from(buf, slot)[0]
+                _COUNT.pack_into(buf, slot, 0)
+        self.HEADER.pack_into(buf, self._offset, bucket, total)
+        return bucket, total
+
+
+_COUNT = struct.Struct("<Q")
@@ -0,0 +1,256 @@
+"""Adaptive concurrency limiting: find the in-flight limit an upstream can take from observed latency and errors."""
+
+import asyncio
+import math
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from time import monotonic, perf_counter
+
+from .exceptions import ConcurrencyLimitExceeded
+
+__all__ = ["LIMIT_ALGORITHMS", "AdaptiveConcurrencyLimiter"]
+
+LIMIT_ALGORITHMS = ("aimd", "gradient")
+
+
+class AdaptiveConcurrencyLimiter:
+    """Cap the number of in-flight calls, adjusting the cap from each call's latency and outcome.
+
+    Two algorithms are available:
+
+    - ``"aimd"``: additive increase, multiplicative decrease. The limit grows by 1 for every successful call made
+      while at least half the limit was in use, and is multiplied by ``backoff_ratio`` when a call fails or takes
+      longer than ``latency_threshold``.
+    - ``"gradient"``: tracks a long-term latency average and compares each call against it. While latency stays
+      within ``tolerance`` times the average the limit grows by about ``sqrt(limit)``; as calls slow down (queueing
+      at the upstream) the limit shrinks in proportion. Failures still apply ``backoff_ratio``.
+
+    Calls take a slot with ``slot()`` (threads) or ``slot_async()`` (asyncio tasks), which wait while the limiter
+    is full. If a ``circuit_breaker`` is given each slot is also a call through the breaker, so an open breaker
+    rejects calls before they wait for a slot and failures count towards tripping it.
+
+    :param initial_limit: Starting in-flight limit.
+    :param min_limit: The limit never drops below this.
+    :param max_limit: The limit never grows above this.
+    :param algorithm: One of LIMIT_ALGORITHMS.
+    :param backoff_ratio: Multiplier applied to the limit when a call fails (or is too slow, for aimd).
+    :param latency_threshold: Seconds after which aimd treats a successful call as a drop. None disables it.
+    :param tolerance: Gradient only. How much slower than the long-term average a call may be before the limit
+                      shrinks.
+    :param smoothing: Gradient only. Weight of each new limit estimate, between 0 and 1.
+    :param long_window: Gradient only. Number of samples the long-term latency average roughly spans.
+    :param failure_exceptions: Exception types that count as failed calls. Other exceptions release the slot
+                               without adjusting the limit.
+    :param circuit_breaker: Optional CircuitBreaker every slot goes through.
+
+    **Example:**
+
+    .. code-block:: python
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=100, circuit_breaker=breaker)
+
+        with limiter.slot(timeout=5):
+            call_upstream()
+
+        async with limiter.slot_async():
+            await call_upstream_async()
+
+        for _ in exponential_delay(max_attempts=5):
+            try:
+                with limiter.slot(timeout=1):
+                    call_upstream()
+                break
+            except ConcurrencyLimitExceeded:
+                continue
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        algorithm: str = "aimd",
+        backoff_ratio: float = 0.9,
+        latency_threshold: float | None = None,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        long_window: int = 600,
+        failure_exceptions: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+        circuit_breaker=None,
+    ):
+        if algorithm not in LIMIT_ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {LIMIT_ALGORITHMS}")
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff_ratio < 1:
+            raise ValueError("backoff_ratio must be between 0 and 1")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be greater than 0 and at most 1")
+        if tolerance < 1:
+            raise ValueError("tolerance must be at least 1")
+        if long_window < 1:
+            raise ValueError("long_window must be at least 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.algorithm = algorithm
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold = latency_threshold
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.failure_exceptions = failure_exceptions
+        self.circuit_breaker = circuit_breaker
+        self._long_weight = 2 / (long_window + 1)
+        self._long_latency = None
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._async_waiters = deque()
+
+    @property
+    def limit(self) -> int:
+        """The current in-flight limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently holding a slot."""
+        return self._in_flight
+
+    @contextmanager
+    def slot(self, timeout: float | None = None):
+        """Hold a slot for the duration of the block, waiting up to ``timeout`` seconds for one to free up.
+
+        :raises ConcurrencyLimitExceeded: If no slot frees up in time.
+        """
+        self._before_call()
+        try:
+            self._acquire(timeout)
+        except BaseException:
+            self._abandon_call()
+            raise
+        started = perf_counter()
+        try:
+            yield self
+        except BaseException as exc:
+            self._release(perf_counter() - started, exc)
+            raise
+        self._release(perf_counter() - started, None)
+
+    @asynccontextmanager
+    async def slot_async(self, timeout: float | None = None):
+        """asyncio version of ``slot``. Waiting tasks yield to the event loop instead of blocking it.
+
+        :raises ConcurrencyLimitExceeded: If no slot frees up in time.
+        """
+        self._before_call()
+        try:
+            await self._acquire_async(timeout)
+        except BaseException:
+            self._abandon_call()
+            raise
+        started = perf_counter()
+        try:
+            yield self
+        except BaseException as exc:
+            self._release(perf_counter() - started, exc)
+            raise
+        self._release(perf_counter() - started, None)
+
+    def stats(self) -> dict:
+        return {
+            "algorithm": self.algorithm,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "long_latency": self._long_latency,
+        }
+
+    def _acquire(self, timeout):
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._slot_freed:
+            while self._in_flight >= int(self._limit):
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise ConcurrencyLimitExceeded(f"No slot became free within {timeout}s (limit {self.limit})")
+                self._slot_freed.wait(remaining)
+            self._in_flight += 1
+
+    async def _acquire_async(self, timeout):
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            with self._lock:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                waiter = loop.create_future()
+                self._async_waiters.append((loop, waiter))
+            remaining = None if deadline is None else deadline - loop.time()
+            try:
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                raise ConcurrencyLimitExceeded(f"No slot became free within {timeout}s (limit {self.limit})") from None
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._async_waiters:
+                        self._async_waiters.remove((loop, waiter))
+
+    def _before_call(self):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_call()
+
+    def _abandon_call(self):
+        """Give back a half-open probe taken by _before_call when no slot could be had; not an upstream failure."""
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release_probe()
+
+    def _release(self, latency, exc):
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            if exc is None:
+                breaker.record_success()
+            elif isinstance(exc, breaker.failure_exceptions):
+                breaker.record_failure(exc)
+            else:
+                breaker.release_probe()
+        with self._lock:
+            self._in_flight -= 1
+            if exc is None:
+                self._on_sample(latency, dropped=False)
+            elif isinstance(exc, self.failure_exceptions):
+                self._on_sample(latency, dropped=True)
+            self._slot_freed.notify_all()
+            waiters, self._async_waiters = self._async_waiters, deque()
+        # Woken tasks race for the free slots and re-queue if they lose
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_wake, waiter)
+
+    def _on_sample(self, latency, dropped):
+        """Adjust the limit for one finished call. Called with the lock held."""
+        limit = self._limit
+        if self.algorithm == "aimd":
+            if dropped or (self.latency_threshold is not None and latency > self.latency_threshold):
+                limit *= self.backoff_ratio
+            elif self._in_flight + 1 >= limit / 2:
+                # Only grow when the limit is actually being used, not while the caller is idle
+                limit += 1
+        else:
+            if self._long_latency is None:
+                self._long_latency = latency
+            else:
+                self._long_latency += (latency - self._long_latency) * self._long_weight
+            if dropped:
+                limit *= self.backoff_ratio
+            else:
+                gradient = max(0.5, min(1.0, self.tolerance * self._long_latency / max(latency, 1e-9)))
+                estimate = limit * gradient + math.sqrt(limit)
+                limit += (estimate - limit) * self.smoothing
+        self._limit = min(max(limit, self.min_limit), self.max_limit)
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -1,32 +1,39 @@
 import logging
 import os
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
 
 from dotenv import load_dotenv
 
 from .crypto import decrypt_fernet_str
 from .exceptions import EncryptedValueError, MissingVaultKey
+from .service import SVCObj
 from .yaml import load_and_decrypt_yaml
 
 # Sentinel value to represent an unset default
 UNSET_DEFAULT = object()
 
+# Number of decrypted config values kept in memory, see _decrypt_cfg_var
+SECRET_CACHE_SIZE = 256
+
 
 def config_var(name: str, default: any = UNSET_DEFAULT) -> any:
     """
     Get a config variable from the service object or environment, prefer environment
 
+    If the variable isn't in the environment, ``SVCObj.svc.config`` is checked for ``name`` and ``name.lower()``.
+    Dotted names such as ``"db.primary.host"`` are looked up in nested config, in O(1) for a ConfigDict.
     """
     value = default
 
     if name in os.environ:
         value = os.environ[name]
-    # else:
-    #     config = getattr(SVCObj().svc, "config", None)
-    #     if config is not None:
-    #         if name in config:
-    #             value = config[name]
-    #         elif name.lower() in config:
-    #             value = config[name.lower()]
+    else:
+        config = getattr(SVCObj.svc, "config", None)
+        if config is not None:
+            value = _config_lookup(config, name, default)
 
     if value is UNSET_DEFAULT:
         raise ValueError(f"Config variable {name} not set and no default provided")
@@ -40,13 +47,31 @@ def config_var(name: str, default: any = UNSET_DEFAULT) -> any:
     return value
 
 
-def _normalize_config_string(name, value):
+def _config_lookup(config, name, default):
+    for candidate in (name, name.lower()):
+        if isinstance(config, ConfigDict):
+            if candidate in config.flat:
+                return config.flat[candidate]
+        elif candidate in config:
+            return config[candidate]
+        elif "." in candidate:
+            node = config
+            for part in candidate.split("."):
+                if not isinstance(node, Mapping) or part not in node:
+                    break
+                node = node[part]
+            else:
+                return node
+    return default
+
+
+def _normalize_config_string(name, value, vault_key=None):
     if value.lower() == "true":
         value = True
     elif value.lower() == "false":
         value = False
     elif value.startswith("!secret"):
-        value = extract_secret(name, value)
+        value = extract_secret(name, value, vault_key)
     return value
 
 
@@ -59,25 +84,117 @@ def _attempt_decode(name, value):
     return value
 
 
-def extract_secret(name, value):
-    vault_key = os.getenv("VAULT_KEY")
+def extract_secret(name, value, vault_key=None):
+    if vault_key is None:
+        vault_key = os.getenv("VAULT_KEY")
     if vault_key is None:
         raise MissingVaultKey("Encrypted Config encountered with no VAULT_KEY environment variable set")
     else:
         try:
-            value = _decrypt_cfg_var(os.getenv("VAULT_KEY"), value)
+            value = _decrypt_cfg_var(vault_key, value)
         except Exception as e:
             logging.error(f"Error decrypting config var {name}: {e}")
             raise EncryptedValueError(f"Error decrypting config var {name}: {e}") from e
     return value
 
 
+@lru_cache(maxsize=SECRET_CACHE_SIZE)
 def _decrypt_cfg_var(key, value):
+    # Cached on (key, ciphertext), so a changed env value or VAULT_KEY is simply a new entry. Fernet tokens are
+    # decrypted without a TTL, so the same pair always yields the same plaintext. Failures are not cached.
+    # Call _decrypt_cfg_var.cache_clear() to drop decrypted secrets from memory.
     value = value.removeprefix("!secret ")
     return decrypt_fernet_str(key, value)
 
 
-def load_config(decryption_key=None, config_file=None) -> dict:
+class ConfigDict(dict):
+    """A merged config dict with a flattened index of every nested key.
+
+    ``flat`` maps dotted paths (``"db.primary.host"``) to values, for nested mappings as well as leaves, so a lookup
+    is a single dict access instead of a walk. The index is built once when the ConfigDict is created; call
+    ``reindex()`` after modifying the config in place.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reindex()
+
+    def reindex(self):
+        flat = {}
+        _flatten_into(flat, self, "")
+        self.flat = MappingProxyType(flat)
+
+    def get_path(self, path: str, default=None):
+        """Return the value at a dotted path, or default if it doesn't exist."""
+        return self.flat.get(path, default)
+
+    def __reduce__(self):
+        # The index is a read-only proxy, which can't be pickled; rebuild it instead
+        return ConfigDict, (dict(self),)
+
+
+def _flatten_into(flat, mapping, prefix):
+    for key, value in mapping.items():
+        path = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, Mapping):
+            _flatten_into(flat, value, f"{path}.")
+
+
+class EnvSource:
+    """A load_config source made of environment variables starting with ``prefix``.
+
+    The prefix is removed, the rest is lower-cased and split on ``separator`` into a nested path, so with the
+    defaults ``APP_DB__PRIMARY__HOST=db1`` becomes ``{"db": {"primary": {"host": "db1"}}}``. Values go through
+    the same handling as config_var: "true"/"false" become bools and "!secret" values are decrypted.
+
+    :param prefix: Only variables starting with this prefix are used.
+    :param separator: Separator between nesting levels in the variable name.
+    :param environ: Mapping to read instead of os.environ.
+    """
+
+    def __init__(self, prefix: str, separator: str = "__", environ: Mapping | None = None):
+        if not prefix:
+            raise ValueError("EnvSource requires a prefix, to avoid merging the whole environment into the config")
+        self.prefix = prefix
+        self.separator = separator
+        self.environ = environ
+
+    def load(self, decryption_key: str | bytes | None = None) -> dict:
+        """Read the prefixed variables into a nested dict, decrypting "!secret" values with the key (or VAULT_KEY)."""
+        environ = os.environ if self.environ is None else self.environ
+        data = {}
+        for name, value in environ.items():
+            if not name.startswith(self.prefix) or name == self.prefix:
+                continue
+            *parents, leaf = name[len(self.prefix) :].lower().split(self.separator)
+            node = data
+            for part in parents:
+                node = node.setdefault(part, {})
+                if not isinstance(node, dict):
+                    raise ValueError(f"Environment variable {name} conflicts with another {self.prefix} variable")
+            node[leaf] = _normalize_config_string(name, value, decryption_key)
+        return data
+
+
+def deep_merge(base: Mapping, override: Mapping) -> dict:
+    """Merge ``override`` into a copy of ``base``. Nested mappings are merged; any other value replaces."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_config(
+    decryption_key=None,
+    config_file=None,
+    lazy_secrets=False,
+    cache_dir=None,
+    sources=None,
+) -> dict:
     """
     Loads a YAML configuration file, decrypting values tagged with "!secret" using the provided decryption key.
 
@@ -89,17 +206,47 @@ def load_config(decryption_key=None, config_file=None) -> dict:
                            If not provided, the constructor will attempt to use the environment variable "VAULT_KEY".
     :param config_file: Optional; a string representing the path to the YAML configuration file to be loaded.
                         If not provided, the function will look for the path in the "CONFIG" environment variable.
-    :return: A dictionary representing the contents of the loaded YAML file, with encrypted values decrypted
+    :param lazy_secrets: Optional; load "!secret" values as LazySecret proxies that decrypt on first use.
+    :param cache_dir: Optional; directory for parsed-config snapshots, see load_and_decrypt_yaml. Defaults to the
+                      "CONFIG_CACHE_DIR" environment variable; no snapshots are used if neither is set.
+    :param sources: Optional; an ordered list of sources to deep-merge instead of loading a single file. Each is
+                    a YAML file path, an EnvSource or a plain mapping; later sources override earlier ones.
+                    config_file and CONFIG_FILE are ignored when sources are given.
+    :return: A dictionary representing the contents of the loaded YAML file, with encrypted values decrypted.
+             With sources, a ConfigDict of the merged result.
     :raises Exception: If neither the config_file parameter nor the "CONFIG" environment variable is set.
+
+    **Example:**
+
+    .. code-block:: python
+
+        config = load_config(sources=["config/base.yaml", f"config/{env}.yaml", EnvSource("APP_")])
+        config.flat["db.primary.host"]
     """
     if decryption_key is None:
         decryption_key = os.getenv("VAULT_KEY", None)
+    if cache_dir is None:
+        cache_dir = os.getenv("CONFIG_CACHE_DIR")
+    if sources is not None:
+        merged = {}
+        for source in sources:
+            if isinstance(source, EnvSource):
+                data = source.load(decryption_key)
+            elif isinstance(source, Mapping):
+                data = source
+            elif isinstance(source, str | Path):
+                data = load_and_decrypt_yaml(decryption_key, source, lazy_secrets=lazy_secrets, cache_dir=cache_dir)
+            else:
+                raise TypeError(f"Unsupported config source: {source!r}")
+            merged = deep_merge(merged, data or {})
+        return ConfigDict(merged)
+
     if config_file is None:
         config_file = os.getenv("CONFIG_FILE")
     if config_file is None:
         raise Exception("CONFIG_FILE not set")
 
-    return load_and_decrypt_yaml(decryption_key, config_file)
+    return load_and_decrypt_yaml(decryption_key, config_file, lazy_secrets=lazy_secrets, cache_dir=cache_dir)
 
 
 def load_env(env_file=".env", required=False):
@@ -0,0 +1,125 @@
+"""Hand a resolved config from a parent process to pool workers without reloading or re-decrypting it."""
+
+import multiprocessing
+import pickle
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from .service import SVC, SVCObj
+
+__all__ = ["ConfigHandoff", "attach_config", "worker_config"]
+
+_LENGTH = struct.Struct("<Q")
+_worker_config = None
+_created_blocks = set()  # shared memory names created by this process, whose tracker registration is its own
+
+
+class ConfigHandoff:
+    """Serialize a resolved config once in the parent, for process-pool workers to attach to at startup.
+
+    The config (any picklable object: a dict from load_config, a ConfigDict, a ConfigSchema instance, ...) is
+    pickled once. With ``shared_memory=True`` (the default) the payload is written to a shared memory block and
+    workers are only sent its name, so each worker's startup cost is one memory copy and one unpickle no matter
+    how many workers there are. With ``shared_memory=False`` the pre-pickled bytes are passed to each worker as
+    its initializer argument instead, which needs no cleanup but copies the payload through each worker's pipe.
+
+    Either way workers skip load_env, YAML parsing and secret decryption entirely. Decrypted secrets end up in
+    the shared memory block, which like the parent's memory is only readable by the same user; LazySecret values
+    stay encrypted until a worker uses them.
+
+    The parent owns the shared memory block: call ``close()`` (or use the handoff as a context manager) once the
+    pool has shut down.
+
+    :param config: The resolved config to hand off.
+    :param shared_memory: Use a shared memory block (True) or pass the pickled payload directly (False).
+    :param install: Also make the config available as ``SVCObj.svc.config`` in workers, for config_var.
+
+    **Example:**
+
+    .. code-block:: python
+
+        config = load_config()
+        with ConfigHandoff(config) as handoff:
+            with ProcessPoolExecutor(initializer=handoff.initializer, initargs=handoff.initargs) as pool:
+                pool.map(work, items)
+
+
+        def work(item):
+            config = worker_config()
+    """
+
+    def __init__(self, config, shared_memory: bool = True, install: bool = True):
+        payload = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+        self._shm = None
+        if shared_memory:
+            self._shm = _create_block(payload)
+            self._ref = (self._shm.name, None, install)
+        else:
+            self._ref = (None, payload, install)
+
+    @property
+    def initializer(self):
+        return attach_config
+
+    @property
+    def initargs(self) -> tuple:
+        return (self._ref,)
+
+    def close(self):
+        """Release the shared memory block. Workers that already attached keep their copy of the config."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            _created_blocks.discard(self._shm.name)
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def attach_config(ref):
+    """Pool initializer: load the config handed off by the parent. Returns it, and ``worker_config()`` will too."""
+    global _worker_config
+    name, payload, install = ref
+    if name is not None:
+        payload = _read_block(name)
+    _worker_config = pickle.loads(payload)
+    if install:
+        if SVCObj.svc is None:
+            SVC()
+        SVCObj.svc.config = _worker_config
+    return _worker_config
+
+
+def worker_config():
+    """The config attached in this worker, or None if attach_config hasn't run."""
+    return _worker_config
+
+
+def _create_block(payload):
+    shm = shared_memory.SharedMemory(create=True, size=_LENGTH.size + len(payload))
+    _LENGTH.pack_into(shm.buf, 0, len(payload))
+    shm.buf[_LENGTH.size : _LENGTH.size + len(payload)] = payload
+    _created_blocks.add(shm.name)
+    return shm
+
+
+def _read_block(name):
+    if sys.version_info >= (3, 13):
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+        if multiprocessing.parent_process() is None and name not in _created_blocks:
+            # Attaching registers the block with this process's resource tracker, which would unlink it when this
+            # process exits. multiprocessing children share the parent's tracker, where the block is already
+            # registered, so only an unrelated process has to take it back out.
+            resource_tracker.unregister(shm._name, "shared_memory")
+    try:
+        (length,) = _LENGTH.unpack_from(shm.buf, 0)
+        return bytes(shm.buf[_LENGTH.size : _LENGTH.size + length])
+    finally:
+        shm.close()
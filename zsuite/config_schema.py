@@ -0,0 +1,296 @@
+"""Declarative, typed configuration resolved once at startup into an immutable object."""
+
+import os
+import re
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from typing import Any, ClassVar
+
+from cryptography.fernet import InvalidToken
+
+from .config import UNSET_DEFAULT, extract_secret, load_config
+from .exceptions import ZSuiteException
+from .fuzzybool import fuzzy_bool
+from .timestamps import epoch_to_utc, parse_timestamp
+from .yaml import LazySecret
+
+__all__ = ["ConfigSchema", "Setting", "parse_duration"]
+
+_DURATION_UNITS = {
+    "us": 1e-6,
+    "ms": 1e-3,
+    "s": 1,
+    "sec": 1,
+    "m": 60,
+    "min": 60,
+    "h": 3600,
+    "hr": 3600,
+    "d": 86400,
+    "w": 604800,
+}
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)\s*([a-z]+)")
+
+
+def parse_duration(value: str | int | float | timedelta) -> timedelta:
+    """Parse a duration such as ``"30s"``, ``"1h30m"``, ``"250ms"`` or a bare number of seconds.
+
+    :raises ValueError: If the value isn't a recognizable duration.
+    """
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return timedelta(seconds=value)
+    if not isinstance(value, str):
+        raise ValueError(f"Cannot parse duration from {type(value).__name__}")
+    text = value.strip().lower()
+    try:
+        return timedelta(seconds=float(text))
+    except ValueError:
+        pass
+    seconds = 0.0
+    position = 0
+    for match in _DURATION_PART.finditer(text):
+        if text[position : match.start()].strip() or match.group(2) not in _DURATION_UNITS:
+            raise ValueError(f"Invalid duration: {value!r}")
+        seconds += float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+        position = match.end()
+    if position == 0 or text[position:].strip():
+        raise ValueError(f"Invalid duration: {value!r}")
+    return timedelta(seconds=seconds)
+
+
+class Setting:
+    """One typed setting of a ConfigSchema.
+
+    Values are looked up in the environment first (``env``, defaulting to the attribute name upper-cased), then
+    in the config mapping (``key``, defaulting to the attribute name; dotted keys reach into nested mappings),
+    then fall back to ``default``. String values starting with ``!secret`` are decrypted with VAULT_KEY.
+
+    :param type: int, float, bool, str, list, timedelta, datetime, or any callable taking the raw value.
+    :param default: Value used when the setting isn't found. Coerced like any other value. Required if omitted.
+    :param env: Environment variable name. Pass False to never read this setting from the environment.
+    :param key: Key in the config mapping.
+    :param item_type: For lists, the type each item is coerced to.
+    :param separator: For lists given as a string, the item separator.
+    :param secret: Mask the value in the schema's repr and in error messages. Values decrypted from a "!secret" are
+                   always masked.
+    """
+
+    __slots__ = ("default", "env", "item_type", "key", "name", "secret", "separator", "type")
+
+    def __init__(
+        self,
+        type: type | Callable[[Any], Any] = str,
+        default: Any = UNSET_DEFAULT,
+        env: str | bool | None = None,
+        key: str | None = None,
+        item_type: type | Callable[[Any], Any] = str,
+        separator: str = ",",
+        secret: bool = False,
+    ):
+        self.type = type
+        self.default = default
+        self.env = env
+        self.key = key
+        self.item_type = item_type
+        self.separator = separator
+        self.secret = secret
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        if self.env is None:
+            self.env = name.upper()
+        if self.key is None:
+            self.key = name
+
+    def resolve(self, config: Mapping, environ: Mapping):
+        """Find this setting's raw value and coerce it. Raises ValueError if it's missing or invalid."""
+        return self._resolve(config, environ)[0]
+
+    def _resolve(self, config, environ):
+        """resolve(), also returning whether the value was decrypted from a secret."""
+        value = environ[self.env] if self.env and self.env in environ else _lookup(config, self.key)
+        if value is UNSET_DEFAULT:
+            value = self.default
+        if value is UNSET_DEFAULT:
+            raise ValueError(f"{self.name}: not set and no default provided")
+        decrypted = isinstance(value, LazySecret) or (isinstance(value, str) and value.startswith("!secret"))
+        try:
+            if isinstance(value, LazySecret):
+                value = value.value
+            elif decrypted:
+                value = extract_secret(self.name, value, environ.get("VAULT_KEY"))
+        except (ZSuiteException, InvalidToken) as e:
+            raise ValueError(f"{self.name}: cannot decrypt secret: {e or type(e).__name__}") from e
+        try:
+            return self.coerce(value), decrypted
+        except Exception as e:
+            if self.secret or decrypted:
+                # The conversion error would echo the plaintext, so neither include nor chain it
+                raise ValueError(f"{self.name}: cannot convert secret value to {_type_name(self.type)}") from None
+            raise ValueError(f"{self.name}: cannot convert {value!r} to {_type_name(self.type)}: {e}") from e
+
+    def coerce(self, value):
+        if value is None:
+            return None
+        if self.type is list:
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(self.separator) if item.strip()]
+            return [_coerce(self.item_type, item) for item in value]
+        return _coerce(self.type, value)
+
+
+def _coerce(target, value):
+    if target is bool:
+        result = fuzzy_bool(value)
+        if result is None:
+            raise ValueError("empty value")
+        return result
+    if target is timedelta:
+        return parse_duration(value)
+    if target is datetime:
+        if isinstance(value, int | float) and not isinstance(value, bool):
+            return epoch_to_utc(value)
+        return parse_timestamp(value)
+    if target is str:
+        if not isinstance(value, str):
+            raise ValueError(f"expected a string, got {type(value).__name__}")
+        return value
+    if target in (int, float) and isinstance(value, bool):
+        raise ValueError("expected a number, got a bool")
+    if target is int and isinstance(value, float) and not value.is_integer():
+        raise ValueError("not a whole number")
+    if isinstance(target, type) and isinstance(value, target) and not isinstance(value, bool):
+        return value
+    return target(value)
+
+
+def _lookup(config, key):
+    if key in config:
+        return config[key]
+    value = config
+    for part in key.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return UNSET_DEFAULT
+        value = value[part]
+    return value
+
+
+def _type_name(target):
+    return getattr(target, "__name__", repr(target))
+
+
+class _SchemaMeta(type):
+    """Collects Setting attributes into ``__settings__`` and replaces them with ``__slots__`` of the same names."""
+
+    def __new__(mcs, name, bases, namespace):
+        settings = {}
+        for base in reversed(bases):
+            settings.update(getattr(base, "__settings__", {}))
+        own = {attr: value for attr, value in namespace.items() if isinstance(value, Setting)}
+        for attr, setting in own.items():
+            setting.__set_name__(None, attr)
+            del namespace[attr]
+        settings.update(own)
+        namespace["__slots__"] = (*namespace.get("__slots__", ()), *own)
+        namespace["__settings__"] = settings
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class ConfigSchema(metaclass=_SchemaMeta):
+    """Base class for a typed, frozen configuration object.
+
+    Declare settings as class attributes and call ``load()`` once at startup. Every value is found, decrypted
+    and coerced up front, and all problems are reported together in one ValueError, so typos and bad values fail
+    the deploy instead of the first request that reads them. The result is immutable and ``__slots__`` backed,
+    so reading a setting is a plain attribute load.
+
+    **Example:**
+
+    .. code-block:: python
+
+        class AppConfig(ConfigSchema):
+            port = Setting(int, default=8080)
+            debug = Setting(bool, default=False)
+            timeout = Setting(timedelta, default="30s")
+            hosts = Setting(list, key="upstream.hosts")
+            db_password = Setting(str, secret=True)
+            launch = Setting(datetime, default=None)
+
+
+        config = AppConfig.load()
+        requests.get(config.hosts[0], timeout=config.timeout.total_seconds())
+    """
+
+    __slots__ = ("_secret_names",)
+    __settings__: ClassVar[dict[str, Setting]]
+
+    def __init__(self, _secret_names: frozenset[str] = frozenset(), **values):
+        missing = self.__settings__.keys() - values.keys()
+        unknown = values.keys() - self.__settings__.keys()
+        if missing or unknown:
+            raise TypeError(f"{type(self).__name__} got unknown {sorted(unknown)} and missing {sorted(missing)}")
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+        # Settings whose value was decrypted from a secret, masked in repr like secret=True settings
+        object.__setattr__(self, "_secret_names", frozenset(_secret_names))
+
+    @classmethod
+    def load(cls, config: Mapping | None = None, environ: Mapping | None = None):
+        """Resolve every setting and return a frozen instance.
+
+        :param config: Mapping of config values, e.g. from load_config(). Defaults to loading the file named by
+                       CONFIG_FILE in ``environ`` when it is set, otherwise no config file is used.
+        :param environ: Mapping used as the environment, including CONFIG_FILE and the VAULT_KEY used for
+                        "!secret" values. Defaults to os.environ.
+        :raises ValueError: Listing every setting that is missing or can't be converted.
+        """
+        environ = os.environ if environ is None else environ
+        if config is None:
+            config_file = environ.get("CONFIG_FILE")
+            config = load_config(environ.get("VAULT_KEY"), config_file) if config_file else {}
+        values = {}
+        secret_names = set()
+        errors = []
+        for name, setting in cls.__settings__.items():
+            try:
+                values[name], decrypted = setting._resolve(config, environ)
+            except ValueError as e:
+                errors.append(str(e))
+                continue
+            if decrypted:
+                secret_names.add(name)
+        if errors:
+            raise ValueError(f"Invalid {cls.__name__} configuration:\n  " + "\n  ".join(errors))
+        return cls(frozenset(secret_names), **values)
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__settings__}
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is frozen, cannot set {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is frozen, cannot delete {name!r}")
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return _rebuild, (type(self), self.as_dict(), self._secret_names)
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={'********' if setting.secret or name in self._secret_names else getattr(self, name)!r}"
+            for name, setting in self.__settings__.items()
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+def _rebuild(cls, values, secret_names=frozenset()):
+    return cls(secret_names, **values)
@@ -0,0 +1,247 @@
+"""Hot reload of the YAML config file, with lock-free reads and change notifications."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .logs import log_or_print
+from .yaml import load_and_decrypt_yaml
+
+__all__ = ["ConfigDiff", "ConfigWatcher", "diff_config"]
+
+# inotify constants from <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+@dataclass(frozen=True)
+class ConfigDiff:
+    """Dotted keys that differ between two configs, e.g. ``{"database.host"}``."""
+
+    added: frozenset[str] = field(default_factory=frozenset)
+    removed: frozenset[str] = field(default_factory=frozenset)
+    changed: frozenset[str] = field(default_factory=frozenset)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def keys(self) -> frozenset[str]:
+        """Every key that was added, removed or changed."""
+        return self.added | self.removed | self.changed
+
+
+def diff_config(old: dict, new: dict) -> ConfigDiff:
+    """Compare two (nested) config dicts, reporting differences as dotted keys of the leaves."""
+    old_flat = _flatten(old)
+    new_flat = _flatten(new)
+    return ConfigDiff(
+        added=frozenset(new_flat.keys() - old_flat.keys()),
+        removed=frozenset(old_flat.keys() - new_flat.keys()),
+        changed=frozenset(key for key in old_flat.keys() & new_flat.keys() if old_flat[key] != new_flat[key]),
+    )
+
+
+def _flatten(config, prefix=""):
+    flat = {}
+    for key, value in (config or {}).items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(_flatten(value, f"{dotted}."))
+        else:
+            flat[dotted] = value
+    return flat
+
+
+class ConfigWatcher:
+    """Watch the config file and swap in a freshly loaded config whenever it changes.
+
+    The file is re-read and decrypted on a background thread, never on the request path. The new dict replaces
+    the old one with a single reference assignment, so ``watcher.config`` is a plain attribute read that never
+    takes a lock and always returns a complete config. Treat the returned dict as read-only; hold on to it for
+    the duration of a request if you need consistent values across several reads.
+
+    Changes are detected with inotify when the platform has it, and otherwise by polling the file's mtime, size
+    and inode every ``poll_interval`` seconds. inotify watches the directory and only reacts once a writer closes
+    the file or renames a new one over it, so saves that replace the file atomically are caught and in-place
+    saves aren't read half-written. Polling can still catch an in-place save part way through, so prefer
+    replacing the file. If the new file fails to load, or doesn't hold a mapping (an empty or truncated file),
+    the previous config is kept and the error is logged; the next change is picked up as usual.
+
+    :param config_file: Path to the YAML file. Defaults to the CONFIG_FILE environment variable.
+    :param decryption_key: Key for ``!secret`` values, as for load_config. Defaults to VAULT_KEY.
+    :param poll_interval: Seconds between mtime checks, and the longest ``stop()`` waits for the thread.
+    :param use_inotify: Force (True) or disable (False) inotify. Defaults to using it when available.
+
+    **Example:**
+
+    .. code-block:: python
+
+        watcher = ConfigWatcher()
+        watcher.subscribe(lambda config, diff: log_or_print(f"config changed: {sorted(diff.keys)}"))
+        watcher.start()
+
+
+        def handler(request):
+            timeout = watcher.config["upstream"]["timeout"]
+    """
+
+    def __init__(
+        self,
+        config_file: str | Path | None = None,
+        decryption_key: str | bytes | None = None,
+        poll_interval: float = 1.0,
+        use_inotify: bool | None = None,
+    ):
+        if config_file is None:
+            config_file = os.getenv("CONFIG_FILE")
+        if config_file is None:
+            raise Exception("CONFIG_FILE not set")
+        if poll_interval <= 0:
+            raise ValueError("poll_interval must be greater than 0")
+        self.config_file = Path(config_file)
+        self.decryption_key = decryption_key if decryption_key is not None else os.getenv("VAULT_KEY")
+        self.poll_interval = poll_interval
+        if use_inotify is None:
+            use_inotify = _libc() is not None
+        elif use_inotify and _libc() is None:
+            raise ValueError("inotify is not available on this platform")
+        self.use_inotify = use_inotify
+        self._subscribers = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._signature = self._file_signature()
+        self.config = self._load()
+
+    def subscribe(self, callback):
+        """Call ``callback(new_config, diff)`` on the watcher thread after every change. Returns the callback."""
+        self._subscribers = [*self._subscribers, callback]
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers = [subscriber for subscriber in self._subscribers if subscriber is not callback]
+
+    def reload(self) -> ConfigDiff:
+        """Re-read the file now, swap in the new config and notify subscribers if anything changed."""
+        self._signature = self._file_signature()
+        new_config = self._load()
+        diff = diff_config(self.config, new_config)
+        self.config = new_config
+        if diff:
+            for callback in self._subscribers:
+                try:
+                    callback(new_config, diff)
+                except Exception as e:
+                    log_or_print(f"Config change subscriber {callback!r} failed: {e}", level="ERROR")
+        return diff
+
+    def check(self) -> ConfigDiff | None:
+        """Reload if the file's mtime, size or inode changed since the last load. Returns the diff, if reloaded."""
+        if self._file_signature() == self._signature:
+            return None
+        return self._safe_reload()
+
+    def start(self):
+        """Start watching on a daemon thread."""
+        if self._thread is not None:
+            raise RuntimeError("ConfigWatcher is already running")
+        self._stop.clear()
+        target = self._watch_inotify if self.use_inotify else self._watch_polling
+        self._thread = threading.Thread(target=target, name="config-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _load(self):
+        config = load_and_decrypt_yaml(self.decryption_key, self.config_file)
+        if not isinstance(config, Mapping):
+            raise ValueError(f"{self.config_file} does not hold a mapping (got {type(config).__name__})")
+        return config
+
+    def _safe_reload(self):
+        try:
+            return self.reload()
+        except Exception as e:
+            log_or_print(f"Failed to reload {self.config_file}, keeping the previous config: {e}", level="ERROR")
+            return None
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.config_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _watch_polling(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    def _watch_inotify(self):
+        libc = _libc()
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            log_or_print("inotify_init1 failed, falling back to polling", level="WARNING")
+            return self._watch_polling()
+        try:
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO
+            directory = str(self.config_file.parent).encode()
+            if libc.inotify_add_watch(fd, directory, mask) < 0:
+                log_or_print("inotify_add_watch failed, falling back to polling", level="WARNING")
+                return self._watch_polling()
+            name = self.config_file.name.encode()
+            self.check()  # catch anything written between the initial load and the watch being added
+            while not self._stop.is_set():
+                readable, _, _ = select.select([fd], [], [], self.poll_interval)
+                if readable and name in _event_names(os.read(fd, 64 * 1024)):
+                    # Compare signatures so a burst of events for one write only reloads once
+                    self.check()
+        finally:
+            os.close(fd)
+
+
+def _event_names(buffer):
+    names = set()
+    offset = 0
+    while offset + _EVENT.size <= len(buffer):
+        _, _, _, length = _EVENT.unpack_from(buffer, offset)
+        offset += _EVENT.size
+        names.add(buffer[offset : offset + length].rstrip(b"\0"))
+        offset += length
+    return names
+
+
+_LIBC = None
+
+
+def _libc():
+    """The C library if it provides inotify, else None."""
+    global _LIBC
+    if _LIBC is None:
+        _LIBC = False
+        path = ctypes.util.find_library("c")
+        if path:
+            libc = ctypes.CDLL(path, use_errno=True)
+            if hasattr(libc, "inotify_init1"):
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                _LIBC = libc
+    return _LIBC or None
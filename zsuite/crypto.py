@@ -1,13 +1,374 @@
-from cryptography.fernet import Fernet
+import io
+import os
+import struct
+from collections import deque
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import BinaryIO
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 
 from .byte_strings import want_bytes
+from .exceptions import EncryptedFileError
+
+# Number of distinct keys (or key lists) whose ciphers are kept, see get_cipher
+CIPHER_CACHE_SIZE = 64
+# Values per task when encrypt_many/decrypt_many fan out, large enough to amortize the thread pool overhead
+BATCH_CHUNK_SIZE = 1024
+# Plaintext bytes per chunk of an encrypted file, see encrypt_file
+FILE_CHUNK_SIZE = 64 * 1024
+MAX_FILE_CHUNK_SIZE = 64 * 1024 * 1024
+
+# Encrypted file layout: header, then one frame per chunk of [u32 token length][Fernet token]. Each token's
+# plaintext is the chunk prefix followed by the chunk's data.
+_FILE_MAGIC = b"ZSFE"
+_FILE_VERSION = 1
+_FILE_HEADER = struct.Struct(">4sBI16s")  # magic, version, chunk size, random file id
+_CHUNK_PREFIX = struct.Struct(">16sQ?")  # file id, chunk index, is last chunk
+_FRAME_LENGTH = struct.Struct(">I")
+
+
+class RotatingFernet(MultiFernet):
+    """MultiFernet that tries the key that last decrypted successfully first.
+
+    Encryption always uses the first (newest) key, as with MultiFernet. During a rotation most tokens are still
+    under one key, so starting from the last key that worked usually decrypts on the first try instead of failing
+    HMAC checks against every newer key first.
+    """
+
+    def __init__(self, fernets: Sequence[Fernet]):
+        super().__init__(fernets)
+        self._ciphers = list(fernets)
+        self._last_index = 0
+
+    def decrypt(self, msg: bytes | str, ttl: int | None = None) -> bytes:
+        last = self._last_index
+        order = [last, *(index for index in range(len(self._ciphers)) if index != last)]
+        for index in order:
+            try:
+                plaintext = self._ciphers[index].decrypt(msg, ttl)
+            except InvalidToken:
+                continue
+            self._last_index = index
+            return plaintext
+        raise InvalidToken
+
+
+def get_cipher(key: str | bytes | Sequence[str | bytes]) -> Fernet | RotatingFernet:
+    """Return a cached cipher for a key, a comma-separated list of keys, or a sequence of keys (newest first).
+
+    Building a Fernet decodes and splits the key; the cipher is cached per key so repeated calls don't. A single
+    key gives a Fernet, several give a RotatingFernet that encrypts with the newest key and decrypts with any.
+    Use ``get_cipher.cache_clear()`` to drop cached key material.
+
+    :raises ValueError: If a key is not a valid Fernet key.
+    """
+    return _cached_cipher(_normalize_keys(key))
+
+
+def _normalize_keys(key):
+    if isinstance(key, str | bytes):
+        key = want_bytes(key).split(b",")
+    keys = tuple(want_bytes(k).strip() for k in key)
+    if not keys or not all(keys):
+        raise ValueError("At least one non-empty Fernet key is required")
+    return keys
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def _cached_cipher(keys):
+    if len(keys) == 1:
+        return Fernet(keys[0])
+    return RotatingFernet([Fernet(k) for k in keys])
+
+
+get_cipher.cache_clear = _cached_cipher.cache_clear
+
+
+def decrypt_fernet_str(key: str | bytes | Sequence[str | bytes], value: str | bytes) -> str:
+    return get_cipher(key).decrypt(want_bytes(value)).decode()
+
+
+def encrypt_fernet_str(key: str | bytes | Sequence[str | bytes], value: str | bytes) -> str:
+    return get_cipher(key).encrypt(want_bytes(value)).decode()
+
+
+def encrypt_many(
+    key: str | bytes | Sequence[str | bytes],
+    values: Iterable[str | bytes],
+    workers: int = 1,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> list[str]:
+    """Encrypt every value with one cipher, returning the tokens in the same order as the values.
+
+    :param key: As for get_cipher. With several keys, values are encrypted with the newest.
+    :param values: Any iterable of str or bytes values.
+    :param workers: Number of threads to spread the work over. OpenSSL releases the GIL while encrypting, so
+                    larger values benefit most; for tiny values the per-chunk overhead can outweigh the gain.
+    :param chunk_size: Values handed to a thread at a time when workers > 1.
+    """
+    encrypt = get_cipher(key).encrypt
+    return _map_chunks(
+        lambda chunk: [encrypt(want_bytes(value)).decode() for value in chunk], values, workers, chunk_size
+    )
+
+
+def decrypt_many(
+    key: str | bytes | Sequence[str | bytes],
+    tokens: Iterable[str | bytes],
+    workers: int = 1,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+) -> list[str]:
+    """Decrypt every token with one cipher, returning the plaintexts in the same order as the tokens.
+
+    Takes the same arguments as encrypt_many.
+
+    :raises cryptography.fernet.InvalidToken: If any token can't be decrypted with the key(s).
+    """
+    decrypt = get_cipher(key).decrypt
+    return _map_chunks(
+        lambda chunk: [decrypt(want_bytes(token)).decode() for token in chunk], tokens, workers, chunk_size
+    )
+
+
+def _map_chunks(func, values, workers, chunk_size):
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be at least 1")
+    if workers == 1:
+        return func(values)
+    results = []
+    with ThreadPoolExecutor(workers, thread_name_prefix="zsuite-crypto") as pool:
+        for chunk_result in pool.map(func, _chunks(values, chunk_size)):
+            results.extend(chunk_result)
+    return results
+
+
+def _chunks(values, size):
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def encrypt_file(
+    key: str | bytes | Sequence[str | bytes],
+    source: str | Path | BinaryIO,
+    destination: str | Path | BinaryIO,
+    chunk_size: int = FILE_CHUNK_SIZE,
+    workers: int = 1,
+) -> int:
+    """Encrypt a file or binary stream in fixed-size chunks, without reading it all into memory.
+
+    Every chunk is a separate Fernet token, so each is authenticated on its own. Each chunk also carries its index,
+    a random id shared by the file's chunks and a flag on the final chunk. decrypt_file uses these to detect
+    chunks that were reordered, swapped in from another file, dropped or truncated away. Every chunk except the
+    last has exactly ``chunk_size`` bytes of plaintext. That makes every frame but the last the same size, which
+    is what lets decrypt_file seek straight to a chunk.
+
+    Memory use is about ``chunk_size`` times the number of chunks in flight: one without workers, or twice
+    ``workers`` with them.
+
+    :param key: As for get_cipher. With several keys, the file is encrypted with the newest.
+    :param source: Path or binary file object to read plaintext from.
+    :param destination: Path or binary file object to write the encrypted file to.
+    :param chunk_size: Plaintext bytes per chunk, up to MAX_FILE_CHUNK_SIZE.
+    :param workers: Number of threads encrypting chunks concurrently. Output order is unaffected.
+    :return: The number of chunks written. An empty source still gets one (empty) final chunk.
+
+    **Example:**
+
+    .. code-block:: python
+
+        encrypt_file(key, "export.csv", "export.csv.enc", workers=4)
+        decrypt_file(key, "export.csv.enc", "export.csv")
+    """
+    if not 0 < chunk_size <= MAX_FILE_CHUNK_SIZE:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_FILE_CHUNK_SIZE}")
+    _check_workers(workers)
+    cipher = get_cipher(key)
+    file_id = os.urandom(16)
+
+    def seal(chunk):
+        index, is_last, data = chunk
+        return cipher.encrypt(_CHUNK_PREFIX.pack(file_id, index, is_last) + data)
+
+    count = 0
+    with _open_binary(source, "rb") as src, _open_binary(destination, "wb") as dst:
+        dst.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION, chunk_size, file_id))
+        for token in _ordered_map(seal, _plaintext_chunks(src, chunk_size), workers):
+            dst.write(_FRAME_LENGTH.pack(len(token)))
+            dst.write(token)
+            count += 1
+    return count
+
+
+def decrypt_file(
+    key: str | bytes | Sequence[str | bytes],
+    source: str | Path | BinaryIO,
+    destination: str | Path | BinaryIO,
+    start_chunk: int = 0,
+    end_chunk: int | None = None,
+    workers: int = 1,
+) -> int:
+    """Decrypt a file written by encrypt_file, or the chunks ``start_chunk`` up to (not including) ``end_chunk``.
+
+    Chunk ``n`` holds plaintext bytes ``n * chunk_size`` onwards, so a byte range maps directly to a chunk range.
+    A range that doesn't start at 0 needs a seekable source. The other chunks are skipped over, not read.
+
+    Nothing is written for a chunk until it has been authenticated. If an error is raised part way through,
+    ``destination`` holds the chunks before the bad one, so write to a temporary file when that matters.
+
+    :param key: As for get_cipher.
+    :param source: Path or binary file object to read the encrypted file from.
+    :param destination: Path or binary file object to write the plaintext to.
+    :param start_chunk: Index of the first chunk to decrypt.
+    :param end_chunk: Index after the last chunk to decrypt. None decrypts to the end. Either way the file is
+                      checked for truncation whenever the range reaches its end. Ranges may extend past the final
+                      chunk; one that starts past it writes nothing, once the final chunk has been authenticated.
+    :param workers: Number of threads decrypting chunks concurrently.
+    :return: The number of plaintext bytes written.
+    :raises cryptography.fernet.InvalidToken: If a chunk was modified or the key is wrong.
+    :raises EncryptedFileError: If the file is not in this format, was truncated, or has misplaced chunks.
+    """
+    if start_chunk < 0 or (end_chunk is not None and end_chunk < start_chunk):
+        raise ValueError("Chunk range must satisfy 0 <= start_chunk <= end_chunk")
+    _check_workers(workers)
+    cipher = get_cipher(key)
+    written = 0
+    with _open_binary(source, "rb") as src, _open_binary(destination, "wb") as dst:
+        header = _read_exact(src, _FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size or not header.startswith(_FILE_MAGIC):
+            raise EncryptedFileError("Not an encrypted file")
+        _, version, chunk_size, file_id = _FILE_HEADER.unpack(header)
+        if version != _FILE_VERSION:
+            raise EncryptedFileError(f"Unsupported encrypted file version {version}")
+        if not 0 < chunk_size <= MAX_FILE_CHUNK_SIZE:
+            raise EncryptedFileError(f"Invalid chunk size {chunk_size}")
+        token_length = _token_length(_CHUNK_PREFIX.size + chunk_size)
+        frame_size = _FRAME_LENGTH.size + token_length
+        if start_chunk:
+            data_start = src.tell()
+            src.seek(data_start + start_chunk * frame_size)
+
+        def open_chunk(frame):
+            index, token = frame
+            plaintext = cipher.decrypt(token)
+            chunk_file_id, chunk_index, is_last = _CHUNK_PREFIX.unpack_from(plaintext)
+            if chunk_file_id != file_id or chunk_index != index:
+                raise EncryptedFileError(f"Chunk {index} does not belong at this position in this file")
+            data = memoryview(plaintext)[_CHUNK_PREFIX.size :]
+            if not is_last and len(data) != chunk_size:
+                raise EncryptedFileError(f"Chunk {index} is shorter than the file's chunk size")
+            return is_last, data
+
+        index = start_chunk
+        saw_last = False
+        frames = _encrypted_frames(src, start_chunk, end_chunk, token_length)
+        for is_last, data in _ordered_map(open_chunk, frames, workers):
+            if saw_last:
+                raise EncryptedFileError(f"Unexpected data after the final chunk {index - 1}")
+            dst.write(data)
+            written += len(data)
+            saw_last = is_last
+            index += 1
+        if not saw_last and index != end_chunk:
+            # Either the range starts past the final chunk, which is fine as long as the chunk the file ends with
+            # really is flagged as the final one, or the file was cut short.
+            past_end = False
+            if index == start_chunk and start_chunk:
+                final = (src.seek(0, io.SEEK_END) - data_start - 1) // frame_size
+                if 0 <= final < start_chunk:
+                    src.seek(data_start + final * frame_size)
+                    frame = next(_encrypted_frames(src, final, final + 1, token_length), None)
+                    past_end = frame is not None and open_chunk(frame)[0]
+            if not past_end:
+                raise EncryptedFileError(f"File ends before chunk {index}, it may have been truncated")
+    return written
+
+
+def _check_workers(workers):
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+
+def _token_length(plaintext_length):
+    """Length of a Fernet token for a plaintext of this length: base64 of version, timestamp, IV, padded
+    AES-CBC ciphertext and HMAC."""
+    raw = 1 + 8 + 16 + (plaintext_length // 16 + 1) * 16 + 32
+    return (raw + 2) // 3 * 4
+
+
+@contextmanager
+def _open_binary(target, mode):
+    if isinstance(target, str | Path):
+        with open(target, mode) as f:
+            yield f
+    else:
+        yield target
+
+
+def _read_exact(stream, size):
+    """Read ``size`` bytes, or fewer only at the end of the stream."""
+    data = stream.read(size)
+    while data and len(data) < size:
+        more = stream.read(size - len(data))
+        if not more:
+            break
+        data += more
+    return data
+
+
+def _plaintext_chunks(stream, chunk_size):
+    """Yield (index, is_last, data) for each chunk, reading one chunk ahead to know which one is last."""
+    index = 0
+    data = _read_exact(stream, chunk_size)
+    while True:
+        following = _read_exact(stream, chunk_size) if len(data) == chunk_size else b""
+        yield index, not following, data
+        if not following:
+            return
+        index += 1
+        data = following
+
 
+def _encrypted_frames(stream, start_chunk, end_chunk, token_length):
+    """Yield (index, token) for each frame in the range, stopping at the end of the stream."""
+    index = start_chunk
+    while end_chunk is None or index < end_chunk:
+        length = _read_exact(stream, _FRAME_LENGTH.size)
+        if not length:
+            return
+        if len(length) < _FRAME_LENGTH.size:
+            raise EncryptedFileError(f"Chunk {index} is truncated")
+        (length,) = _FRAME_LENGTH.unpack(length)
+        if length > token_length:
+            raise EncryptedFileError(f"Chunk {index} has an invalid length")
+        token = _read_exact(stream, length)
+        if len(token) < length:
+            raise EncryptedFileError(f"Chunk {index} is truncated")
+        yield index, token
+        index += 1
 
-def decrypt_fernet_str(key: str | bytes, value: str | bytes) -> str:
-    f = Fernet(want_bytes(key))
-    return f.decrypt(want_bytes(value)).decode()
 
+def _ordered_map(func, items, workers):
+    """Lazily map ``func`` over ``items`` on up to ``workers`` threads, yielding results in order.
 
-def encrypt_fernet_str(key: str | bytes, value: str | bytes) -> str:
-    f = Fernet(want_bytes(key))
-    return f.encrypt(want_bytes(value)).decode()
+    At most twice ``workers`` items are in flight at once, so memory stays bounded however many items there are.
+    """
+    if workers == 1:
+        yield from map(func, items)
+        return
+    pool = ThreadPoolExecutor(workers, thread_name_prefix="zsuite-crypto")
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
@@ -18,9 +18,21 @@ class CircuitBreakerTripped(ZSuiteException):
     """Raised when a circuit breaker trips."""
 
 
+class CircuitBreakerOpen(CircuitBreakerTripped):
+    """Raised when a call is rejected because a circuit breaker is open."""
+
+
+class ConcurrencyLimitExceeded(ZSuiteException):
+    """Raised when no concurrency limiter slot becomes free before the timeout."""
+
+
 class StaleFile(ZSuiteException):
     """Raised when a file is older than the expected freshness window."""
 
 
 class FileNotFound(ZSuiteException):
     """Raised when a file cannot be found in any of the specified locations."""
+
+
+class EncryptedFileError(EncryptedValueError):
+    """Raised when an encrypted file is malformed, truncated, or has chunks out of place."""
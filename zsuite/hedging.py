@@ -0,0 +1,242 @@
+"""Hedged requests: race a backup attempt against a slow call to cut tail latency."""
+
+import asyncio
+import math
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from time import perf_counter, time
+
+from .backoff import _normalize_cutoff
+
+__all__ = ["Hedger", "LatencyHistogram"]
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with O(1) recording and bounded memory.
+
+    Bucket boundaries grow geometrically from ``min_latency`` to ``max_latency`` so percentiles are accurate to
+    within ``growth`` regardless of scale. Once ``max_samples`` have been recorded all counts are halved, so the
+    histogram tracks recent latency instead of averaging over the whole process lifetime.
+
+    :param min_latency: Smallest latency, in seconds, that gets its own bucket.
+    :param max_latency: Largest latency, in seconds, that gets its own bucket. Anything slower lands in the last one.
+    :param growth: Ratio between consecutive bucket boundaries.
+    :param max_samples: Number of samples after which older counts are decayed by half.
+    """
+
+    def __init__(
+        self,
+        min_latency: float = 0.0001,
+        max_latency: float = 60.0,
+        growth: float = 1.1,
+        max_samples: int = 10_000,
+    ):
+        if min_latency <= 0 or max_latency <= min_latency:
+            raise ValueError("min_latency must be greater than 0 and less than max_latency")
+        if growth <= 1:
+            raise ValueError("growth must be greater than 1")
+        self.min_latency = min_latency
+        self.growth = growth
+        self.max_samples = max_samples
+        self._log_growth = math.log(growth)
+        self._counts = [0] * (math.ceil(math.log(max_latency / min_latency) / self._log_growth) + 2)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._total
+
+    def record(self, seconds: float):
+        """Record one latency sample, in seconds."""
+        if seconds <= self.min_latency:
+            index = 0
+        else:
+            index = min(int(math.log(seconds / self.min_latency) / self._log_growth) + 1, len(self._counts) - 1)
+        with self._lock:
+            self._counts[index] += 1
+            self._total += 1
+            if self._total >= self.max_samples:
+                self._counts = [count // 2 for count in self._counts]
+                self._total = sum(self._counts)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the upper bound of the bucket holding the given percentile (0-100), or None if empty."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._total
+        if not total:
+            return None
+        threshold = total * pct / 100
+        running = 0
+        for index, count in enumerate(counts):
+            running += count
+            if running >= threshold:
+                return self.min_latency * self.growth**index
+        return self.min_latency * self.growth ** (len(counts) - 1)
+
+    def reset(self):
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self._total = 0
+
+
+class Hedger:
+    """Run a call and, if it hasn't finished after the hedge delay, race a second attempt against it.
+
+    The first attempt to succeed wins and the others are cancelled (or, for threads that are already running, left
+    to finish in the background). If an attempt fails while another is still in flight the other one is awaited;
+    once every attempt has failed the last exception is raised.
+
+    The hedge delay is either fixed, or the ``percentile`` of the latencies observed by this Hedger once it has
+    seen ``min_samples`` calls (``initial_delay`` is used until then).
+
+    :param hedge_delay: Fixed hedge delay in seconds. If None, it is derived from the latency histogram.
+    :param percentile: Latency percentile used as the hedge delay when it isn't fixed.
+    :param initial_delay: Hedge delay used until the histogram has enough samples.
+    :param min_samples: Number of samples needed before the histogram is trusted.
+    :param max_hedges: Number of extra attempts that may be launched, one per hedge delay.
+    :param max_workers: Size of the thread pool used for sync callables.
+    :param histogram: Optional LatencyHistogram, to share latency tracking between hedgers.
+
+    **Example:**
+
+    .. code-block:: python
+
+        hedger = Hedger(percentile=95)
+        user = hedger.call(fetch_user, user_id, cutoff=timedelta(seconds=2))
+        user = await hedger.call_async(fetch_user_async, user_id, cutoff=2)
+    """
+
+    def __init__(
+        self,
+        hedge_delay: float | None = None,
+        percentile: float = 95,
+        initial_delay: float = 0.1,
+        min_samples: int = 20,
+        max_hedges: int = 1,
+        max_workers: int | None = None,
+        histogram: LatencyHistogram | None = None,
+    ):
+        if hedge_delay is not None and hedge_delay < 0:
+            raise ValueError("hedge_delay must not be negative")
+        if max_hedges < 0:
+            raise ValueError("max_hedges must not be negative")
+        self.hedge_delay = hedge_delay
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.histogram = histogram if histogram is not None else LatencyHistogram()
+        self.hedges_launched = 0
+        self._max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def current_hedge_delay(self) -> float:
+        """The hedge delay the next call will use."""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        if len(self.histogram) < self.min_samples:
+            return self.initial_delay
+        return self.histogram.percentile(self.percentile)
+
+    def call(self, func, *args, cutoff: datetime | timedelta | int | None = None, **kwargs):
+        """Call ``func(*args, **kwargs)`` on the thread pool with hedging.
+
+        :param cutoff: Optional overall deadline, as for exponential_delay.
+        :raises TimeoutError: If no attempt succeeds before the cutoff.
+        """
+        deadline = _normalize_cutoff(cutoff)
+        hedge_delay = self.current_hedge_delay
+        executor = self._get_executor()
+        started = {}
+
+        def launch():
+            future = executor.submit(func, *args, **kwargs)
+            started[future] = perf_counter()
+            return future
+
+        pending = {launch()}
+        last_exception = None
+        try:
+            while pending:
+                can_hedge = len(started) <= self.max_hedges
+                timeout = _timeout(deadline, hedge_delay if can_hedge else None)
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        self.histogram.record(perf_counter() - started[future])
+                        return future.result()
+                    last_exception = future.exception()
+                if done:
+                    continue
+                if deadline and time() >= deadline:
+                    raise TimeoutError("Hedged call did not complete before the cutoff")
+                pending.add(launch())
+                self.hedges_launched += 1
+        finally:
+            for future in pending:
+                future.cancel()
+        raise last_exception
+
+    async def call_async(self, func, *args, cutoff: datetime | timedelta | int | None = None, **kwargs):
+        """Await ``func(*args, **kwargs)`` with hedging, running each attempt as its own task.
+
+        :param cutoff: Optional overall deadline, as for exponential_delay.
+        :raises TimeoutError: If no attempt succeeds before the cutoff.
+        """
+        deadline = _normalize_cutoff(cutoff)
+        hedge_delay = self.current_hedge_delay
+        started = {}
+
+        def launch():
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            started[task] = perf_counter()
+            return task
+
+        pending = {launch()}
+        last_exception = None
+        try:
+            while pending:
+                can_hedge = len(started) <= self.max_hedges
+                timeout = _timeout(deadline, hedge_delay if can_hedge else None)
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.histogram.record(perf_counter() - started[task])
+                        return task.result()
+                    last_exception = task.exception()
+                if done:
+                    continue
+                if deadline and time() >= deadline:
+                    raise TimeoutError("Hedged call did not complete before the cutoff")
+                pending.add(launch())
+                self.hedges_launched += 1
+        finally:
+            for task in pending:
+                task.cancel()
+        raise last_exception
+
+    def shutdown(self, wait_for_calls: bool = True):
+        """Shut down the thread pool used for sync callables."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait_for_calls)
+                self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix="hedger")
+        return self._executor
+
+
+def _timeout(deadline, hedge_delay):
+    """Seconds to wait before the next hedge or the deadline, whichever comes first (None means forever)."""
+    remaining = None if not deadline else max(deadline - time(), 0.0)
+    if hedge_delay is None:
+        return remaining
+    return hedge_delay if remaining is None else min(hedge_delay, remaining)
@@ -0,0 +1,203 @@
+"""Client-side rate limiters for throttling outbound calls before the upstream starts rejecting them."""
+
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from time import monotonic, sleep
+
+__all__ = ["GCRALimiter", "TokenBucket"]
+
+
+class _RateLimiter(ABC):
+    """Blocking, non-blocking and asyncio acquire on top of a subclass's ``_try_acquire(cost, now)``.
+
+    ``_try_acquire`` is called with ``self._lock`` held and returns 0 if the cost was taken, or the number of
+    seconds to wait before it could be.
+    """
+
+    def __init__(self, max_cost: float):
+        self._lock = threading.Lock()
+        self._max_cost = max_cost  # anything larger could never be acquired
+
+    def try_acquire(self, cost: float = 1) -> bool:
+        """Take ``cost`` units if they are available right now, without blocking."""
+        if not 0 < cost <= self._max_cost:
+            self._check_cost(cost)
+        with self._lock:
+            return not self._try_acquire(cost, monotonic())
+
+    def wait_time(self, cost: float = 1) -> float:
+        """Seconds until ``cost`` units would be available, without taking them."""
+        with self._lock:
+            return self._wait_time(cost, monotonic())
+
+    def acquire(self, cost: float = 1, timeout: float | None = None) -> bool:
+        """Block until ``cost`` units are taken. Returns False if that can't happen within ``timeout`` seconds."""
+        if not 0 < cost <= self._max_cost:
+            self._check_cost(cost)
+        deadline = None
+        while True:
+            with self._lock:
+                now = monotonic()
+                wait = self._try_acquire(cost, now)
+            if not wait:
+                return True
+            if timeout is not None:
+                deadline = deadline or now + timeout
+                if now + wait > deadline:
+                    return False
+            sleep(wait)
+
+    async def acquire_async(self, cost: float = 1, timeout: float | None = None) -> bool:
+        """asyncio version of ``acquire``, sleeping with ``asyncio.sleep`` instead of blocking the loop."""
+        if not 0 < cost <= self._max_cost:
+            self._check_cost(cost)
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            with self._lock:
+                now = monotonic()
+                wait = self._try_acquire(cost, now)
+            if not wait:
+                return True
+            if deadline is not None and now + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    def _check_cost(self, cost):
+        if not 0 < cost <= self._max_cost:
+            raise ValueError(f"cost must be greater than 0 and at most {self._max_cost}")
+
+    @abstractmethod
+    def _try_acquire(self, cost, now):
+        """Take ``cost`` units if available. Returns 0 if taken, else the seconds to wait. Called with the lock held."""
+
+    @abstractmethod
+    def _wait_time(self, cost, now):
+        """Seconds until ``cost`` units would be available, without taking them. Called with the lock held."""
+
+
+class TokenBucket(_RateLimiter):
+    """Token bucket: ``rate`` tokens are added per second, up to ``capacity``, and each call spends ``cost`` tokens.
+
+    The bucket starts full, so up to ``capacity`` units can be taken in a burst before calls are throttled to the
+    steady ``rate``. All methods are thread safe; ``acquire`` and ``acquire_async`` retry after exactly the time
+    needed for enough tokens to refill.
+
+    :param rate: Tokens added per second.
+    :param capacity: Maximum number of tokens the bucket holds. Defaults to ``rate`` (one second of burst).
+    :param initial_tokens: Tokens in the bucket at start. Defaults to ``capacity``.
+
+    **Example:**
+
+    .. code-block:: python
+
+        limiter = TokenBucket(rate=10, capacity=20)  # 10 calls/s, bursts of up to 20
+
+        limiter.acquire()  # blocks until a token is available
+        if limiter.try_acquire(cost=5):  # weighted, non-blocking
+            bulk_upload()
+        async with limiter:  # asyncio acquire of one token
+            await fetch()
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, initial_tokens: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        capacity = rate if capacity is None else capacity
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than 0")
+        super().__init__(capacity)
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity if initial_tokens is None else min(initial_tokens, capacity)
+        self._updated = monotonic()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        with self._lock:
+            self._refill(monotonic())
+            return self._tokens
+
+    def _refill(self, now):
+        tokens = self._tokens + (now - self._updated) * self.rate
+        self._tokens = tokens if tokens < self.capacity else self.capacity
+        self._updated = now
+
+    def _try_acquire(self, cost, now):
+        # Refill inlined: this runs under the lock on every call
+        tokens = self._tokens + (now - self._updated) * self.rate
+        if tokens > self.capacity:
+            tokens = self.capacity
+        self._updated = now
+        if tokens >= cost:
+            self._tokens = tokens - cost
+            return 0
+        self._tokens = tokens
+        return (cost - tokens) / self.rate
+
+    def _wait_time(self, cost, now):
+        self._refill(now)
+        return max(cost - self._tokens, 0) / self.rate
+
+
+class GCRALimiter(_RateLimiter):
+    """Generic Cell Rate Algorithm limiter: a sliding-window limit that stores one timestamp instead of a log.
+
+    Each unit of cost pushes a "theoretical arrival time" forward by ``1 / rate`` seconds, and a call is allowed
+    while that time is no more than ``burst / rate`` seconds ahead of now. This enforces the same limit as a
+    sliding-window log of every call (at most ``burst`` units in any ``burst / rate`` second window, ``rate`` per
+    second sustained) in O(1) time and memory, and spreads throttled calls evenly instead of releasing them in a
+    burst at each window boundary.
+
+    :param rate: Units allowed per second, sustained.
+    :param burst: Units that may be taken at once after an idle period. Defaults to 1 (perfectly even spacing).
+
+    **Example:**
+
+    .. code-block:: python
+
+        limiter = GCRALimiter(rate=100, burst=10)
+        for item in items:
+            limiter.acquire()
+            send(item)
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if burst <= 0:
+            raise ValueError("burst must be greater than 0")
+        super().__init__(burst)
+        self.rate = rate
+        self.burst = burst
+        self._interval = 1 / rate
+        self._tolerance = burst * self._interval
+        self._tat = 0.0
+
+    def _try_acquire(self, cost, now):
+        # Kept as (ahead of now) + increment so an idle limiter compares exactly, without float rounding noise
+        ahead = self._tat - now if self._tat > now else 0.0
+        wait = ahead + cost * self._interval - self._tolerance
+        if wait > 0:
+            return wait
+        self._tat = now + ahead + cost * self._interval
+        return 0
+
+    def _wait_time(self, cost, now):
+        ahead = self._tat - now if self._tat > now else 0.0
+        return max(ahead + cost * self._interval - self._tolerance, 0.0)
@@ -0,0 +1,165 @@
+"""Exponential backoff coordinated between every process on a host through a shared state file."""
+
+import struct
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import sleep, time
+
+from .backoff import (
+    _apply_bounds,
+    _normalize_cutoff,
+    _normalize_jitter_pct,
+    _resolve_jitter,
+    _validate_arguments,
+)
+from .shared_state import SharedStateFile
+
+__all__ = ["SharedBackoff", "shared_exponential_delay"]
+
+# next_allowed (epoch seconds), current_delay, previous_sleep, failures
+_STATE = struct.Struct("<dddQ")
+
+
+class SharedBackoff:
+    """
+    Backoff state shared by all processes using the same state file.
+
+    Every process sees the same "next allowed attempt" time. The first process to report a failure once that time
+    has passed escalates the delay for everyone; processes failing inside the current window just wait for it to
+    end instead of escalating again, so N workers produce the retry traffic of one.
+
+    If nobody has attempted a call for longer than max_sleep after the window ended the state is considered stale
+    and the delay starts again from minimum_sleep.
+
+    Parameters:
+    - state_file (str | Path): File holding the shared state. Created if it doesn't exist.
+    - minimum_sleep, max_sleep, jitter_pct, backoff_factor, jitter_strategy: As for exponential_delay.
+
+    Examples::
+
+    backoff = SharedBackoff("/tmp/upstream.backoff", minimum_sleep=0.5, max_sleep=30)
+    for sleep_time in backoff.delays(max_attempts=10):
+        try:
+            call_upstream()
+        except ConnectionError:
+            continue
+        backoff.record_success()
+        break
+
+
+    """
+
+    def __init__(
+        self,
+        state_file: str | Path,
+        minimum_sleep: int | float = 0.1,
+        max_sleep: int | float = 60,
+        jitter_pct: int | float = 0.1,
+        backoff_factor: float = 1.25,
+        jitter_strategy="pct",
+    ):
+        _validate_arguments(backoff_factor, None, max_sleep, minimum_sleep)
+        self.minimum_sleep = minimum_sleep
+        self.max_sleep = max_sleep
+        self.backoff_factor = backoff_factor
+        self._jitter = _resolve_jitter(jitter_strategy, _normalize_jitter_pct(jitter_pct), minimum_sleep, max_sleep)
+        self._state = SharedStateFile(state_file, _STATE.size)
+
+    @property
+    def next_allowed(self) -> float:
+        """Epoch time before which no process should make another attempt."""
+        with self._state.locked() as buf:
+            return _STATE.unpack_from(buf)[0]
+
+    @property
+    def failures(self) -> int:
+        """Number of times the shared delay has been escalated since the last success."""
+        with self._state.locked() as buf:
+            return _STATE.unpack_from(buf)[3]
+
+    def record_success(self):
+        """Reset the shared state so every process goes back to minimum_sleep."""
+        with self._state.locked() as buf:
+            _STATE.pack_into(buf, 0, 0.0, 0.0, 0.0, 0)
+
+    def wait_time(self) -> float:
+        """Seconds until the next allowed attempt, without recording a failure."""
+        return max(self.next_allowed - time(), 0.0)
+
+    def record_failure(self) -> float:
+        """Record a failed attempt and return how long the caller should wait before trying again."""
+        with self._state.locked() as buf:
+            next_allowed, current_delay, previous_sleep, failures = _STATE.unpack_from(buf)
+            now = time()
+            if now < next_allowed:
+                return next_allowed - now  # another process already escalated for this window
+            if not current_delay or now - next_allowed > self.max_sleep:
+                current_delay, previous_sleep, failures = self.minimum_sleep, self.minimum_sleep, 0
+
+            this_sleep = current_delay
+            if self._jitter is not None:
+                this_sleep = self._jitter(this_sleep, previous_sleep)
+            this_sleep = _apply_bounds(this_sleep, self.minimum_sleep, self.max_sleep)
+
+            next_delay = min(current_delay * self.backoff_factor, self.max_sleep)
+            _STATE.pack_into(buf, 0, now + this_sleep, next_delay, this_sleep, failures + 1)
+            return this_sleep
+
+    def delays(
+        self,
+        cutoff: datetime | timedelta | int | None = None,
+        max_attempts: int | None = None,
+        enable_sleep: bool = True,
+    ):
+        """
+        Generate sleep times like exponential_delay, but from the shared state.
+
+        Unlike exponential_delay the first sleep is only 0 if no other process is currently backing off; otherwise
+        it waits for the shared window to end. Every later iteration is treated as a failure of the previous
+        attempt. Call record_success() once the call succeeds.
+        """
+        _validate_arguments(self.backoff_factor, max_attempts, self.max_sleep, self.minimum_sleep)
+        cutoff = _normalize_cutoff(cutoff)
+
+        this_sleep = self.wait_time()
+        count = 1
+        while True:
+            if cutoff and time() + this_sleep > cutoff:
+                this_sleep = max(cutoff - time(), 0.0)
+            if enable_sleep and this_sleep:
+                sleep(this_sleep)
+            yield this_sleep
+
+            count += 1
+            if max_attempts is not None and count > max_attempts:
+                return
+            if cutoff and time() >= cutoff:
+                return
+            this_sleep = self.record_failure()
+
+    def close(self):
+        self._state.close()
+
+
+def shared_exponential_delay(
+    state_file: str | Path,
+    minimum_sleep: int | float = 0.1,
+    max_sleep: int | float = 60,
+    jitter_pct: int | float = 0.1,
+    backoff_factor: float = 1.25,
+    cutoff: datetime | timedelta | int | None = None,
+    max_attempts: int | None = None,
+    enable_sleep: bool = True,
+    jitter_strategy="pct",
+):
+    """
+    exponential_delay with its state shared between all processes using the same state_file.
+
+    Takes the same parameters as exponential_delay plus the state file. See SharedBackoff for the coordination
+    rules; use ``SharedBackoff(state_file).record_success()`` to reset the delay once a call succeeds.
+    """
+    backoff = SharedBackoff(state_file, minimum_sleep, max_sleep, jitter_pct, backoff_factor, jitter_strategy)
+    try:
+        yield from backoff.delays(cutoff=cutoff, max_attempts=max_attempts, enable_sleep=enable_sleep)
+    finally:
+        backoff.close()
@@ -0,0 +1,96 @@
+"""Fixed-size binary state shared between processes through an mmap'ed file."""
+
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+__all__ = ["SharedStateFile"]
+
+
+class SharedStateFile:
+    """A small mmap'ed file guarded by an exclusive ``flock``, for state shared by every process on a host.
+
+    The file is created (zero filled) if it doesn't exist. All reads and writes should happen inside ``locked()``,
+    which serializes threads within the process and processes on the host. ``locked()`` is reentrant within a
+    thread. The mapping is reopened automatically in forked children so they don't share the parent's lock.
+
+    **Example:**
+
+    .. code-block:: python
+
+        state = SharedStateFile("/tmp/myapp.state", size=struct.calcsize("<dQ"))
+        with state.locked() as buf:
+            value, count = struct.unpack_from("<dQ", buf)
+            struct.pack_into("<dQ", buf, 0, value, count + 1)
+    """
+
+    def __init__(self, path: str | Path, size: int):
+        if fcntl is None:
+            raise OSError("SharedStateFile requires fcntl, which is not available on this platform")
+        if size <= 0:
+            raise ValueError("size must be greater than 0")
+        self.path = Path(path)
+        self.size = size
+        self._pid = None
+        self._open()
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < self.size:
+                os.ftruncate(self._fd, self.size)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._mmap = mmap.mmap(self._fd, self.size)
+        self._thread_lock = threading.RLock()
+        self._depth = 0  # nesting depth of locked() for the thread holding _thread_lock
+        self._pid = os.getpid()
+
+    def acquire(self):
+        """Take the cross-process lock, reentrant within a thread. Prefer ``locked()`` where possible."""
+        if self._pid != os.getpid():
+            # After a fork the fd shares the parent's open file description, and with it the parent's flock
+            self._mmap.close()
+            os.close(self._fd)
+            self._open()
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    @contextmanager
+    def locked(self):
+        """Hold the cross-process lock and yield the writable mapping."""
+        self.acquire()
+        try:
+            yield self._mmap
+        finally:
+            self.release()
+
+    def close(self):
+        self._mmap.close()
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,11 +1,19 @@
+import hashlib
 import os
+import pickle
+import tempfile
+from pathlib import Path
+from stat import S_IWGRP, S_IWOTH
 
 import yaml
-from cryptography.fernet import Fernet
 
 from .byte_strings import want_bytes
+from .crypto import get_cipher
 from .exceptions import MissingVaultKey
 
+# libyaml's C parser when PyYAML was built with it, several times faster than the pure Python one
+SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def secret_constructor(decryption_key: str | bytes | None = None):
     """Creates and returns a custom YAML constructor function for decrypting values tagged with "!secret".
@@ -14,7 +22,8 @@ def secret_constructor(decryption_key: str | bytes | None = None):
     "!secret" in a YAML file. If a decryption_key is provided, it will be used to decrypt the values. If not,
     the function will attempt to use the "VAULT_KEY" environment variable as the decryption key.
 
-    :param decryption_key: Optional; the Fernet decryption key to be used for decryption.
+    :param decryption_key: Optional; the Fernet decryption key to be used for decryption, or several comma-separated
+                           keys (newest first) during a key rotation.
                            If not provided, the returned constructor will use the "VAULT_KEY" environment variable.
     :return: A constructor function that takes a loader and a node, decrypts the value if it's tagged with "!secret",
              and returns the decrypted or original value.
@@ -27,32 +36,254 @@ def secret_constructor(decryption_key: str | bytes | None = None):
         key = decryption_key if decryption_key is not None else os.getenv("VAULT_KEY")
         if key is None:
             raise ValueError("Encountered encrypted value, but no decryption key was provided.")
-        f = Fernet(key)
-        return f.decrypt(value.encode()).decode()
+        return get_cipher(key).decrypt(value.encode()).decode()
 
     return _constructor
 
 
-def load_and_decrypt_yaml(decryption_key=None, file_path=None):
+class LazySecret:
+    """A "!secret" value that is only decrypted the first time it is used.
+
+    The plaintext is cached after the first decryption (concurrent first accesses may both decrypt, which is
+    harmless). ``value`` returns the plaintext; ``str()``, comparisons, ``len()``, ``in``, concatenation,
+    formatting and string methods all go through it, so most code can use a LazySecret where it used a str. Use
+    ``resolve_secrets`` for code that needs real ``str`` instances. The repr never shows the plaintext.
+    """
+
+    __slots__ = ("_key", "_token", "_value")
+
+    def __init__(self, token: str, key: str | bytes):
+        self._token = token
+        self._key = key
+        self._value = None
+
+    @property
+    def value(self) -> str:
+        value = self._value
+        if value is None:
+            value = self._value = get_cipher(self._key).decrypt(self._token.encode()).decode()
+        return value
+
+    @property
+    def decrypted(self) -> bool:
+        """Whether the value has been decrypted yet."""
+        return self._value is not None
+
+    def __str__(self):
+        return self.value
+
+    def __repr__(self):
+        return "LazySecret(********)"
+
+    def __eq__(self, other):
+        if isinstance(other, LazySecret):
+            # The same token under the same key is the same value, no need to decrypt either side
+            if self._token == other._token and self._key == other._key:
+                return True
+            return self.value == other.value
+        return self.value == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __contains__(self, item):
+        return item in self.value
+
+    def __add__(self, other):
+        return self.value + str(other)
+
+    def __radd__(self, other):
+        return str(other) + self.value
+
+    def __format__(self, format_spec):
+        return format(self.value, format_spec)
+
+    def __fspath__(self):
+        return self.value
+
+    def __getattr__(self, name):
+        return getattr(self.value, name)
+
+    def __reduce__(self):
+        return LazySecret, (self._token, self._key)
+
+
+def resolve_secrets(data):
+    """Return a copy of ``data`` with every LazySecret inside dicts, lists and tuples replaced by its plaintext."""
+    if isinstance(data, LazySecret):
+        return data.value
+    if isinstance(data, dict):
+        return {key: resolve_secrets(value) for key, value in data.items()}
+    if isinstance(data, list | tuple):
+        return type(data)(resolve_secrets(value) for value in data)
+    return data
+
+
+def lazy_secret_constructor(decryption_key: str | bytes):
+    """Like secret_constructor, but "!secret" values load as LazySecret instances that decrypt on first use."""
+    decryption_key = want_bytes(decryption_key)
+
+    def _constructor(loader, node):
+        return LazySecret(loader.construct_scalar(node), decryption_key)
+
+    return _constructor
+
+
+class _EncryptedValue(str):
+    """A "!secret" token that hasn't been decrypted, as stored in config snapshots."""
+
+    __slots__ = ()
+
+
+class _SnapshotLoader(SAFE_LOADER):
+    """SafeLoader that keeps "!secret" values as _EncryptedValue tokens, for snapshots that stay encrypted."""
+
+
+_SnapshotLoader.add_constructor("!secret", lambda loader, node: _EncryptedValue(loader.construct_scalar(node)))
+
+# Bump when the snapshot layout or the _SnapshotLoader output changes, so old snapshots are ignored
+SNAPSHOT_VERSION = 1
+
+
+def _decrypt_tokens(data, decryption_key, lazy_secrets):
+    """Replace every _EncryptedValue in ``data`` with its plaintext, or a LazySecret if ``lazy_secrets``."""
+    if isinstance(data, _EncryptedValue):
+        if lazy_secrets:
+            return LazySecret(str(data), decryption_key)
+        return get_cipher(decryption_key).decrypt(data.encode()).decode()
+    if isinstance(data, dict):
+        return {key: _decrypt_tokens(value, decryption_key, lazy_secrets) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_decrypt_tokens(value, decryption_key, lazy_secrets) for value in data]
+    return data
+
+
+def _snapshot_path(cache_dir, file_path):
+    name = hashlib.sha256(str(Path(file_path).resolve()).encode()).hexdigest()[:32]
+    return Path(cache_dir) / f"{name}.pickle"
+
+
+# Snapshots are only trusted once their owner has been checked, which needs POSIX user ids
+try:
+    _getuid = os.getuid
+except AttributeError:  # pragma: no cover - Windows
+    _getuid = None
+
+
+def _is_private(stat):
+    """Whether a file or directory is owned by this process's user and not writable by anyone else."""
+    return stat.st_uid == _getuid() and not stat.st_mode & (S_IWGRP | S_IWOTH)
+
+
+def _load_snapshot(snapshot_path, file_path, stat, digest):
+    """Return the cached structure if the snapshot matches this exact file, else None.
+
+    Snapshots are unpickled, so one that another user could have written (or swapped in through the directory) is
+    treated as a cache miss instead of being loaded.
+    """
+    try:
+        if not _is_private(os.stat(snapshot_path.parent)):
+            return None
+        with open(snapshot_path, "rb") as f:
+            if not _is_private(os.fstat(f.fileno())):
+                return None
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        return None
+    expected = (SNAPSHOT_VERSION, str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns, digest)
+    if not isinstance(snapshot, dict) or snapshot.get("key") != expected:
+        return None
+    return snapshot["data"]
+
+
+def _save_snapshot(snapshot_path, file_path, stat, digest, data):
+    """Write the snapshot atomically, readable only by the owner. Failures just mean no cache next time."""
+    key = (SNAPSHOT_VERSION, str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns, digest)
+    try:
+        snapshot_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _is_private(os.stat(snapshot_path.parent)):
+            return  # _load_snapshot would never trust it
+        fd, tmp_path = tempfile.mkstemp(dir=snapshot_path.parent, prefix=".snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({"key": key, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, snapshot_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def _load_with_snapshot(decryption_key, file_path, lazy_secrets, cache_dir):
+    with open(file_path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    snapshot_path = _snapshot_path(cache_dir, file_path)
+    data = _load_snapshot(snapshot_path, file_path, stat, digest)
+    if data is None:
+        data = yaml.load(content, Loader=_SnapshotLoader)
+        _save_snapshot(snapshot_path, file_path, stat, digest, data)
+    if b"!secret" in content and decryption_key is None:
+        decryption_key = os.environ.get("VAULT_KEY")
+        if decryption_key is None:
+            raise MissingVaultKey("Encrypted value found but no decryption key provided.")
+    return _decrypt_tokens(data, want_bytes(decryption_key), lazy_secrets)
+
+
+def _secret_loader(decryption_key, lazy_secrets, base_loader=SAFE_LOADER):
+    """A private Loader subclass with "!secret" bound to this key, so nothing is registered process-wide."""
+    constructor = lazy_secret_constructor if lazy_secrets else secret_constructor
+
+    class _SecretLoader(base_loader):
+        pass
+
+    _SecretLoader.add_constructor("!secret", constructor(decryption_key))
+    return _SecretLoader
+
+
+def _parse_yaml(content, decryption_key=None, lazy_secrets=False, base_loader=SAFE_LOADER):
+    """Parse YAML text, decrypting "!secret" values with the key (or VAULT_KEY if there are any and it's None)."""
+    if "!secret" not in content:
+        return yaml.load(content, Loader=base_loader)
+    if decryption_key is None:
+        if "VAULT_KEY" not in os.environ:
+            raise MissingVaultKey("Encrypted value found but no decryption key provided.")
+        decryption_key = os.environ["VAULT_KEY"]
+    return yaml.load(content, Loader=_secret_loader(decryption_key, lazy_secrets, base_loader))
+
+
+def load_and_decrypt_yaml(decryption_key=None, file_path=None, lazy_secrets=False, cache_dir=None):
     """Loads and parses a YAML file, decrypting values tagged with "!secret" using the provided decryption key.
 
     :param decryption_key: Optional; String representing the Fernet decryption key to be used for decryption.
     :param file_path: String representing the path to the YAML file to be loaded.
+    :param lazy_secrets: Optional; if True, "!secret" values load as LazySecret proxies that are only decrypted
+                         the first time they're used, so startup cost doesn't grow with the number of secrets.
+                         A wrong key then surfaces on first use instead of at load time.
+    :param cache_dir: Optional; directory for parsed-config snapshots. When set, the parsed structure is
+                      pickled there (with "!secret" values still encrypted) and reused by later loads of the same
+                      file, skipping the YAML parser. A snapshot is only used if the file's path, size, mtime and
+                      sha256 all match. Snapshots are unpickled, so they are only read (and written) when both
+                      the snapshot and the directory are owned by the current user and not writable by group or
+                      others; otherwise the snapshot cache is skipped. Ignored on platforms without POSIX user
+                      ids (Windows).
     :return: A dictionary representing the contents of the loaded YAML file, with encrypted values decrypted.
     """
     try:
-        # First, read the file without applying any constructors to check for encrypted values
-        with open(file_path) as f:
-            file_content = f.read()
-            if "!secret" in file_content:
-                if decryption_key is None:
-                    if "VAULT_KEY" in os.environ:
-                        decryption_key = os.environ["VAULT_KEY"]
-                    else:
-                        raise MissingVaultKey("Encrypted value found but no decryption key provided.")
-                yaml.constructor.SafeConstructor.add_constructor("!secret", secret_constructor(decryption_key))
+        if cache_dir is not None and _getuid is not None:
+            return _load_with_snapshot(decryption_key, file_path, lazy_secrets, cache_dir)
+
         with open(file_path) as f:
-            return yaml.safe_load(f)
+            content = f.read()
+        return _parse_yaml(content, decryption_key, lazy_secrets)
 
     except FileNotFoundError:
         raise FileNotFoundError(f"File {file_path} not found") from None